@@ -0,0 +1,80 @@
+"""
+Process-wide LLM clients and retriever shared by all agents.
+
+Each researcher and the supervisor used to build their own
+ChatOpenAI (own connection pool) and HybridRetriever (own Qdrant client,
+embeddings client and BM25 index). These getters create each one once,
+on first use, so importing this module never needs credentials or Qdrant.
+
+All ChatOpenAI clients share one sync HTTP/2 connection pool, so concurrent
+researcher invoke calls are multiplexed over warm connections instead of
+each doing its own TLS setup. Async calls keep each client's own pool:
+async connections belong to the event loop that opened them, and
+asyncio.run starts a new loop per call.
+"""
+import atexit
+import threading
+from typing import Optional
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from app.rag.retriever import HybridRetriever
+
+_lock = threading.Lock()
+_llm_mini: Optional[ChatOpenAI] = None
+_retriever: Optional[HybridRetriever] = None
+_http_client: Optional[httpx.Client] = None
+
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+_HTTP_TIMEOUT = 60.0
+
+
+def _shared_http_client() -> httpx.Client:
+    """Shared OpenAI HTTP/2 client (call with _lock held)."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+        atexit.register(_http_client.close)
+    return _http_client
+
+
+def _chat_openai(**kwargs) -> ChatOpenAI:
+    """ChatOpenAI on the shared sync connection pool (call with _lock held)."""
+    # No SDK retries: llm_retry is the only retry layer, so the circuit
+    # breaker sees each failure instead of the SDK's 3x multiplied attempts
+    return ChatOpenAI(http_client=_shared_http_client(), max_retries=0, **kwargs)
+
+
+def get_llm_mini() -> ChatOpenAI:
+    """gpt-4o-mini client used by the supervisor and researchers."""
+    global _llm_mini
+    with _lock:
+        if _llm_mini is None:
+            _llm_mini = _chat_openai(model="gpt-4o-mini", temperature=0)
+    return _llm_mini
+
+
+def get_retriever() -> HybridRetriever:
+    """Hybrid (BM25 + semantic) retriever over the standards collection."""
+    global _retriever
+    with _lock:
+        if _retriever is None:
+            _retriever = HybridRetriever()
+    return _retriever
+
+
+async def aclose_http_clients() -> None:
+    """
+    Close the shared connection pool and drop the clients built on it.
+    
+    Call at app shutdown. The getters build fresh clients if they're
+    used again afterwards, instead of handing out ones on a closed pool.
+    """
+    global _http_client, _llm_mini
+    with _lock:
+        http_client = _http_client
+        _http_client = None
+        _llm_mini = None
+    if http_client is not None:
+        http_client.close()
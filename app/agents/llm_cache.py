@@ -0,0 +1,59 @@
+"""
+Process-wide LangChain LLM response cache.
+
+All agents use temperature=0, so an identical prompt (same PDF re-run,
+same task string) can be answered from the cache instead of OpenAI.
+
+Configured via environment:
+- LLM_CACHE: "memory" (default), "sqlite" (survives restarts), "redis"
+  (shared across processes), or "off"
+- LLM_CACHE_PATH: SQLite database file when LLM_CACHE=sqlite
+- REDIS_URL: Redis connection URL when LLM_CACHE=redis
+- LLM_CACHE_TTL: Redis entry lifetime in seconds (default 1 day)
+- LLM_CACHE_MAXSIZE: in-memory entry limit, oldest evicted first (default 1000)
+"""
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+_configured = False
+_lock = threading.Lock()
+
+
+def configure_llm_cache() -> None:
+    """Install the global LLM cache once (safe to call from every agent module)."""
+    global _configured
+    with _lock:
+        if _configured:
+            return
+        _configured = True
+        
+        backend = os.getenv("LLM_CACHE", "memory").lower()
+        if backend in ("", "off", "none"):
+            logger.info("LLM response cache disabled")
+            return
+        
+        from langchain_core.globals import set_llm_cache
+        
+        if backend == "redis":
+            from redis import Redis
+            from langchain_community.cache import RedisCache
+            
+            redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+            ttl = int(os.getenv("LLM_CACHE_TTL", str(24 * 3600)))
+            set_llm_cache(RedisCache(redis_=Redis.from_url(redis_url), ttl=ttl))
+            logger.info("LLM response cache: Redis (%s, ttl=%ss)", redis_url, ttl)
+        elif backend == "sqlite":
+            from langchain_community.cache import SQLiteCache
+            
+            path = os.getenv("LLM_CACHE_PATH", ".llm_cache.db")
+            set_llm_cache(SQLiteCache(database_path=path))
+            logger.info("LLM response cache: SQLite (%s)", path)
+        else:
+            from langchain_core.caches import InMemoryCache
+            
+            maxsize = int(os.getenv("LLM_CACHE_MAXSIZE", "1000"))
+            set_llm_cache(InMemoryCache(maxsize=maxsize))
+            logger.info("LLM response cache: in-memory (maxsize=%s)", maxsize)
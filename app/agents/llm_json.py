@@ -0,0 +1,42 @@
+"""
+Helpers for pulling JSON out of LLM replies.
+
+Models often wrap the JSON they were asked for in markdown fences or
+surrounding prose, so replies are sliced down to the JSON before parsing.
+"""
+from typing import Optional
+
+
+def extract_json_array(text: str) -> Optional[str]:
+    """
+    Slice of the first complete JSON array in text, or None.
+    
+    One pass tracking bracket depth and string state, so brackets inside
+    strings or trailing prose after the array don't shift the boundaries
+    (a greedy regex runs to the last ']' in the reply).
+    """
+    start = text.find("[")
+    if start < 0:
+        return None
+    
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
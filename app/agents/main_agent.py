@@ -3,20 +3,162 @@ Main Agent - orchestrates the entire takeoff workflow with LangGraph.
 
 Flow:
 1. Analyze PDF → understand what's in it
-2. Call Supervisor → deploy researchers, get findings
-3. Generate Report → create final takeoff
+   (in parallel) Prefetch RAG → legend extraction + retriever warmup
+2. Validate → Supervisor validates Vision results, deduplicates,
+   then the final takeoff report is generated in the same node
 """
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import SystemMessage, HumanMessage, BaseMessage
-from langgraph.graph import StateGraph, END
+import os
+import tempfile
+import threading
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Optional, AsyncIterator, Iterator
+import httpx
+import orjson
+from langchain_core.callbacks import adispatch_custom_event
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import StateGraph, START, END
+from langgraph.graph.state import CompiledStateGraph
 
-from app.models import AgentState, SupervisorState, TakeoffResult, TakeoffSummary, PipeDetection
-from app.agents.supervisor import SupervisorAgent
+from app.models import AgentState, SupervisorState, TakeoffResult, TakeoffSummary
+from app.agents.supervisor import SupervisorAgent, material_query, normalize_material
+from app.agents.llm_cache import configure_llm_cache
+from app.agents._shared import aclose_http_clients
+from app.vision.coordinator import VisionCoordinator
 
 logger = logging.getLogger(__name__)
 
+# Identical temperature-0 prompts are served from the shared LLM cache
+configure_llm_cache()
+
+# Name of the custom LangGraph event carrying structured progress updates
+PROGRESS_EVENT = "takeoff_progress"
+
+# Workflow node names, reported as "node_complete" events when streaming
+WORKFLOW_NODES = ("analyze_pdf", "wait_for_batch", "prefetch_rag", "validate")
+
+# SQLite checkpoint store so failed takeoffs can resume (opt-in, e.g.
+# "takeoffs.db"; unset/"" disables checkpointing)
+CHECKPOINT_DB = os.getenv("TAKEOFF_CHECKPOINT_DB", "")
+
+# Vision results are cached on disk keyed by PDF content + Vision parameters
+VISION_CACHE_DIR = Path(os.getenv("VISION_CACHE_DIR", ".vision_cache"))
+
+VISION_PARAMS = {
+    "max_pages": 10,
+    "agents_to_deploy": ["pipes"]  # Single general-purpose agent
+}
+
+# Page render DPI (per-run override: state["vision_dpi"]); 300 for tiny labels
+VISION_DPI = int(os.getenv("VISION_DPI", "150"))
+
+# Batch mode polling: how often to check, and how long one run waits before
+# failing (the checkpoint lets a later run resume the wait)
+VISION_BATCH_POLL_SECONDS = float(os.getenv("VISION_BATCH_POLL_SECONDS", "60"))
+VISION_BATCH_MAX_WAIT = float(os.getenv("VISION_BATCH_MAX_WAIT", str(24 * 3600)))
+
+
+def _pdf_digest(pdf_path: str) -> str:
+    """SHA-1 of the PDF bytes, streamed in 1 MB chunks (blocking - run in a thread)."""
+    digest = hashlib.sha1()
+    with open(pdf_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def _state_pdf_digest(state: AgentState) -> str:
+    """The run's PDF digest, hashing the file off the event loop if it isn't in state yet."""
+    return state.get("pdf_digest") or await asyncio.to_thread(_pdf_digest, state["pdf_path"])
+
+
+def _vision_cache_key(
+    pdf_digest: str,
+    max_pages: int,
+    agents_to_deploy: List[str],
+    dpi: int
+) -> str:
+    """Vision cache key: PDF digest plus the Vision parameters."""
+    params = f"|pages={max_pages}|agents={','.join(agents_to_deploy)}|dpi={dpi}"
+    return hashlib.md5(f"{pdf_digest}{params}".encode()).hexdigest()
+
+
+def _takeoff_thread_id(pdf_digest: str, user_query: str, batch_mode: bool) -> str:
+    """Checkpoint thread for a takeoff: PDF digest plus the request."""
+    digest = hashlib.sha1(f"{pdf_digest}|query={user_query}|batch={batch_mode}".encode())
+    return f"takeoff-{digest.hexdigest()}"
+
+
+# Checkpoint threads with a run in progress in this process (any thread or
+# event loop), so concurrent identical takeoffs never share a thread
+_RUNNING_THREADS: set = set()
+_RUNNING_THREADS_LOCK = threading.Lock()
+
+
+def _claim_thread(thread_id: str) -> bool:
+    """Mark a checkpoint thread as running; False if another run holds it."""
+    with _RUNNING_THREADS_LOCK:
+        if thread_id in _RUNNING_THREADS:
+            return False
+        _RUNNING_THREADS.add(thread_id)
+        return True
+
+
+def _release_thread(thread_id: str) -> None:
+    """Mark a checkpoint thread as no longer running."""
+    with _RUNNING_THREADS_LOCK:
+        _RUNNING_THREADS.discard(thread_id)
+
+
+def _vision_params(state: AgentState) -> Dict[str, Any]:
+    """Vision parameters for a run (also part of the cache key)."""
+    return {**VISION_PARAMS, "dpi": state.get("vision_dpi") or VISION_DPI}
+
+
+def _load_cached_vision(cache_key: str) -> Optional[Dict[str, Any]]:
+    """Load cached Vision results, or None on miss/corrupt entry."""
+    cache_file = VISION_CACHE_DIR / f"vision_{cache_key}.json"
+    try:
+        with open(cache_file, "rb") as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning("[Main Agent] Ignoring unreadable Vision cache %s: %s", cache_file, e)
+        return None
+
+
+def _save_cached_vision(cache_key: str, vision_results: Dict[str, Any]) -> None:
+    """Atomically write Vision results to the cache (write temp file, then rename)."""
+    try:
+        VISION_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=VISION_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(vision_results, option=orjson.OPT_SERIALIZE_NUMPY))
+        os.replace(tmp_path, VISION_CACHE_DIR / f"vision_{cache_key}.json")
+    except OSError as e:
+        logger.warning("[Main Agent] Could not write Vision cache: %s", e)
+
+
+def _iter_pipe_dicts(vision_pipes: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Yield Vision pipes as PipeDetection-shaped dicts, one at a time."""
+    for i, vp in enumerate(vision_pipes):
+        yield {
+            "pipe_id": f"pipe_{i}",
+            "discipline": vp["discipline"],
+            "material": vp["material"],
+            "diameter_in": vp["diameter_in"],
+            "length_ft": vp["length_ft"],
+            "invert_in_ft": vp.get("invert_in_ft"),
+            "invert_out_ft": vp.get("invert_out_ft"),
+            "ground_level_ft": vp.get("ground_level_ft"),
+            "depth_ft": vp.get("depth_ft")
+        }
+
 
 class MainAgent:
     """
@@ -27,19 +169,18 @@ class MainAgent:
     
     def __init__(self):
         """Initialize main agent."""
-        self.llm = ChatOpenAI(
-            model="gpt-4o",  # Use more powerful model for coordination
-            temperature=0
-        )
-        
         self.supervisor = SupervisorAgent()
         
-        # Build LangGraph workflow
+        # Pooled HTTP/2 Vision clients, one per event loop (pools can't cross loops)
+        self._http_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._http_lock = threading.Lock()
+        
+        # Build and compile the LangGraph workflow once; runs reuse it
         self.workflow = self._build_workflow()
         
         logger.info("Main Agent initialized with LangGraph workflow")
     
-    def _build_workflow(self) -> StateGraph:
+    def _build_workflow(self) -> CompiledStateGraph:
         """
         Build the LangGraph workflow.
         
@@ -50,68 +191,236 @@ class MainAgent:
         
         # Add nodes
         workflow.add_node("analyze_pdf", self.analyze_pdf_node)
-        workflow.add_node("supervise_research", self.supervise_research_node)
-        workflow.add_node("generate_report", self.generate_report_node)
-        
-        # Define edges
-        workflow.set_entry_point("analyze_pdf")
-        workflow.add_edge("analyze_pdf", "supervise_research")
-        workflow.add_edge("supervise_research", "generate_report")
-        workflow.add_edge("generate_report", END)
+        workflow.add_node("wait_for_batch", self.wait_for_batch_node)
+        workflow.add_node("prefetch_rag", self.prefetch_rag_node)
+        workflow.add_node("validate", self.validate_node)
+        
+        # Define edges: Vision and RAG prefetch run in parallel, then join
+        # (wait_for_batch is a no-op unless Vision was submitted in batch mode)
+        workflow.add_edge(START, "analyze_pdf")
+        workflow.add_edge(START, "prefetch_rag")
+        workflow.add_edge("analyze_pdf", "wait_for_batch")
+        workflow.add_edge(["wait_for_batch", "prefetch_rag"], "validate")
+        workflow.add_edge("validate", END)
         
         logger.info("LangGraph workflow built")
         
         return workflow.compile()
     
-    def analyze_pdf_node(self, state: AgentState) -> AgentState:
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """
+        Return the shared Vision HTTP client for the running event loop.
+        
+        Pooled connections belong to the loop that opened them, so each
+        loop gets its own client; run_takeoff_sync closes its loop's client
+        before the loop ends.
+        """
+        loop = asyncio.get_running_loop()
+        with self._http_lock:
+            client = self._http_clients.get(loop)
+            if client is None:
+                client = self._http_clients[loop] = httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                    timeout=120
+                )
+        return client
+    
+    async def _aclose_http_client(self) -> None:
+        """Close the running event loop's Vision HTTP client, if it has one."""
+        with self._http_lock:
+            client = self._http_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+    
+    async def warmup(self) -> None:
+        """
+        Pre-warm the RAG retriever and the supervisor's LLM connection.
+        
+        Meant for app startup, so the first takeoff doesn't absorb the
+        one-time retriever/index setup and TLS handshakes. Failures are only
+        logged; everything is still created lazily on first use.
+        """
+        results = await asyncio.gather(
+            asyncio.to_thread(self.supervisor.prewarm_rag),
+            # Uncached copy on the same clients: a persistent LLM cache
+            # (sqlite/redis) would answer the ping without opening a connection
+            asyncio.to_thread(self.supervisor.llm.model_copy(update={"cache": False}).invoke, "ping"),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("[Main Agent] Warmup step failed: %s", result)
+        logger.info("[Main Agent] Warmup complete")
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and supervisor threads (call at app shutdown)."""
+        await self._aclose_http_client()
+        self.supervisor.close()
+    
+    @asynccontextmanager
+    async def _open_workflow(self):
+        """
+        Yield the compiled workflow, checkpointed to CHECKPOINT_DB if enabled.
+        
+        State is persisted after every node, so a failed run can resume from
+        the last completed node instead of redoing Vision + RAG. The saver's
+        connection is bound to the running event loop, so it is attached to a
+        shallow copy of the precompiled graph rather than compiling per run.
+        """
+        if not CHECKPOINT_DB:
+            yield self.workflow
+            return
+        
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+        
+        async with AsyncSqliteSaver.from_conn_string(CHECKPOINT_DB) as saver:
+            yield self.workflow.copy(update={"checkpointer": saver})
+    
+    async def _delete_checkpoints(self, workflow: CompiledStateGraph, thread_id: str) -> None:
+        """Drop a finished thread's checkpoints (best effort; older savers can't)."""
+        delete_thread = getattr(workflow.checkpointer, "adelete_thread", None)
+        if delete_thread is None:
+            return
+        try:
+            await delete_thread(thread_id)
+        except Exception as e:
+            logger.warning("[Main Agent] Could not delete checkpoints for %s: %s", thread_id, e)
+    
+    async def _emit_progress(
+        self,
+        config: Optional[RunnableConfig],
+        stage: str,
+        **data: Any
+    ) -> None:
+        """
+        Emit a structured progress event for run_takeoff_stream consumers.
+        
+        No-op when the node runs outside a traced workflow run.
+        """
+        try:
+            await adispatch_custom_event(PROGRESS_EVENT, {"stage": stage, **data}, config=config)
+        except RuntimeError:
+            # No parent run (node called directly) - nothing is listening
+            pass
+    
+    async def analyze_pdf_node(
+        self,
+        state: AgentState,
+        config: RunnableConfig = None
+    ) -> AgentState:
         """
         Node 1: Analyze the PDF to understand its content.
         
         This uses GPT-4o Vision to understand what's in the PDF and
-        extract initial pipe information.
+        extract initial pipe information. In batch mode the pages are only
+        submitted here; wait_for_batch collects the results.
         """
         pdf_path = state["pdf_path"]
-        user_query = state.get("user_query", "")
         
-        logger.info(f"[Main Agent] Analyzing PDF: {pdf_path}")
+        logger.info("[Main Agent] Analyzing PDF: %s", pdf_path)
         
         try:
-            # Use Vision Coordinator with specialized agents
-            from app.vision.coordinator import VisionCoordinator
-            import asyncio
-            from concurrent.futures import ThreadPoolExecutor
-            
-            # Create coordinator
-            coordinator = VisionCoordinator()
+            vision_params = _vision_params(state)
             
-            # Run async code in a separate thread to avoid event loop conflicts
-            def run_vision_async():
-                """Helper to run async Vision coordinator in new event loop."""
-                new_loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(new_loop)
-                try:
-                    return new_loop.run_until_complete(coordinator.analyze_multipage(
-                        pdf_path=pdf_path,
-                        max_pages=10,
-                        agents_to_deploy=["pipes"],  # Single general-purpose agent
-                        dpi=300  # High resolution
-                    ))
-                finally:
-                    new_loop.close()
+            # Skip Vision entirely if this exact PDF was already analyzed
+            # (file I/O off the loop, so prefetch_rag keeps running meanwhile)
+            cache_key = _vision_cache_key(await _state_pdf_digest(state), **vision_params)
+            vision_results = None
+            if not state.get("force_refresh"):
+                vision_results = await asyncio.to_thread(_load_cached_vision, cache_key)
             
-            # Execute in thread pool
-            with ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(run_vision_async)
-                vision_results = future.result()
+            if vision_results is not None:
+                logger.info("[Main Agent] Vision cache hit (%.12s), skipping Vision analysis", cache_key)
+                rag_cache = {}
+            elif state.get("batch_mode"):
+                coordinator = VisionCoordinator(http_client=self._get_http_client())
+                batch_id = await coordinator.submit_batch(pdf_path=pdf_path, **vision_params)
+                await self._emit_progress(config, "vision_batch_submitted", batch_id=batch_id)
+                return {"vision_batch_id": batch_id}
+            else:
+                vision_results, rag_cache = await self._run_vision(pdf_path, vision_params, config)
+                # Don't pin partial results from failed Vision calls in the cache
+                if not vision_results.get("agents_failed"):
+                    await asyncio.to_thread(_save_cached_vision, cache_key, vision_results)
             
-            logger.info(f"[Main Agent] Vision analysis complete. Raw extraction: {len(vision_results.get('pipes', []))} pipes")
-            
-            pipes_found = vision_results.get("total_pipes", 0)
-            pages_processed = vision_results.get("num_pages_processed", 0)
-            discipline_counts = vision_results.get("discipline_counts", {})
+            return await self._vision_update(state, vision_results, rag_cache, config)
+        
+        except Exception as e:
+            logger.error("[Main Agent] PDF analysis failed: %s", e)
+            logger.error("[Main Agent] Exception type: %s", type(e).__name__)
+            import traceback
+            logger.error("[Main Agent] Full traceback:")
+            traceback.print_exc()
             
-            # Create summary for supervisor
-            pdf_summary = f"""PDF Analysis Results:
+            # Fallback: basic summary
+            return {
+                "pdf_summary": f"PDF: {pdf_path}. Analysis failed: {e}. Deploying all researchers."
+            }
+    
+    async def wait_for_batch_node(
+        self,
+        state: AgentState,
+        config: RunnableConfig = None
+    ) -> AgentState:
+        """
+        Node 1b: Collect Vision results submitted by analyze_pdf in batch mode.
+        
+        Polls the OpenAI batch until it finishes. If it is still running
+        after VISION_BATCH_MAX_WAIT the node fails; with checkpointing on,
+        rerunning with the same thread_id resumes the wait here without
+        resubmitting the batch.
+        """
+        batch_id = state.get("vision_batch_id")
+        if not batch_id:
+            return {}
+        
+        logger.info("[Main Agent] Waiting for Vision batch %s", batch_id)
+        coordinator = VisionCoordinator(http_client=self._get_http_client())
+        vision_results = await coordinator.wait_for_batch(
+            batch_id,
+            poll_interval=VISION_BATCH_POLL_SECONDS,
+            max_wait=VISION_BATCH_MAX_WAIT
+        )
+        
+        if not vision_results.get("agents_failed"):
+            cache_key = _vision_cache_key(await _state_pdf_digest(state), **_vision_params(state))
+            await asyncio.to_thread(_save_cached_vision, cache_key, vision_results)
+        
+        return await self._vision_update(state, vision_results, {}, config)
+    
+    async def _vision_update(
+        self,
+        state: AgentState,
+        vision_results: Dict[str, Any],
+        rag_cache: Dict[str, Any],
+        config: Optional[RunnableConfig] = None
+    ) -> AgentState:
+        """
+        Summarize Vision results for the supervisor and build the state update.
+        
+        Args:
+            state: Current workflow state
+            vision_results: Combined Vision results
+            rag_cache: Material RAG lookups made while Vision ran
+            config: Node config (for progress events)
+        
+        Returns:
+            Partial state update with pdf_summary and vision_results
+        """
+        user_query = state.get("user_query", "")
+        
+        logger.info(
+            "[Main Agent] Vision analysis complete. Raw extraction: %d pipes",
+            len(vision_results.get("pipes", []))
+        )
+        
+        pipes_found = vision_results.get("total_pipes", 0)
+        pages_processed = vision_results.get("num_pages_processed", 0)
+        discipline_counts = vision_results.get("discipline_counts", {})
+        
+        # Create summary for supervisor
+        pdf_summary = f"""PDF Analysis Results:
 - Pages processed: {pages_processed}
 - Total pipes detected (raw): {pipes_found}
 - Vision analysis: GPT-4o pipe extraction
@@ -119,45 +428,153 @@ class MainAgent:
 
 Pipe breakdown:
 """
-            for disc, count in discipline_counts.items():
-                pdf_summary += f"- {disc}: {count} pipes\n"
-            
-            if user_query:
-                pdf_summary += f"\nUser request: {user_query}"
-            
-            logger.info(f"[Main Agent] PDF analysis complete: {pipes_found} pipes found")
-            logger.info(f"Summary: {pdf_summary[:300]}...")
-            
-            # Store vision results in state for later use
-            return {
-                **state,
-                "pdf_summary": pdf_summary,
-                "final_report": {
-                    "vision_results": vision_results
-                },
-                "messages": state.get("messages", [])
+        for disc, count in discipline_counts.items():
+            pdf_summary += f"- {disc}: {count} pipes\n"
+        
+        if user_query:
+            pdf_summary += f"\nUser request: {user_query}"
+        
+        logger.info("[Main Agent] PDF analysis complete: %d pipes found", pipes_found)
+        await self._emit_progress(
+            config,
+            "vision_complete",
+            pages_processed=pages_processed,
+            pipes_found=pipes_found,
+            discipline_counts=discipline_counts
+        )
+        logger.info("Summary: %.300s...", pdf_summary)
+        
+        # Store vision results in state for later use (merged into
+        # final_report by its reducer)
+        return {
+            "pdf_summary": pdf_summary,
+            "final_report": {
+                "vision_results": vision_results,
+                "material_rag_cache": rag_cache
             }
+        }
+    
+    async def _run_vision(
+        self,
+        pdf_path: str,
+        vision_params: Dict[str, Any],
+        config: Optional[RunnableConfig] = None
+    ) -> tuple:
+        """
+        Run Vision analysis, overlapping material RAG lookups with page streaming.
         
+        Returns:
+            (combined vision results, material query -> retrieved docs)
+        """
+        # Use Vision Coordinator with specialized agents
+        # (reusing pooled connections across pages/runs)
+        coordinator = VisionCoordinator(http_client=self._get_http_client())
+        
+        # Stream pages on the workflow's event loop. As each page arrives,
+        # start RAG lookups for materials not seen yet so validation work
+        # overlaps the remaining Vision calls instead of waiting for all pages.
+        page_results = []
+        rag_tasks = {}  # material query -> lookup task
+        try:
+            async for page_result in coordinator.analyze_multipage_stream(
+                pdf_path=pdf_path,
+                **vision_params
+            ):
+                page_results.append(page_result)
+                await self._emit_progress(
+                    config,
+                    "vision_page",
+                    page_num=page_result["page_num"],
+                    pipes_found=page_result.get("total_pipes", 0)
+                )
+                for pipe in page_result.get("pipes", []):
+                    material = normalize_material(pipe)
+                    query = material_query(material)
+                    if material and query not in rag_tasks:
+                        rag_tasks[query] = asyncio.create_task(asyncio.to_thread(
+                            self.supervisor.retrieve_material_context, material
+                        ))
+        except BaseException:
+            for task in rag_tasks.values():
+                task.cancel()
+            raise
+        
+        vision_results = coordinator.combine_pages(page_results)
+        rag_cache = await self._collect_rag_lookups(rag_tasks)
+        
+        return vision_results, rag_cache
+    
+    async def _collect_rag_lookups(
+        self,
+        rag_tasks: Dict[str, "asyncio.Task"]
+    ) -> Dict[str, list]:
+        """
+        Await material RAG lookups started during Vision streaming.
+        
+        Failed lookups are dropped; the supervisor simply re-queries them.
+        
+        Returns:
+            Dict of material query -> retrieved documents
+        """
+        if not rag_tasks:
+            return {}
+        
+        results = await asyncio.gather(*rag_tasks.values(), return_exceptions=True)
+        
+        rag_cache = {}
+        for query, result in zip(rag_tasks.keys(), results):
+            if isinstance(result, Exception):
+                logger.warning("[Main Agent] Early RAG lookup failed for '%s': %s", query, result)
+            else:
+                rag_cache[query] = result
+        
+        logger.info("[Main Agent] Prefetched RAG for %d material(s) during Vision", len(rag_cache))
+        return rag_cache
+    
+    async def prefetch_rag_node(
+        self,
+        state: AgentState,
+        config: RunnableConfig = None
+    ) -> AgentState:
+        """
+        Node 1b: Prepare RAG validation while Vision runs.
+        
+        Only needs pdf_path: extracts the text legend and warms the retriever
+        so the validate node doesn't pay for them after Vision finishes.
+        """
+        logger.info("[Main Agent] Prefetching RAG resources...")
+        
+        try:
+            # Blocking I/O (Qdrant, PyMuPDF) - keep it off the event loop
+            prefetched = await asyncio.to_thread(
+                self.supervisor.prefetch_rag, state.get("pdf_path")
+            )
         except Exception as e:
-            logger.error(f"[Main Agent] PDF analysis failed: {e}")
-            logger.error(f"[Main Agent] Exception type: {type(e).__name__}")
-            import traceback
-            logger.error(f"[Main Agent] Full traceback:")
-            traceback.print_exc()
-            
-            # Fallback: basic summary
-            return {
-                **state,
-                "pdf_summary": f"PDF: {pdf_path}. Analysis failed: {e}. Deploying all researchers.",
-                "messages": state.get("messages", [])
-            }
+            logger.warning("[Main Agent] RAG prefetch failed: %s", e)
+            prefetched = {}
+        
+        await self._emit_progress(
+            config,
+            "rag_prefetched",
+            legend_entries=len(prefetched.get("text_legend", {}))
+        )
+        
+        # Only return the key this branch owns; final_report is merged by reducer
+        return {"final_report": {"rag_prefetch": prefetched}}
     
-    def supervise_research_node(self, state: AgentState) -> AgentState:
+    async def validate_node(
+        self,
+        state: AgentState,
+        config: RunnableConfig = None
+    ) -> AgentState:
         """
-        Node 2: Call supervisor to validate Vision results (NO extraction).
+        Node 2: Call supervisor to validate Vision results (NO extraction),
+        then generate the final takeoff report.
         
         Vision is single source of truth for pipe counts.
         Supervisor only validates unknowns via RAG and deduplicates.
+        The report is built straight from the supervisor's result in the
+        same node, rather than in a separate node re-reading it from state.
         """
         pdf_summary = state["pdf_summary"]
         
@@ -173,44 +590,91 @@ Pipe breakdown:
             "consolidated_data": {},
             "conflicts": [],
             "vision_result": vision_result,  # Pass for validation and deduplication
-            "pdf_path": state.get("pdf_path")  # NEW: For legend extraction
+            "pdf_path": state.get("pdf_path"),  # NEW: For legend extraction
+            "user_query": state.get("user_query", "")
         }
         
+        # Reuse the legend extracted by the prefetch branch when available
+        prefetched = state.get("final_report", {}).get("rag_prefetch", {})
+        if "text_legend" in prefetched:
+            supervisor_state["text_legend"] = prefetched["text_legend"]
+        
+        # Reuse material lookups made while Vision pages were streaming
+        supervisor_state["rag_cache"] = state.get("final_report", {}).get("material_rag_cache", {})
+        
         # Run supervisor in VALIDATION-ONLY mode (no extraction)
-        result = self.supervisor.validate_and_enrich(supervisor_state)
+        # Supervisor is synchronous (RAG + LLM calls) - run it off the event loop
+        result = await asyncio.to_thread(
+            self.supervisor.validate_and_enrich, supervisor_state
+        )
+        
+        logger.info(
+            "[Main Agent] Supervisor complete. Found %d pipes",
+            result["consolidated_data"].get("summary", {}).get("total_pipes", 0)
+        )
+        await self._emit_progress(
+            config,
+            "validation_complete",
+            total_pipes=result["consolidated_data"].get("summary", {}).get("total_pipes", 0),
+            materials_checked=len(result["researcher_results"]),
+            user_alerts=result["consolidated_data"].get("user_alerts")
+        )
+        
+        logger.info("[Main Agent] Generating final report...")
+        
+        # Validating and dumping the report is pure-Python work proportional
+        # to the pipe count - keep it off the event loop too
+        takeoff_result = await asyncio.to_thread(
+            self._build_takeoff_result, pdf_summary, vision_result, result
+        )
+        summary = takeoff_result["summary"]
         
         logger.info(
-            f"[Main Agent] Supervisor complete. "
-            f"Found {result['consolidated_data'].get('summary', {}).get('total_pipes', 0)} pipes"
+            "[Main Agent] Report generated: %d pipes, %.1f LF",
+            summary["total_pipes"],
+            summary["total_lf"]
+        )
+        await self._emit_progress(
+            config,
+            "report_complete",
+            total_pipes=summary["total_pipes"],
+            total_lf=summary["total_lf"]
         )
         
-        # Update state with supervisor results (preserve vision_results!)
+        # Update state with supervisor results and the report (the
+        # final_report reducer keeps vision_results and the other existing keys)
         return {
-            **state,
             "final_report": {
-                **state.get("final_report", {}),  # Preserve existing data like vision_results
                 "supervisor_tasks": result["assigned_tasks"],
                 "researcher_results": result["researcher_results"],
                 "consolidated_data": result["consolidated_data"],
-                "conflicts": result["conflicts"]
+                "conflicts": result["conflicts"],
+                "takeoff_result": takeoff_result
             }
         }
     
-    def generate_report_node(self, state: AgentState) -> AgentState:
+    def _build_takeoff_result(
+        self,
+        pdf_summary: str,
+        vision_results: Dict[str, Any],
+        supervisor_result: SupervisorState
+    ) -> Dict[str, Any]:
         """
-        Node 3: Generate final takeoff report.
+        Build and serialize the TakeoffResult for a finished workflow.
         
-        Uses vision results + researcher RAG validation.
-        """
-        logger.info("[Main Agent] Generating final report...")
+        Args:
+            pdf_summary: Summary from the PDF analysis
+            vision_results: Combined Vision results (actual pipe data)
+            supervisor_result: Supervisor validation output
         
-        # Get vision results (actual pipe data)
-        vision_results = state["final_report"].get("vision_results", {})
+        Returns:
+            TakeoffResult as a plain dict
+        """
         vision_pipes = vision_results.get("pipes", [])
         
         # Get researcher results (RAG validation)
-        researcher_results = state["final_report"].get("researcher_results", {})
-        consolidated = state["final_report"].get("consolidated_data", {})
+        researcher_results = supervisor_result["researcher_results"]
+        consolidated = supervisor_result["consolidated_data"]
         
         # Trust Supervisor's deduplicated summary
         supervisor_summary = consolidated["summary"]
@@ -227,68 +691,53 @@ Pipe breakdown:
             validation_flags_count=0
         )
         
-        # Convert vision pipes to PipeDetection format
-        from app.models import PipeDetection
-        pipes = []
-        for i, vp in enumerate(vision_pipes):
-            pipe = PipeDetection(
-                pipe_id=f"pipe_{i}",
-                discipline=vp["discipline"],
-                material=vp["material"],
-                diameter_in=vp["diameter_in"],
-                length_ft=vp["length_ft"],
-                invert_in_ft=vp.get("invert_in_ft"),
-                invert_out_ft=vp.get("invert_out_ft"),
-                ground_level_ft=vp.get("ground_level_ft"),
-                depth_ft=vp.get("depth_ft"),
-                retrieved_context=[],
-                validation_flags=[]
-            )
-            pipes.append(pipe)
-        
-        # Build TakeoffResult
-        result = TakeoffResult(
-            summary=summary,
-            pipes=pipes,
-            pdf_summary=state["pdf_summary"],
-            rag_stats={
+        # Build TakeoffResult; pipes are fed from a generator, so each
+        # PipeDetection-shaped dict only lives until it is validated
+        result = TakeoffResult.model_validate({
+            "summary": summary,
+            "pipes": _iter_pipe_dicts(vision_pipes),
+            "pdf_summary": pdf_summary,
+            "rag_stats": {
                 "researchers_deployed": len(researcher_results),
+                # Counts are recorded when each result is built
                 "total_standards_retrieved": sum(
-                    len(r.get("retrieved_context", []))
+                    r.get("retrieved_count", 0)
                     for r in researcher_results.values()
                 ),
-                "conflicts_found": len(state["final_report"].get("conflicts", []))
+                "conflicts_found": len(supervisor_result["conflicts"])
             }
-        )
-        
-        logger.info(
-            f"[Main Agent] Report generated: {summary.total_pipes} pipes, "
-            f"{summary.total_lf:.1f} LF"
-        )
+        })
         
-        # Update state
-        return {
-            **state,
-            "final_report": {
-                **state["final_report"],
-                "takeoff_result": result.model_dump()
-            }
-        }
+        return result.model_dump()
     
-    def run_takeoff(
+    async def run_takeoff_stream(
         self,
         pdf_path: str,
-        user_query: str = ""
-    ) -> Dict[str, Any]:
+        user_query: str = "",
+        force_refresh: bool = False,
+        thread_id: str = None,
+        batch_mode: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Run the complete takeoff workflow.
+        Run the complete takeoff workflow, yielding progress as it happens.
         
         Args:
             pdf_path: Path to PDF file
             user_query: Optional user clarification
-        
-        Returns:
-            Final takeoff result
+            force_refresh: Re-run Vision even if cached results exist
+            thread_id: Checkpoint thread of a failed run to resume (logged on
+                failure). Defaults to a hash of the PDF and user_query, so
+                retrying a takeoff that stopped mid-workflow resumes it; a
+                thread that already completed is never replayed - the
+                takeoff runs again on a new thread. force_refresh always
+                starts a new thread
+            batch_mode: Send Vision pages through the OpenAI Batch API (about
+                half the cost, up to 24h turnaround) for offline runs
+        
+        Yields:
+            {"type": "progress", "stage": ..., ...} structured node updates,
+            {"type": "node_complete", "node": ...} as each node finishes,
+            and finally {"type": "result", "final_report": {...}}
         """
         logger.info("=" * 60)
         logger.info("MAIN AGENT: Starting takeoff workflow")
@@ -300,25 +749,86 @@ Pipe breakdown:
             "user_query": user_query,
             "pdf_summary": "",
             "final_report": {},
-            "messages": []
+            "force_refresh": force_refresh,
+            "batch_mode": batch_mode
         }
         
+        # Hash the PDF once, off the event loop: the digest keys both the
+        # checkpoint thread and the Vision cache. An unreadable file is
+        # reported by analyze_pdf
+        try:
+            initial_state["pdf_digest"] = await asyncio.to_thread(_pdf_digest, pdf_path)
+        except OSError:
+            pass
+        
+        final_report = None
+        if thread_id is None and CHECKPOINT_DB and not force_refresh and "pdf_digest" in initial_state:
+            thread_id = _takeoff_thread_id(initial_state["pdf_digest"], user_query, batch_mode)
+        resuming = thread_id is not None
+        if resuming and not _claim_thread(thread_id):
+            # Its snapshot is another run's in-flight state, not a stopped one
+            logger.info("Takeoff thread %s is already running, starting a new run", thread_id)
+            resuming = False
+            thread_id = None
+        if not resuming:
+            thread_id = uuid.uuid4().hex
+            _claim_thread(thread_id)
+        claimed_thread = thread_id
+        run_config = {"configurable": {"thread_id": thread_id}}
+        
         try:
-            # Run the LangGraph workflow
-            final_state = self.workflow.invoke(initial_state)
+            async with self._open_workflow() as workflow:
+                graph_input = initial_state
+                if resuming and CHECKPOINT_DB:
+                    snapshot = await workflow.aget_state(run_config)
+                    if snapshot.next:
+                        # Stopped mid-workflow - resume from the last completed node
+                        logger.info("Resuming takeoff thread %s at %s", thread_id, ", ".join(snapshot.next))
+                        graph_input = None
+                    elif snapshot.values:
+                        # Already completed - run again rather than replaying a
+                        # report made with older code, standards or Vision output
+                        logger.info("Takeoff thread %s already completed, starting a new run", thread_id)
+                        thread_id = uuid.uuid4().hex
+                        run_config = {"configurable": {"thread_id": thread_id}}
+                
+                # Run the LangGraph workflow
+                async for event in workflow.astream_events(
+                    graph_input, config=run_config, version="v2"
+                ):
+                    kind = event["event"]
+                    if kind == "on_custom_event" and event["name"] == PROGRESS_EVENT:
+                        yield {"type": "progress", **event["data"]}
+                    elif kind == "on_chain_end":
+                        if event["name"] in WORKFLOW_NODES:
+                            yield {"type": "node_complete", "node": event["name"]}
+                        elif not event.get("parent_ids"):
+                            # Root run finished - its output is the final state
+                            final_report = event["data"]["output"]["final_report"]
+                
+                if final_report is not None and CHECKPOINT_DB:
+                    # Completed threads are never resumed - keep only failed runs on disk
+                    await self._delete_checkpoints(workflow, thread_id)
+            
+            if final_report is None:
+                raise RuntimeError("Workflow finished without a final state")
             
             logger.info("=" * 60)
             logger.info("MAIN AGENT: Takeoff workflow complete")
             logger.info("=" * 60)
-            
-            return final_state["final_report"]
         
         except Exception as e:
-            logger.error(f"Workflow failed: {e}")
+            logger.error("Workflow failed: %s", e)
+            if CHECKPOINT_DB:
+                logger.error(
+                    "Completed nodes are checkpointed - resume with "
+                    "run_takeoff(..., thread_id=\"%s\")",
+                    thread_id
+                )
             import traceback
             traceback.print_exc()
             
-            return {
+            final_report = {
                 "error": str(e),
                 "consolidated_data": {
                     "summary": {
@@ -335,20 +845,142 @@ Pipe breakdown:
                     "recommendations": "Manual takeoff required"
                 }
             }
+        
+        finally:
+            _release_thread(claimed_thread)
+        
+        yield {"type": "result", "final_report": final_report, "thread_id": thread_id}
+    
+    async def run_takeoff(
+        self,
+        pdf_path: str,
+        user_query: str = "",
+        force_refresh: bool = False,
+        thread_id: str = None,
+        batch_mode: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Run the complete takeoff workflow.
+        
+        Drains run_takeoff_stream and returns only the final report.
+        
+        Args:
+            pdf_path: Path to PDF file
+            user_query: Optional user clarification
+            force_refresh: Re-run Vision even if cached results exist
+            thread_id: Checkpoint thread of a failed run to resume
+            batch_mode: Run Vision through the OpenAI Batch API
+        
+        Returns:
+            Final takeoff result
+        """
+        final_report = {}
+        async for event in self.run_takeoff_stream(
+            pdf_path, user_query, force_refresh, thread_id, batch_mode
+        ):
+            if event["type"] == "result":
+                final_report = event["final_report"]
+        return final_report
+    
+    def run_takeoff_sync(
+        self,
+        pdf_path: str,
+        user_query: str = "",
+        force_refresh: bool = False,
+        thread_id: str = None,
+        batch_mode: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Synchronous wrapper around run_takeoff for legacy callers.
+        
+        Must not be called from inside a running event loop.
+        """
+        async def run() -> Dict[str, Any]:
+            try:
+                return await self.run_takeoff(pdf_path, user_query, force_refresh, thread_id, batch_mode)
+            finally:
+                # The loop ends with this call - close its pool while it can be awaited
+                await self._aclose_http_client()
+        
+        return asyncio.run(run())
+
+
+# Shared agent for the convenience functions, so each call doesn't rebuild the
+# LLM client, supervisor and compiled workflow
+_MAIN_AGENT_SINGLETON: Optional[MainAgent] = None
+_MAIN_AGENT_LOCK = threading.Lock()
+
+
+def get_main_agent() -> MainAgent:
+    """Return the shared MainAgent, creating it on first use."""
+    global _MAIN_AGENT_SINGLETON
+    if _MAIN_AGENT_SINGLETON is None:
+        with _MAIN_AGENT_LOCK:
+            if _MAIN_AGENT_SINGLETON is None:
+                _MAIN_AGENT_SINGLETON = MainAgent()
+    return _MAIN_AGENT_SINGLETON
+
+
+async def aclose_main_agent() -> None:
+    """Release the shared MainAgent's and LLM clients' HTTP resources."""
+    global _MAIN_AGENT_SINGLETON
+    with _MAIN_AGENT_LOCK:
+        agent = _MAIN_AGENT_SINGLETON
+        _MAIN_AGENT_SINGLETON = None
+    if agent is not None:
+        await agent.aclose()
+    await aclose_http_clients()
+
+
+# Convenience functions for easy import
+async def arun_takeoff(
+    pdf_path: str,
+    user_query: str = "",
+    force_refresh: bool = False,
+    thread_id: str = None,
+    batch_mode: bool = False
+) -> Dict[str, Any]:
+    """
+    Run takeoff on a PDF file (async, for use inside an event loop).
+    
+    Args:
+        pdf_path: Path to PDF
+        user_query: Optional clarification
+        force_refresh: Re-run Vision even if cached results exist
+        thread_id: Checkpoint thread of a failed run to resume
+        batch_mode: Run Vision through the OpenAI Batch API
+    
+    Returns:
+        Takeoff results
+    """
+    agent = get_main_agent()
+    return await agent.run_takeoff(
+        pdf_path, user_query, force_refresh, thread_id, batch_mode
+    )
 
 
-# Convenience function for easy import
-def run_takeoff(pdf_path: str, user_query: str = "") -> Dict[str, Any]:
+def run_takeoff(
+    pdf_path: str,
+    user_query: str = "",
+    force_refresh: bool = False,
+    thread_id: str = None,
+    batch_mode: bool = False
+) -> Dict[str, Any]:
     """
     Run takeoff on a PDF file.
     
     Args:
         pdf_path: Path to PDF
         user_query: Optional clarification
+        force_refresh: Re-run Vision even if cached results exist
+        thread_id: Checkpoint thread of a failed run to resume
+        batch_mode: Run Vision through the OpenAI Batch API
     
     Returns:
         Takeoff results
     """
-    agent = MainAgent()
-    return agent.run_takeoff(pdf_path, user_query)
+    agent = get_main_agent()
+    return agent.run_takeoff_sync(
+        pdf_path, user_query, force_refresh, thread_id, batch_mode
+    )
 
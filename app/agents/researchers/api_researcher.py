@@ -4,13 +4,32 @@ API Researcher - Queries external APIs when RAG has insufficient context.
 Uses Tavily API for web search on construction standards, materials,
 and code requirements not available in the static knowledge base.
 """
+import asyncio
+import hashlib
 import logging
 import os
-from typing import Dict, Any, List
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+import httpx
 from tavily import TavilyClient
 
 logger = logging.getLogger(__name__)
 
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+# Max concurrent Tavily searches in abatch_analyze
+MAX_API_CONCURRENCY = 10
+
+# Results per search (a state's "max_results" overrides it, capped at Tavily's limit)
+DEFAULT_MAX_RESULTS = 5
+TAVILY_MAX_RESULTS = 20
+
+# Successful searches reused across requests (construction specs change slowly)
+API_CACHE_SIZE = 1024
+API_CACHE_TTL = float(os.getenv("API_CACHE_TTL", str(30 * 24 * 3600)))
+
 
 class APIResearcher:
     """
@@ -21,12 +40,17 @@ class APIResearcher:
     - Unknown materials/codes detected
     """
     
+    # Process-wide {query key: (stored at, result)}, most recently used last
+    _result_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+    _result_cache_lock = threading.Lock()
+    
     def __init__(self):
         """Initialize API researcher with Tavily client."""
         api_key = os.getenv("TAVILY_API_KEY")
         if not api_key:
             raise ValueError("TAVILY_API_KEY not set in environment")
         
+        self.api_key = api_key
         self.tavily_client = TavilyClient(api_key=api_key)
         self.discipline = "api"
         self.name = "API Knowledge Retrieval"
@@ -38,54 +62,251 @@ class APIResearcher:
         Query external APIs for construction knowledge.
         
         Args:
-            state: Research task state with 'task' key
+            state: Research task state with 'task' key (and optionally
+                'max_results', for queries covering several items)
             vision_pipes: Optional pipe data from Vision LLM
         
         Returns:
             Dict with findings and retrieved context
         """
         task = state.get("task", "")
+        max_results = state.get("max_results", DEFAULT_MAX_RESULTS)
+        
+        key = self._query_key(task, max_results)
+        cached = self._cached_result(key)
+        if cached is not None:
+            return cached
         
         logger.info(f"[api] Searching external sources for: {task[:50]}...")
         
         try:
             # Search with Tavily - focus on construction/engineering domains
-            results = self.tavily_client.search(
-                query=task,
-                search_depth="advanced",
-                max_results=5,
-                include_domains=["iccsafe.org", "astm.org", "awwa.org", "asce.org"],
+            results = self.tavily_client.search(query=task, timeout=15, **self._search_params(max_results))
+            result = self._build_result(results)
+        
+        except Exception as e:
+            return self._error_result(e)
+        
+        self._cache_result(key, result)
+        return result
+    
+    async def aanalyze(
+        self,
+        state: Dict[str, Any],
+        vision_pipes: List[Dict] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        inflight: Optional[Dict[str, asyncio.Future]] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of analyze: POSTs to the Tavily REST API over the
+        pooled HTTP/2 client instead of blocking a thread per search.
+        
+        Args:
+            state: Research task state with 'task' key
+            vision_pipes: Optional pipe data from Vision LLM
+            http_client: Client to use (a one-off client is created per
+                search if omitted)
+            inflight: Request-scoped {query key: search future}; identical
+                queries (ignoring case/whitespace) in the same request share
+                one Tavily call, whether still running or already done
+        
+        Returns:
+            Dict with findings and retrieved context
+        """
+        task = state.get("task", "")
+        max_results = state.get("max_results", DEFAULT_MAX_RESULTS)
+        
+        if inflight is None:
+            return await self._asearch(task, http_client, max_results)
+        
+        key = self._query_key(task, max_results)
+        if key in inflight:
+            logger.info(f"[api] Reusing search already made in this request: {task[:50]}...")
+        else:
+            inflight[key] = asyncio.ensure_future(self._asearch(task, http_client, max_results))
+        
+        # Shield so one cancelled caller doesn't cancel the search for the others
+        result = await asyncio.shield(inflight[key])
+        return {
+            **result,
+            "findings": dict(result["findings"]),
+            "retrieved_context": list(result["retrieved_context"])
+        }
+    
+    async def _asearch(
+        self,
+        task: str,
+        http_client: Optional[httpx.AsyncClient] = None,
+        max_results: int = DEFAULT_MAX_RESULTS
+    ) -> Dict[str, Any]:
+        """One Tavily REST search, packaged as a result (never raises)."""
+        key = self._query_key(task, max_results)
+        cached = self._cached_result(key)
+        if cached is not None:
+            return cached
+        
+        logger.info(f"[api] Searching external sources for: {task[:50]}...")
+        
+        if http_client is None:
+            async with self._new_http_client() as client:
+                return await self._asearch(task, client, max_results)
+        
+        try:
+            response = await http_client.post(
+                TAVILY_SEARCH_URL,
+                json={"query": task, **self._search_params(max_results)},
+                headers={"Authorization": f"Bearer {self.api_key}"},
                 timeout=15
             )
-            
-            logger.info(f"[api] Found {len(results.get('results', []))} external sources")
-            
-            # Format results
-            external_knowledge = self._format_results(results)
-            retrieved_contexts = self._extract_contexts(results)
-            
-            return {
-                "findings": {
-                    "analysis": external_knowledge,
-                    "source": "external_api",
-                    "api_used": "tavily",
-                    "results_count": len(retrieved_contexts)
-                },
-                "retrieved_context": retrieved_contexts,
-                "retrieved_standards_count": len(retrieved_contexts)
-            }
+            response.raise_for_status()
+            result = self._build_result(response.json())
         
         except Exception as e:
-            logger.error(f"[api] API search failed: {e}")
-            return {
-                "findings": {
-                    "analysis": f"External API search failed: {str(e)}",
-                    "source": "external_api_error",
-                    "api_used": "tavily"
-                },
-                "retrieved_context": [],
-                "retrieved_standards_count": 0
-            }
+            return self._error_result(e)
+        
+        self._cache_result(key, result)
+        return result
+    
+    async def abatch_analyze(
+        self,
+        states: List[Dict[str, Any]],
+        http_client: Optional[httpx.AsyncClient] = None,
+        inflight: Optional[Dict[str, asyncio.Future]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several searches concurrently (at most MAX_API_CONCURRENCY at once).
+        
+        Duplicate queries are searched once (see aanalyze).
+        
+        Args:
+            states: Research task states with 'task' keys
+            http_client: Client to use (one pooled client scoped to this
+                batch if omitted)
+            inflight: Request-scoped search futures to share; a fresh one
+                scoped to this batch if omitted
+        
+        Returns:
+            One result per state, in order
+        """
+        if http_client is None:
+            async with self._new_http_client() as client:
+                return await self.abatch_analyze(states, http_client=client, inflight=inflight)
+        
+        semaphore = asyncio.Semaphore(MAX_API_CONCURRENCY)
+        if inflight is None:
+            inflight = {}
+        
+        async def run(state: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.aanalyze(state, http_client=http_client, inflight=inflight)
+        
+        results = await asyncio.gather(*(run(state) for state in states), return_exceptions=True)
+        return [
+            self._error_result(result) if isinstance(result, Exception) else result
+            for result in results
+        ]
+    
+    def batch_analyze(self, states: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Synchronous batch search for callers running outside an event loop
+        (e.g. the supervisor in a worker thread).
+        
+        Uses a client scoped to this call, since the loop it runs on is
+        discarded afterwards.
+        """
+        if not states:
+            return []
+        
+        return asyncio.run(self.abatch_analyze(states))
+    
+    @staticmethod
+    def _new_http_client() -> httpx.AsyncClient:
+        """
+        Pooled HTTP/2 Tavily client for one batch of searches.
+        
+        Scoped to the caller's `async with`, so it is closed on the loop
+        that opened it; a process-wide client would outlive the loops that
+        asyncio.run creates and leak their pools.
+        """
+        return httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=20)
+        )
+    
+    @staticmethod
+    def _query_key(task: str, max_results: int = DEFAULT_MAX_RESULTS) -> str:
+        """Cache/coalescing key for a query (ignoring case and whitespace) and its result count."""
+        normalized = " ".join(task.lower().split())
+        return hashlib.sha1(f"{normalized}|{max_results}".encode()).hexdigest()
+    
+    @classmethod
+    def _cached_result(cls, key: str) -> Optional[Dict[str, Any]]:
+        """Copy of a fresh cached search result, or None."""
+        with cls._result_cache_lock:
+            entry = cls._result_cache.get(key)
+            if entry is None:
+                return None
+            stored_at, result = entry
+            if time.monotonic() - stored_at > API_CACHE_TTL:
+                del cls._result_cache[key]
+                return None
+            cls._result_cache.move_to_end(key)
+        
+        logger.info("[api] Reusing cached external search")
+        return {
+            **result,
+            "findings": dict(result["findings"]),
+            "retrieved_context": list(result["retrieved_context"])
+        }
+    
+    @classmethod
+    def _cache_result(cls, key: str, result: Dict[str, Any]) -> None:
+        """Remember a successful search (errors are retried next time)."""
+        with cls._result_cache_lock:
+            cls._result_cache[key] = (time.monotonic(), result)
+            if len(cls._result_cache) > API_CACHE_SIZE:
+                cls._result_cache.popitem(last=False)
+    
+    @staticmethod
+    def _search_params(max_results: int = DEFAULT_MAX_RESULTS) -> Dict[str, Any]:
+        """Tavily search options - focus on construction/engineering domains."""
+        return {
+            "search_depth": "advanced",
+            "max_results": max(1, min(max_results, TAVILY_MAX_RESULTS)),
+            "include_domains": ["iccsafe.org", "astm.org", "awwa.org", "asce.org"]
+        }
+    
+    def _build_result(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Package Tavily search results as the researcher's result."""
+        logger.info(f"[api] Found {len(results.get('results', []))} external sources")
+        
+        # Format results
+        external_knowledge = self._format_results(results)
+        retrieved_contexts = self._extract_contexts(results)
+        
+        return {
+            "findings": {
+                "analysis": external_knowledge,
+                "source": "external_api",
+                "api_used": "tavily",
+                "results_count": len(retrieved_contexts)
+            },
+            "retrieved_context": retrieved_contexts,
+            "retrieved_standards_count": len(retrieved_contexts)
+        }
+    
+    def _error_result(self, error: Exception) -> Dict[str, Any]:
+        """Result for a failed search."""
+        logger.error(f"[api] API search failed: {error}")
+        return {
+            "findings": {
+                "analysis": f"External API search failed: {str(error)}",
+                "source": "external_api_error",
+                "api_used": "tavily"
+            },
+            "retrieved_context": [],
+            "retrieved_standards_count": 0
+        }
     
     def _format_results(self, results: Dict[str, Any]) -> str:
         """Format Tavily results into analysis text."""
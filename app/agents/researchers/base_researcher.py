@@ -3,16 +3,61 @@ Base researcher agent with RAG retrieval capabilities.
 
 All specialized researchers (storm, sanitary, water, elevation, legend) inherit from this.
 """
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, List
-from langchain_openai import ChatOpenAI
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+import orjson
 from langchain_core.messages import SystemMessage, HumanMessage
 
 from app.models import ResearcherState
-from app.rag.retriever import HybridRetriever
+from app.agents._shared import get_llm_mini, get_retriever
+from app.agents.llm_cache import configure_llm_cache
+from app.agents.llm_json import extract_json_array
+from app.agents.resilience import LLM_BREAKER, is_transient_error, llm_retry
+from app.agents.researchers.semantic_cache import SEMANTIC_CACHE, doc_set_key, task_scope_key
+from app.rag.retriever import format_standard
 
 logger = logging.getLogger(__name__)
 
+# Identical temperature-0 prompts are served from the shared LLM cache
+configure_llm_cache()
+
+
+# Retrieval results remembered across runs (most recently used kept). The
+# TTL bounds how long a KB rebuilt by another process (scripts/setup_kb.py)
+# keeps being answered from the old index; index_version only covers
+# rebuilds in this process
+RETRIEVAL_MEMO_SIZE = 512
+RETRIEVAL_MEMO_TTL = float(os.getenv("RETRIEVAL_MEMO_TTL", "600"))
+
+# Used by researchers that don't set SYSTEM_PROMPT
+DEFAULT_SYSTEM_PROMPT = """You are a specialized construction takeoff researcher focusing on {specialty}.
+
+Your role:
+- Analyze construction PDFs for specific information related to your specialty
+- Use the provided construction standards to validate your findings
+- Provide accurate, confident assessments based on evidence
+- Flag any uncertainties or conflicts
+
+Be precise and cite standards when relevant."""
+
+BATCH_SYSTEM_PROMPT = """You are a team of specialized construction takeoff researchers answering several tasks at once.
+
+Each section below is one researcher's task: that researcher's instructions, the construction standards retrieved for it, and the task. Answer every section independently, following that section's instructions and using only that section's standards, and EXPLICITLY CITE the standards you used (quote key phrases).
+
+Return ONLY a JSON array with one object per section:
+[
+  {"id": 1, "analysis": "<the section's answer, in the format its instructions ask for>"}
+]"""
+BATCH_SYSTEM_MESSAGE = SystemMessage(content=BATCH_SYSTEM_PROMPT)
+
 
 class BaseResearcher:
     """
@@ -25,6 +70,29 @@ class BaseResearcher:
     4. Returns findings
     """
     
+    # Process-wide LRU of retrieval results shared by all researchers, so
+    # constant topic queries skip embedding + search after the first run
+    _retrieval_memo: "OrderedDict[bytes, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+    _retrieval_memo_lock = threading.Lock()
+    
+    # Role/expertise prompt; None uses DEFAULT_SYSTEM_PROMPT with the specialty
+    SYSTEM_PROMPT: str = None
+    
+    # Output instructions, appended to the system prompt (static prefix)
+    RESPONSE_INSTRUCTIONS = """Each request gives you the construction standards retrieved for a task, followed by the task.
+
+Provide your findings and EXPLICITLY CITE the construction standards you used.
+
+Format your response as:
+
+FINDINGS:
+[Your analysis of what you found]
+
+STANDARDS USED:
+[List which of the provided construction standards informed your analysis. Quote key phrases.]
+
+IMPORTANT: Reference specific standards in your findings to show how you validated the information."""
+    
     def __init__(
         self,
         researcher_name: str,
@@ -43,14 +111,15 @@ class BaseResearcher:
         self.discipline = discipline
         self.specialty = specialty
         
-        # Initialize LLM
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0
+        # Prompts are static per researcher - build them once, not per call
+        self._system_prompt = self.SYSTEM_PROMPT or DEFAULT_SYSTEM_PROMPT.format(specialty=specialty)
+        self._system_message = SystemMessage(
+            content=f"{self.get_system_prompt()}\n\n{self.RESPONSE_INSTRUCTIONS}"
         )
         
-        # Initialize retriever
-        self.retriever = HybridRetriever()
+        # Shared LLM client and retriever (one connection pool / index per process)
+        self.llm = get_llm_mini()
+        self.retriever = get_retriever()
         
         logger.info(f"Initialized {researcher_name} researcher: {specialty}")
     
@@ -58,23 +127,87 @@ class BaseResearcher:
         """
         Get the system prompt for this researcher.
         
-        Override in subclasses to customize.
+        Subclasses customize it by setting SYSTEM_PROMPT.
         """
-        return f"""You are a specialized construction takeoff researcher focusing on {self.specialty}.
-
-Your role:
-- Analyze construction PDFs for specific information related to your specialty
-- Use the provided construction standards to validate your findings
-- Provide accurate, confident assessments based on evidence
-- Flag any uncertainties or conflicts
-
-Be precise and cite standards when relevant."""
+        return self._system_prompt
+    
+    def _retrieval_memo_key(self, cache_key: tuple) -> bytes:
+        """Cross-run memo key: request cache key plus the retriever's index version."""
+        return hashlib.blake2b(
+            repr((*cache_key, self.retriever.index_version)).encode(),
+            digest_size=16
+        ).digest()
+    
+    def _recall_context(
+        self,
+        cache_key: tuple,
+        cache: Optional[dict]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Results for cache_key from the request cache or cross-run memo, else None."""
+        query = cache_key[0]
+        if cache is not None and cache_key in cache:
+            logger.info(f"[{self.researcher_name}] Reusing retrieved context for: '{query}'")
+            return cache[cache_key]
+        
+        # Same query answered in an earlier run against the same index?
+        memo_key = self._retrieval_memo_key(cache_key)
+        with self._retrieval_memo_lock:
+            entry = self._retrieval_memo.get(memo_key)
+            if entry is None:
+                return None
+            stored_at, results = entry
+            if time.monotonic() - stored_at > RETRIEVAL_MEMO_TTL:
+                del self._retrieval_memo[memo_key]
+                return None
+            self._retrieval_memo.move_to_end(memo_key)
+        
+        logger.info(f"[{self.researcher_name}] Retrieval memo hit for: '{query}'")
+        # Callers get their own list; the docs themselves are read-only
+        results = list(results)
+        if cache is not None:
+            cache[cache_key] = results
+        return results
+    
+    def _search_context(
+        self,
+        cache_key: tuple,
+        cache: Optional[dict],
+        query_embedding: List[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Run the hybrid search for cache_key and remember the results."""
+        query, k, discipline, category = cache_key
+        logger.info(
+            f"[{self.researcher_name}] Retrieving context for: '{query}'"
+        )
+        
+        results = self.retriever.retrieve_hybrid(
+            query=query,
+            k=k,
+            discipline=discipline,
+            category=category,
+            query_embedding=query_embedding
+        )
+        
+        logger.info(
+            f"[{self.researcher_name}] Retrieved {len(results)} standards"
+        )
+        
+        with self._retrieval_memo_lock:
+            self._retrieval_memo[self._retrieval_memo_key(cache_key)] = (time.monotonic(), results)
+            if len(self._retrieval_memo) > RETRIEVAL_MEMO_SIZE:
+                self._retrieval_memo.popitem(last=False)
+        
+        results = list(results)
+        if cache is not None:
+            cache[cache_key] = results
+        return results
     
     def retrieve_context(
         self,
         query: str,
         k: int = 5,
-        category: str = None
+        category: str = None,
+        cache: Dict[tuple, List[Dict[str, Any]]] = None
     ) -> List[Dict[str, Any]]:
         """
         Retrieve relevant construction standards.
@@ -83,25 +216,116 @@ Be precise and cite standards when relevant."""
             query: Search query
             k: Number of results
             category: Optional category filter
+            cache: Request-scoped cache shared by the researchers of one run,
+                so overlapping queries hit the retriever once
         
         Returns:
             List of retrieved documents with metadata
         """
-        logger.info(
-            f"[{self.researcher_name}] Retrieving context for: '{query}'"
-        )
+        cache_key = (query, k, self.discipline, category)
+        results = self._recall_context(cache_key, cache)
+        if results is None:
+            results = self._search_context(cache_key, cache)
+        return results
+    
+    def retrieve_context_batch(
+        self,
+        queries: List[str],
+        k: int = 5,
+        categories: List[Optional[str]] = None,
+        cache: Dict[tuple, List[Dict[str, Any]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve standards for several queries with one embedding request.
         
-        results = self.retriever.retrieve_hybrid(
-            query=query,
-            k=k,
-            discipline=self.discipline,
-            category=category
-        )
+        Queries not already cached are embedded together (one round-trip
+        instead of one per query), then searched with their vectors.
         
-        logger.info(
-            f"[{self.researcher_name}] Retrieved {len(results)} standards"
-        )
+        Args:
+            queries: Search queries
+            k: Number of results per query
+            categories: Optional category filter per query (same length as queries)
+            cache: Request-scoped cache (see retrieve_context)
+        
+        Returns:
+            One list of retrieved documents per query, in query order
+        """
+        categories = categories or [None] * len(queries)
+        cache_keys = [
+            (query, k, self.discipline, category)
+            for query, category in zip(queries, categories)
+        ]
+        
+        results = [self._recall_context(cache_key, cache) for cache_key in cache_keys]
+        missing = [i for i, docs in enumerate(results) if docs is None]
+        if not missing:
+            return results
+        
+        try:
+            vectors = self.retriever.embed_queries(
+                [queries[i] for i in missing]
+            )
+        except Exception as e:
+            # Fall back to per-query embedding inside the search
+            logger.warning(f"[{self.researcher_name}] Batch query embedding failed: {e}")
+            vectors = [None] * len(missing)
+        
+        for i, vector in zip(missing, vectors):
+            results[i] = self._search_context(cache_keys[i], cache, query_embedding=vector)
+        return results
+    
+    async def aretrieve_context(
+        self,
+        query: str,
+        k: int = 5,
+        category: str = None,
+        cache: Dict[tuple, List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Async variant of retrieve_context (the search runs in a worker thread)."""
+        cache_key = (query, k, self.discipline, category)
+        results = self._recall_context(cache_key, cache)
+        if results is None:
+            results = await asyncio.to_thread(self._search_context, cache_key, cache)
+        return results
+    
+    async def aretrieve_context_batch(
+        self,
+        queries: List[str],
+        k: int = 5,
+        categories: List[Optional[str]] = None,
+        cache: Dict[tuple, List[Dict[str, Any]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Async variant of retrieve_context_batch.
+        
+        After the single embedding request, the per-query searches run
+        concurrently, so retrieval takes as long as the slowest query.
+        """
+        categories = categories or [None] * len(queries)
+        cache_keys = [
+            (query, k, self.discipline, category)
+            for query, category in zip(queries, categories)
+        ]
+        
+        results = [self._recall_context(cache_key, cache) for cache_key in cache_keys]
+        missing = [i for i, docs in enumerate(results) if docs is None]
+        if not missing:
+            return results
+        
+        try:
+            vectors = await self.retriever.aembed_queries(
+                [queries[i] for i in missing]
+            )
+        except Exception as e:
+            logger.warning(f"[{self.researcher_name}] Batch query embedding failed: {e}")
+            vectors = [None] * len(missing)
         
+        searched = await asyncio.gather(*(
+            asyncio.to_thread(self._search_context, cache_keys[i], cache, vector)
+            for i, vector in zip(missing, vectors)
+        ))
+        for i, docs in zip(missing, searched):
+            results[i] = docs
         return results
     
     def format_context(self, retrieved_docs: List[Dict[str, Any]]) -> str:
@@ -109,19 +333,161 @@ Be precise and cite standards when relevant."""
         if not retrieved_docs:
             return "No relevant construction standards found."
         
-        formatted = "Relevant Construction Standards:\n\n"
-        for i, doc in enumerate(retrieved_docs, 1):
-            formatted += f"{i}. {doc['content']}\n"
-            formatted += f"   Source: {doc['metadata']['source']}"
-            if doc['metadata'].get('reference'):
-                formatted += f" - {doc['metadata']['reference']}"
-            formatted += "\n\n"
+        # Retriever results carry pre-rendered text; format anything else here
+        return "Relevant Construction Standards:\n\n" + "".join(
+            f"{i}. {doc.get('formatted') or format_standard(doc)}\n\n"
+            for i, doc in enumerate(retrieved_docs, 1)
+        )
+    
+    def gather_context(self, task: str, cache: dict = None) -> List[Dict[str, Any]]:
+        """
+        Retrieve the standards used to answer a task.
         
-        return formatted
+        Override in subclasses for specialized retrieval.
+        """
+        return self.retrieve_context(task, cache=cache)
+    
+    async def agather_context(self, task: str, cache: dict = None) -> List[Dict[str, Any]]:
+        """Async variant of gather_context; override alongside it."""
+        return await self.aretrieve_context(task, cache=cache)
+    
+    def build_messages(self, task: str, retrieved_docs: List[Dict[str, Any]]) -> list:
+        """
+        Build the LLM messages for a task and its retrieved standards.
+        
+        Ordered from most to least stable - system prompt + response
+        instructions, then the retrieved standards, then the task - so the
+        provider can reuse its cached prefill for the longest shared prefix.
+        """
+        context_text = self.format_context(retrieved_docs)
+        
+        user_prompt = f"""{context_text}
+
+Task: {task}"""
+        
+        return [
+            self._system_message,
+            HumanMessage(content=user_prompt)
+        ]
+    
+    def build_result(
+        self,
+        state: ResearcherState,
+        retrieved_docs: List[Dict[str, Any]],
+        findings_text: str
+    ) -> ResearcherState:
+        """Package the LLM's text findings as the researcher's result state."""
+        logger.info(
+            f"[{self.researcher_name}] Analysis complete. "
+            f"Response length: {len(findings_text)} chars"
+        )
+        
+        return {
+            "researcher_name": self.researcher_name,
+            "task": state["task"],
+            "retrieved_context": [doc["content"] for doc in retrieved_docs],
+            "retrieved_count": len(retrieved_docs),
+            "findings": {
+                "analysis": findings_text,
+                "retrieved_standards_count": len(retrieved_docs)
+            }
+        }
+    
+    @llm_retry
+    def _invoke_llm(self, messages: list):
+        """LLM call, retried with backoff on transient provider errors."""
+        return self.llm.invoke(messages)
+    
+    @llm_retry
+    async def _ainvoke_llm(self, messages: list):
+        """Async LLM call, retried with backoff on transient provider errors."""
+        return await self.llm.ainvoke(messages)
+    
+    def _record_llm_failure(self, error: Exception) -> None:
+        """Count a call that still failed after retries toward opening the breaker."""
+        if is_transient_error(error):
+            LLM_BREAKER.record_failure()
+    
+    def _rag_only_result(
+        self,
+        state: ResearcherState,
+        retrieved_docs: List[Dict[str, Any]]
+    ) -> ResearcherState:
+        """Result with the retrieved standards but no LLM analysis (breaker open)."""
+        logger.warning(f"[{self.researcher_name}] LLM circuit open - returning retrieved standards only")
+        result = self.build_result(
+            state,
+            retrieved_docs,
+            f"LLM unavailable - analysis skipped.\n\n{self.format_context(retrieved_docs)}"
+        )
+        result["findings"]["llm_skipped"] = True
+        return result
+    
+    def _failure_result(self, task: str, error: Exception) -> ResearcherState:
+        """Result state for a failed analysis."""
+        logger.error(f"[{self.researcher_name}] Analysis failed: {error}")
+        return {
+            "researcher_name": self.researcher_name,
+            "task": task,
+            "retrieved_context": [],
+            "findings": {"error": str(error), "analysis": ""}
+        }
+    
+    def _embed_task(self, task: str) -> Optional[List[float]]:
+        """Embed a task for the semantic cache (None if disabled or failed)."""
+        if SEMANTIC_CACHE is None:
+            return None
+        
+        try:
+            return self.retriever.embed_queries([task])[0]
+        except Exception as e:
+            logger.warning(f"[{self.researcher_name}] Semantic cache skipped: {e}")
+            return None
+    
+    def _semantic_lookup(
+        self,
+        state: ResearcherState,
+        retrieved_docs: List[Dict[str, Any]],
+        vector: Optional[List[float]] = None
+    ) -> tuple:
+        """
+        Look up findings for a similar task about the same PDF, with the
+        same numbers (pages, sheets), answered from the same standards.
+        
+        Args:
+            state: Researcher state; tasks without a cache_scope (source
+                PDF identity) are never cached
+            retrieved_docs: Standards the task would be answered from
+            vector: Task embedding, if already computed
+        
+        Returns:
+            (cached result or None, key to store a fresh result under or None)
+        """
+        source = state.get("cache_scope")
+        if SEMANTIC_CACHE is None or not retrieved_docs or not source:
+            return None, None
+        
+        task = state["task"]
+        if vector is None:
+            vector = self._embed_task(task)
+        if vector is None:
+            return None, None
+        
+        scope = f"{task_scope_key(task, source)}:{doc_set_key(retrieved_docs)}"
+        cached = SEMANTIC_CACHE.lookup(self.researcher_name, scope, vector)
+        return cached, (scope, vector)
+    
+    def _semantic_store(self, cache_key: tuple, result: ResearcherState) -> None:
+        """Remember successful findings for similar future tasks."""
+        if cache_key is not None and "error" not in result["findings"]:
+            SEMANTIC_CACHE.store(self.researcher_name, *cache_key, result)
     
     def analyze(self, state: ResearcherState) -> ResearcherState:
         """
-        Main analysis method - override in subclasses for specialized behavior.
+        Main analysis method.
+        
+        Retrieval, prompt and result shape come from gather_context,
+        build_messages and build_result - override those in subclasses.
         
         Args:
             state: Current researcher state with task
@@ -134,62 +500,194 @@ Be precise and cite standards when relevant."""
         logger.info(f"[{self.researcher_name}] Starting analysis: {task}")
         
         # 1. Retrieve relevant context
-        retrieved_docs = self.retrieve_context(task)
-        context_text = self.format_context(retrieved_docs)
+        retrieved_docs = self.gather_context(task, state.get("retrieval_cache"))
         
-        # 2. Analyze with LLM
-        system_prompt = self.get_system_prompt()
-        user_prompt = f"""Task: {task}
-
-{context_text}
-
-Provide your findings and EXPLICITLY CITE the construction standards you used.
-
-Format your response as:
-
-FINDINGS:
-[Your analysis of what you found]
-
-STANDARDS USED:
-[List which construction standards from above informed your analysis. Quote key phrases.]
-
-IMPORTANT: Reference specific standards in your findings to show how you validated the information."""
+        # Similar task over the same standards already answered?
+        cached, cache_key = self._semantic_lookup(state, retrieved_docs)
+        if cached is not None:
+            # Copy the context list - results are augmented in place later
+            return {**cached, "task": task, "retrieved_context": list(cached["retrieved_context"])}
         
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_prompt)
-        ]
+        # OpenAI failing repeatedly? Return the standards without waiting on it
+        if not LLM_BREAKER.allow():
+            return self._rag_only_result(state, retrieved_docs)
+        
+        # 2. Analyze with LLM
+        messages = self.build_messages(task, retrieved_docs)
         
         try:
-            response = self.llm.invoke(messages)
+            response = self._invoke_llm(messages)
             
             # Use raw text response - no JSON parsing needed!
-            findings_text = response.content
-            
-            logger.info(
-                f"[{self.researcher_name}] Analysis complete. "
-                f"Response length: {len(findings_text)} chars"
+            result = self.build_result(state, retrieved_docs, response.content)
+        
+        except Exception as e:
+            self._record_llm_failure(e)
+            return self._failure_result(task, e)
+        
+        LLM_BREAKER.record_success()
+        self._semantic_store(cache_key, result)
+        return result
+    
+    async def aanalyze(self, state: ResearcherState) -> ResearcherState:
+        """
+        Async variant of analyze, so the supervisor can run researchers
+        concurrently on one event loop.
+        
+        Retrieval searches (sync Qdrant/BM25) run in worker threads; the LLM
+        call uses the client's native async API. The task embedding for the
+        semantic cache doesn't depend on the retrieved docs, so it is
+        computed while retrieval is in flight.
+        
+        Args:
+            state: Current researcher state with task
+        
+        Returns:
+            Updated state with findings
+        """
+        task = state["task"]
+        
+        logger.info(f"[{self.researcher_name}] Starting analysis: {task}")
+        
+        retrieve_task = asyncio.create_task(
+            self.agather_context(task, state.get("retrieval_cache"))
+        )
+        # Only tasks scoped to a source PDF use the semantic cache
+        embed_task = None
+        if state.get("cache_scope"):
+            embed_task = asyncio.create_task(asyncio.to_thread(self._embed_task, task))
+        
+        retrieved_docs = await retrieve_task
+        vector = await embed_task if embed_task is not None else None
+        
+        cached, cache_key = self._semantic_lookup(state, retrieved_docs, vector)
+        if cached is not None:
+            # Copy the context list - results are augmented in place later
+            return {**cached, "task": task, "retrieved_context": list(cached["retrieved_context"])}
+        
+        if not LLM_BREAKER.allow():
+            return self._rag_only_result(state, retrieved_docs)
+        
+        messages = self.build_messages(task, retrieved_docs)
+        
+        try:
+            response = await self._ainvoke_llm(messages)
+            result = self.build_result(state, retrieved_docs, response.content)
+        
+        except Exception as e:
+            self._record_llm_failure(e)
+            return self._failure_result(task, e)
+        
+        LLM_BREAKER.record_success()
+        self._semantic_store(cache_key, result)
+        return result
+    
+    @classmethod
+    def batch_analyze(
+        cls,
+        jobs: List[Tuple["BaseResearcher", ResearcherState]]
+    ) -> List[ResearcherState]:
+        """
+        Analyze several researchers' tasks with a single LLM call.
+        
+        Retrieval still runs per researcher (concurrently), but all tasks go
+        to the model in one prompt that returns a JSON array of findings,
+        so N researchers cost one round-trip instead of N. Semantic cache
+        hits are answered without the model; any task missing from the
+        batched answer falls back to that researcher's own analyze.
+        
+        Args:
+            jobs: (researcher, state) pairs
+        
+        Returns:
+            Result states, in the same order as jobs
+        """
+        if not jobs:
+            return []
+        
+        def prepare(job):
+            researcher, state = job
+            docs = researcher.gather_context(state["task"], state.get("retrieval_cache"))
+            cached, cache_key = researcher._semantic_lookup(state, docs)
+            return docs, cached, cache_key
+        
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            prepared = list(executor.map(prepare, jobs))
+        
+        results: List[ResearcherState] = [None] * len(jobs)
+        sections = []
+        for i, ((researcher, state), (docs, cached, _)) in enumerate(zip(jobs, prepared), 1):
+            if cached is not None:
+                results[i - 1] = {
+                    **cached,
+                    "task": state["task"],
+                    "retrieved_context": list(cached["retrieved_context"])
+                }
+                continue
+            # The researcher's own prompt travels with its section, so
+            # specialised instructions survive batching
+            sections.append(
+                f"[Section {i}: {researcher.researcher_name} - {researcher.specialty}]\n"
+                f"Instructions:\n{researcher._system_message.content}\n\n"
+                f"{researcher.format_context(docs)}\n\n"
+                f"Task: {state['task']}"
             )
+        
+        analyses = {}
+        if sections and LLM_BREAKER.allow():
+            logger.info(f"Batch-analyzing {len(sections)} researcher task(s) in one LLM call")
+            try:
+                response = jobs[0][0]._invoke_llm([
+                    BATCH_SYSTEM_MESSAGE,
+                    HumanMessage(content="\n\n".join(sections))
+                ])
+                LLM_BREAKER.record_success()
+            except Exception as e:
+                jobs[0][0]._record_llm_failure(e)
+                logger.error(f"Batched researcher analysis failed, falling back per researcher: {e}")
+                response = None
             
-            # Return updated state with text findings
-            return {
-                "researcher_name": self.researcher_name,
-                "task": task,
-                "retrieved_context": [doc["content"] for doc in retrieved_docs],
-                "findings": {
-                    "analysis": findings_text,
-                    "retrieved_standards_count": len(retrieved_docs)
-                }
-            }
+            if response is not None:
+                analyses = cls._parse_batch_reply(response.content)
         
-        except Exception as e:
-            logger.error(f"[{self.researcher_name}] Analysis failed: {e}")
-            return {
-                "researcher_name": self.researcher_name,
-                "task": task,
-                "retrieved_context": [],
-                "findings": {"error": str(e), "analysis": ""}
-            }
+        for i, ((researcher, state), (docs, _, cache_key)) in enumerate(zip(jobs, prepared), 1):
+            if results[i - 1] is not None:
+                continue
+            if i in analyses:
+                result = researcher.build_result(state, docs, analyses[i])
+                researcher._semantic_store(cache_key, result)
+                results[i - 1] = result
+            else:
+                results[i - 1] = researcher.analyze(state)
+        
+        return results
+    
+    @staticmethod
+    def _parse_batch_reply(content: str) -> Dict[int, str]:
+        """
+        Map section id -> analysis from a batched reply.
+        
+        Malformed items (missing analysis, non-numeric id) are skipped one
+        by one, so a single bad entry only sends its own section down the
+        per-researcher fallback.
+        """
+        try:
+            items = orjson.loads(extract_json_array(content) or content)
+        except orjson.JSONDecodeError as e:
+            logger.warning(f"Batched reply was not a JSON array, falling back per researcher: {e}")
+            return {}
+        if not isinstance(items, list):
+            return {}
+        
+        analyses = {}
+        for item in items:
+            if not isinstance(item, dict) or not item.get("analysis"):
+                continue
+            try:
+                analyses[int(item.get("id"))] = item["analysis"]
+            except (TypeError, ValueError):
+                logger.warning(f"Skipping batched answer with invalid id: {item.get('id')!r}")
+        return analyses
     
     def __call__(self, state: ResearcherState) -> ResearcherState:
         """Make researcher callable."""
@@ -5,15 +5,7 @@ from app.agents.researchers.base_researcher import BaseResearcher
 class ElevationResearcher(BaseResearcher):
     """Specialized researcher for elevation extraction and depth calculation."""
     
-    def __init__(self):
-        super().__init__(
-            researcher_name="elevation",
-            discipline=None,  # Works across all disciplines
-            specialty="invert elevations, ground levels, and pipe depth calculations"
-        )
-    
-    def get_system_prompt(self) -> str:
-        return """You are an elevation and depth specialist for construction takeoff.
+    SYSTEM_PROMPT = """You are an elevation and depth specialist for construction takeoff.
 
 Your expertise:
 - Reading invert elevations (IE, INV notations)
@@ -30,4 +22,11 @@ Focus on:
 5. Cross-reference elevations between plan and profile views
 
 Be precise with elevation values - these are critical for cost estimation."""
+    
+    def __init__(self):
+        super().__init__(
+            researcher_name="elevation",
+            discipline=None,  # Works across all disciplines
+            specialty="invert elevations, ground levels, and pipe depth calculations"
+        )
 
@@ -5,15 +5,7 @@ from app.agents.researchers.base_researcher import BaseResearcher
 class LegendResearcher(BaseResearcher):
     """Specialized researcher for symbol legend interpretation."""
     
-    def __init__(self):
-        super().__init__(
-            researcher_name="legend",
-            discipline=None,
-            specialty="construction drawing legends, symbols, and notation standards"
-        )
-    
-    def get_system_prompt(self) -> str:
-        return """You are a construction drawing legend specialist for takeoff.
+    SYSTEM_PROMPT = """You are a construction drawing legend specialist for takeoff.
 
 Your expertise:
 - Standard utility symbols (MH, CB, WM, SS, SD, HYD, etc.)
@@ -30,4 +22,11 @@ Your role:
 5. Clarify any ambiguous symbols using retrieved standards
 
 Provide a clear mapping of what each symbol/notation means in this specific PDF."""
+    
+    def __init__(self):
+        super().__init__(
+            researcher_name="legend",
+            discipline=None,
+            specialty="construction drawing legends, symbols, and notation standards"
+        )
 
@@ -5,15 +5,7 @@ from app.agents.researchers.base_researcher import BaseResearcher
 class SanitaryResearcher(BaseResearcher):
     """Specialized researcher for sanitary sewer systems."""
     
-    def __init__(self):
-        super().__init__(
-            researcher_name="sanitary",
-            discipline="sanitary",
-            specialty="sanitary sewer systems including manholes, PVC/VCP pipes, and gravity sewers"
-        )
-    
-    def get_system_prompt(self) -> str:
-        return """You are a sanitary sewer specialist for construction takeoff.
+    SYSTEM_PROMPT = """You are a sanitary sewer specialist for construction takeoff.
 
 Your expertise:
 - Sanitary sewer materials (PVC, VCP, DI)
@@ -24,4 +16,11 @@ Your expertise:
 - Minimum slopes: 1.0% for 4", 0.6% for 6", 0.5% for 8", 0.4% for 10-12"
 
 Analyze for sanitary sewer pipes, inverts, manholes, and validate against standards."""
+    
+    def __init__(self):
+        super().__init__(
+            researcher_name="sanitary",
+            discipline="sanitary",
+            specialty="sanitary sewer systems including manholes, PVC/VCP pipes, and gravity sewers"
+        )
 
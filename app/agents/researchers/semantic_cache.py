@@ -0,0 +1,107 @@
+"""
+Semantic cache for researcher findings.
+
+Recurring takeoff tasks are worded slightly differently from run to run
+("extract sanitary inverts on page 3" vs "read sanitary invert elevations
+on page 3"), so exact-prompt caching misses them. This cache matches on
+task-embedding similarity, but only among entries that were answered from
+the exact same set of retrieved standards, for the same source PDF and
+the same numbers in the task (page 3 never matches page 4), and only
+within one researcher's namespace.
+
+Opt-in (SEMANTIC_CACHE=on): the retrieved standards don't depend on the
+drawing, so a hit is only as safe as the scope it is keyed on.
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Numbers that identify what a task is about (pages, sheets, stations, sizes)
+TASK_NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+
+
+def doc_set_key(retrieved_docs: List[Dict[str, Any]]) -> str:
+    """Order-independent hash of the retrieved document ids."""
+    ids = sorted(str(doc.get("id", doc.get("content", ""))) for doc in retrieved_docs)
+    return hashlib.sha1("\x1f".join(ids).encode()).hexdigest()
+
+
+def task_scope_key(task: str, source: str) -> str:
+    """
+    Hash of what a task's findings depend on besides its wording.
+    
+    Args:
+        task: Task text (only the numbers in it are used)
+        source: Identity of the PDF/run the task is about
+    """
+    numbers = ",".join(TASK_NUMBER_PATTERN.findall(task))
+    return hashlib.sha1(f"{source}\x1f{numbers}".encode()).hexdigest()
+
+
+class SemanticCache:
+    """
+    In-process cache of findings keyed by (namespace, scope), where the
+    scope combines the task scope and retrieved doc set, matched by cosine
+    similarity of task embeddings.
+    """
+    
+    def __init__(self, threshold: float = 0.95, max_entries: int = 256):
+        """
+        Initialize cache.
+        
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Entries kept per (namespace, scope), oldest evicted
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._buckets: Dict[Tuple[str, str], List[Tuple[np.ndarray, Any]]] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+    
+    def lookup(self, namespace: str, doc_key: str, vector: List[float]) -> Optional[Any]:
+        """Return the most similar cached value above threshold, or None."""
+        with self._lock:
+            bucket = list(self._buckets.get((namespace, doc_key), ()))
+        if not bucket:
+            return None
+        
+        query = self._normalize(vector)
+        similarities = np.stack([entry[0] for entry in bucket]) @ query
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        
+        logger.info(f"[{namespace}] Semantic cache hit (similarity {similarities[best]:.3f})")
+        return bucket[best][1]
+    
+    def store(self, namespace: str, doc_key: str, vector: List[float], value: Any) -> None:
+        """Add a value for this task embedding and doc set."""
+        with self._lock:
+            bucket = self._buckets.setdefault((namespace, doc_key), [])
+            bucket.append((self._normalize(vector), value))
+            if len(bucket) > self.max_entries:
+                del bucket[0]
+
+
+def _build_cache() -> Optional[SemanticCache]:
+    """Process-wide cache, enabled by SEMANTIC_CACHE=on (threshold: SEMANTIC_CACHE_THRESHOLD)."""
+    if os.getenv("SEMANTIC_CACHE", "off").lower() in ("", "off", "none"):
+        return None
+    return SemanticCache(threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95")))
+
+
+# Shared by all researchers (namespaced by researcher name)
+SEMANTIC_CACHE = _build_cache()
@@ -16,15 +16,7 @@ logger = logging.getLogger(__name__)
 class StormResearcher(BaseResearcher):
     """Specialized researcher for storm drainage systems."""
     
-    def __init__(self):
-        super().__init__(
-            researcher_name="storm",
-            discipline="storm",
-            specialty="storm drainage systems including catch basins, inlets, and RCP/HDPE pipes"
-        )
-    
-    def get_system_prompt(self) -> str:
-        return """You are a storm drainage specialist for construction takeoff.
+    SYSTEM_PROMPT = """You are a storm drainage specialist for construction takeoff.
 
 Your expertise:
 - Storm drain pipe materials (RCP, HDPE, concrete)
@@ -44,56 +36,9 @@ Analyze the PDF for:
 Use the retrieved construction standards to validate your findings.
 Return detailed, accurate information when evidence is clear."""
     
-    def analyze(self, state, vision_pipes=None):
-        """
-        Analyze storm drainage with specialized retrieval.
-        
-        Args:
-            state: ResearcherState
-            vision_pipes: Optional pre-extracted pipes from vision LLM
-        """
-        task = state["task"]
-        
-        logger.info(f"[Storm] Analyzing: {task}")
-        
-        # Filter vision pipes to storm only
-        storm_pipes = []
-        if vision_pipes:
-            storm_pipes = [
-                p for p in vision_pipes
-                if p.get("discipline") == "storm"
-            ]
-            logger.info(f"[Storm] Received {len(storm_pipes)} pre-detected storm pipes from vision")
-        
-        # Retrieve storm-specific context
-        queries = [
-            task,  # Original task
-            "storm drain cover depth requirements",
-            "RCP reinforced concrete pipe specifications",
-            "catch basin storm inlet symbols"
-        ]
-        
-        all_docs = []
-        for query in queries:
-            docs = self.retrieve_context(
-                query,
-                k=3,
-                category="cover_depth" if "cover" in query.lower() else None
-            )
-            all_docs.extend(docs)
-        
-        # Remove duplicates
-        unique_docs = {doc["id"]: doc for doc in all_docs}.values()
-        
-        # Format context
-        context_text = self.format_context(list(unique_docs))
-        
-        # Enhanced analysis with storm-specific prompting
-        user_prompt = f"""Task: {task}
-
-{context_text}
+    RESPONSE_INSTRUCTIONS = """Each request gives you the construction standards retrieved for a task, followed by the task.
 
-As a storm drainage specialist, analyze the task using the construction standards provided above.
+As a storm drainage specialist, analyze the task using the construction standards provided.
 
 IMPORTANT: You must EXPLICITLY CITE the construction standards in your analysis.
 
@@ -116,37 +61,89 @@ Example good response:
 "Based on the retrieved construction standard stating 'Storm drain minimum cover requirements: 1.5 feet under roadways', I validated that the detected 18\" RCP storm drain has adequate cover of 5.0 feet. The standard for 'RCP: Primary use for storm drainage 12-144 inches' confirms that 18\" RCP is appropriate for this application."
 
 Format as clear text analysis with explicit standard citations, not JSON."""
+    
+    def __init__(self):
+        super().__init__(
+            researcher_name="storm",
+            discipline="storm",
+            specialty="storm drainage systems including catch basins, inlets, and RCP/HDPE pipes"
+        )
+    
+    def analyze(self, state, vision_pipes=None):
+        """
+        Analyze storm drainage with specialized retrieval.
         
-        from langchain_core.messages import SystemMessage, HumanMessage
-        
-        messages = [
-            SystemMessage(content=self.get_system_prompt()),
-            HumanMessage(content=user_prompt)
+        Args:
+            state: ResearcherState
+            vision_pipes: Optional pre-extracted pipes from vision LLM
+        """
+        return super().analyze(self._with_vision_pipes(state, vision_pipes))
+    
+    async def aanalyze(self, state, vision_pipes=None):
+        """Async variant of analyze (see BaseResearcher.aanalyze)."""
+        return await super().aanalyze(self._with_vision_pipes(state, vision_pipes))
+    
+    def _with_vision_pipes(self, state, vision_pipes):
+        """Attach the storm subset of pre-detected Vision pipes to the state."""
+        # Filter vision pipes to storm only
+        storm_pipes = []
+        if vision_pipes:
+            storm_pipes = [
+                p for p in vision_pipes
+                if p.get("discipline") == "storm"
+            ]
+            logger.info(f"[Storm] Received {len(storm_pipes)} pre-detected storm pipes from vision")
+        return {**state, "vision_pipes": storm_pipes}
+    
+    @staticmethod
+    def _context_queries(task):
+        """Queries (with category filters) for the task plus standard topics."""
+        # Standard topics first: their (memoized) docs lead the context, so
+        # the prompt prefix stays the same from task to task
+        queries = [
+            "storm drain cover depth requirements",
+            "RCP reinforced concrete pipe specifications",
+            "catch basin storm inlet symbols",
+            task  # Original task
         ]
+        categories = [
+            "cover_depth" if "cover" in query.lower() else None
+            for query in queries
+        ]
+        return queries, categories
+    
+    @staticmethod
+    def _merge_context(results):
+        """Flatten per-query results, keeping the first occurrence of each doc."""
+        seen = set()
+        unique_docs = []
+        for docs in results:
+            for doc in docs:
+                if doc["id"] not in seen:
+                    seen.add(doc["id"])
+                    unique_docs.append(doc)
+        return unique_docs
+    
+    def gather_context(self, task, cache=None):
+        """Retrieve storm-specific context for the task plus standard topics."""
+        queries, categories = self._context_queries(task)
         
-        try:
-            response = self.llm.invoke(messages)
-            
-            # Just use the text response - no JSON parsing!
-            findings_text = response.content
-            
-            return {
-                "researcher_name": "storm",
-                "task": task,
-                "retrieved_context": [doc["content"] for doc in unique_docs],
-                "findings": {
-                    "analysis": findings_text,
-                    "retrieved_standards_count": len(unique_docs),
-                    "vision_pipes_provided": len(storm_pipes) if storm_pipes else 0
-                }
-            }
-        
-        except Exception as e:
-            logger.error(f"[Storm] Analysis failed: {e}")
-            return {
-                "researcher_name": "storm",
-                "task": task,
-                "retrieved_context": [],
-                "findings": {"error": str(e), "analysis": ""}
-            }
-
+        # One embedding request for all queries not already cached
+        results = self.retrieve_context_batch(
+            queries, k=3, categories=categories, cache=cache
+        )
+        return self._merge_context(results)
+    
+    async def agather_context(self, task, cache=None):
+        """Async variant of gather_context; the four searches run concurrently."""
+        queries, categories = self._context_queries(task)
+        results = await self.aretrieve_context_batch(
+            queries, k=3, categories=categories, cache=cache
+        )
+        return self._merge_context(results)
+    
+    def build_result(self, state, retrieved_docs, findings_text):
+        """Base result plus how many Vision storm pipes were provided."""
+        result = super().build_result(state, retrieved_docs, findings_text)
+        result["findings"]["vision_pipes_provided"] = len(state.get("vision_pipes") or [])
+        return result
@@ -5,15 +5,7 @@ from app.agents.researchers.base_researcher import BaseResearcher
 class WaterResearcher(BaseResearcher):
     """Specialized researcher for water distribution systems."""
     
-    def __init__(self):
-        super().__init__(
-            researcher_name="water",
-            discipline="water",
-            specialty="water mains including DI pipes, hydrants, and pressurized systems"
-        )
-    
-    def get_system_prompt(self) -> str:
-        return """You are a water distribution specialist for construction takeoff.
+    SYSTEM_PROMPT = """You are a water distribution specialist for construction takeoff.
 
 Your expertise:
 - Water main materials (DI, PVC, HDPE for pressurized systems)
@@ -24,4 +16,11 @@ Your expertise:
 - Pressurized systems (no minimum slope required)
 
 Analyze for water mains, hydrants, and validate materials for pressure ratings."""
+    
+    def __init__(self):
+        super().__init__(
+            researcher_name="water",
+            discipline="water",
+            specialty="water mains including DI pipes, hydrants, and pressurized systems"
+        )
 
@@ -0,0 +1,112 @@
+"""
+Retry and circuit-breaker helpers for LLM calls.
+
+Transient provider faults (429s, dropped connections, 5xx) are retried
+with bounded exponential backoff instead of failing the whole node. If
+calls keep failing anyway, the breaker opens and callers skip the LLM
+for a cool-down period rather than piling retries onto a provider that
+is down.
+
+Configured via environment:
+- LLM_BREAKER_FAIL_MAX: consecutive failed calls that open the breaker (default 5)
+- LLM_BREAKER_RESET_SECONDS: how long it stays open before a trial call (default 30)
+"""
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+import httpx
+import openai
+from tenacity import before_sleep_log, retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying (timeouts, conflicts, rate limits, server errors)
+TRANSIENT_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """True for errors a retry may fix (OpenAI SDK or raw httpx)."""
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in TRANSIENT_STATUS_CODES
+    return isinstance(error, httpx.TransportError)
+
+
+# Up to 4 attempts, backing off 0.5s, 1s, 2s (capped at 8s); works on sync and async functions
+llm_retry = retry(
+    retry=retry_if_exception(is_transient_error),
+    wait=wait_exponential(multiplier=0.5, max=8),
+    stop=stop_after_attempt(4),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True
+)
+
+
+class CircuitBreaker:
+    """
+    In-memory circuit breaker.
+    
+    Opens after fail_max consecutive failures. While open, allow() is False
+    until reset_timeout has passed; then trial calls are let through, and
+    the first success closes it again.
+    """
+    
+    def __init__(self, name: str, fail_max: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize breaker.
+        
+        Args:
+            name: Name used in log messages
+            fail_max: Consecutive failures that open the breaker
+            reset_timeout: Seconds to stay open before allowing a trial call
+        """
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def is_open(self) -> bool:
+        """True while calls are being short-circuited."""
+        return not self.allow()
+    
+    def allow(self) -> bool:
+        """Whether a call may be attempted now."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            return time.monotonic() - self._opened_at >= self.reset_timeout
+    
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info(f"[{self.name}] Circuit closed - calls recovered")
+            self._failures = 0
+            self._opened_at = None
+    
+    def record_failure(self) -> None:
+        """Count a failed call, opening (or re-opening) the breaker at fail_max."""
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.fail_max:
+                if self._opened_at is None:
+                    logger.error(
+                        f"[{self.name}] Circuit opened after {self._failures} failures - "
+                        f"skipping calls for {self.reset_timeout:.0f}s"
+                    )
+                self._opened_at = time.monotonic()
+
+
+# Shared by all researchers' OpenAI calls
+LLM_BREAKER = CircuitBreaker(
+    "openai",
+    fail_max=int(os.getenv("LLM_BREAKER_FAIL_MAX", "5")),
+    reset_timeout=float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+)
@@ -8,22 +8,463 @@ The supervisor:
 4. Resolves conflicts between researchers
 5. Consolidates data for Main Agent
 """
+import asyncio
+import hashlib
+import json
 import logging
-from typing import Dict, Any, List
-from concurrent.futures import ThreadPoolExecutor
-from langchain_openai import ChatOpenAI
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Literal, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+
+import orjson
 from langchain_core.messages import SystemMessage, HumanMessage
 
-from app.models import SupervisorState, ResearcherState
+from app.models import ConsolidationOutput, SupervisorState, ResearcherState
 from app.agents.researchers.storm_researcher import StormResearcher
 from app.agents.researchers.sanitary_researcher import SanitaryResearcher
 from app.agents.researchers.water_researcher import WaterResearcher
 from app.agents.researchers.elevation_researcher import ElevationResearcher
 from app.agents.researchers.legend_researcher import LegendResearcher
 from app.agents.researchers.api_researcher import APIResearcher
+from app.agents.researchers.base_researcher import BaseResearcher
+from app.rag.retriever import HybridRetriever
+from app.rag.knowledge_base import ConstructionKnowledgeBase
+from app.agents._shared import get_llm_mini, get_retriever
+from app.agents.llm_json import extract_json_array
+from app.agents.resilience import llm_retry
 
 logger = logging.getLogger(__name__)
 
+# Max concurrent RAG lookups when validating a batch of materials
+MAX_RAG_CONCURRENCY = 8
+
+# Max researchers running at once in async research (LLM rate limits)
+MAX_RESEARCHER_CONCURRENCY = 5
+
+# Seconds to wait for researchers before reporting them as failed
+RESEARCH_TIMEOUT = 60
+
+# Max characters of one text finding sent to the consolidation LLM
+FINDINGS_CHAR_BUDGET = 4000
+
+# Unknowns of one type searched together in one external query
+EXTERNAL_BATCH_SIZE = 5
+
+# External results requested per unknown in a batched query, so each keeps
+# roughly the share a single-unknown search got
+EXTERNAL_RESULTS_PER_UNKNOWN = 5
+
+# Unresolved-unknown alert levels: (severity, impact level, reason template, bid risk)
+ALERT_INFO, ALERT_WARNING, ALERT_CRITICAL = range(3)
+ALERT_LEVELS = (
+    ("INFO", "LOW", "{total} minor unknown(s)", "< $5,000 bid error risk"),
+    ("WARNING", "MEDIUM", "{total} unknown elements - may affect accuracy", "$5,000-$20,000 bid error risk"),
+    ("CRITICAL", "HIGH", "{materials} unknown material(s) - cost estimation unreliable", "$50,000+ bid error risk"),
+)
+
+# One complete {"researcher": ..., "task": ...} object in a (partial) plan
+TASK_OBJECT_PATTERN = re.compile(r'\{[^{}]*\}')
+
+# "ABBR = Full Name" entries in a drawing's text legend
+TEXT_LEGEND_PATTERN = re.compile(r'([A-Z]{2,6})\s*=\s*([^(\n]+?)(?:\s*\(|$|\n)')
+
+# Fixed prompt parts are built once; the per-PDF data goes last so every
+# request shares the same prefix (OpenAI prompt caching matches on prefixes)
+PLAN_SYSTEM_MESSAGE = SystemMessage(content="""You are a construction estimating supervisor that leads a team of construction estimators, each with expertise in specific areas of performing takeoff on construction documents. 
+
+Your expertise is in deciding which researcher/estimator should perform takeoff on each part of the construction blueprint documents, vector and raster construction pdfs.""")
+
+PLAN_INSTRUCTIONS = """Based on the PDF summary below, determine which researchers to deploy and what tasks to assign them.
+
+Available Researchers:
+- storm: Storm drainage systems (RCP, catch basins, inlets)
+- sanitary: Sanitary sewers (PVC, manholes, gravity sewers)
+- water: Water distribution (DI pipes, hydrants, pressurized systems)
+- elevation: Invert and ground elevations, depth calculations
+- legend: Symbol interpretation and legend reading
+
+Return JSON list of tasks:
+[
+  {"researcher": "storm", "task": "Extract storm drain pipes from plan view"},
+  {"researcher": "elevation", "task": "Read all invert elevations from profile sheet"}
+]
+
+Only deploy researchers relevant to what's actually in the PDF.
+
+PDF Summary:
+"""
+
+CONSOLIDATION_SYSTEM_MESSAGE = SystemMessage(
+    content="You are a construction takeoff supervisor consolidating researcher findings."
+)
+
+DEDUP_SYSTEM_MESSAGE = SystemMessage(content="You are an expert construction estimator.")
+
+# Shared by consolidate_findings and _deduplicate_vision_only
+DEDUP_INSTRUCTIONS = """You are an expert at reading construction blueprint documents and vector and raster pdfs.
+
+If you see a construction item like a pipe with the same label more than once then don't count it multiple times. It is simply a construction item being referenced again from a different view or perhaps giving us more information about it. Analyze for new, important information but do not count it again when you see it has the same naming convention you already saw and counted.
+"""
+
+CONSOLIDATION_INSTRUCTIONS = DEDUP_INSTRUCTIONS + """
+Calculate total unique pipes by type and their total lengths, and list the materials found, your overall confidence and any recommendations.
+"""
+
+DEDUP_VISION_INSTRUCTIONS = DEDUP_INSTRUCTIONS + """
+Calculate the total unique pipes by type and their total lengths.
+
+Return exactly 3 lines:
+COUNTS: storm_pipes|sanitary_pipes|water_pipes|total_pipes|storm_lf|sanitary_lf|water_lf|total_lf
+MATERIALS: material1,material2,...
+REC: one-sentence recommendation, or nothing
+"""
+
+# Order of the values on the COUNTS line of a Vision dedup reply
+DEDUP_COUNT_FIELDS = (
+    "storm_pipes", "sanitary_pipes", "water_pipes", "total_pipes",
+    "storm_lf", "sanitary_lf", "water_lf", "total_lf"
+)
+
+# In "auto" plan mode, summaries shorter than this say too little to plan
+# from, so every researcher is deployed without asking the LLM
+MIN_PLANNING_SUMMARY_CHARS = 200
+
+# Deployed when research planning fails (this is fine!)
+DEFAULT_RESEARCH_TASKS = [
+    {"researcher": "legend", "task": "Read and interpret the drawing legend and symbols"},
+    {"researcher": "storm", "task": "Extract all storm drainage information"},
+    {"researcher": "sanitary", "task": "Extract all sanitary sewer information"},
+    {"researcher": "water", "task": "Extract all water main information"},
+    {"researcher": "elevation", "task": "Extract all elevation data and calculate depths"}
+]
+
+# Disciplines a user request can name directly, skipping LLM planning;
+# no trailing \b so compounds match too ("stormwater", "watermains")
+QUERY_DISCIPLINE_PATTERN = re.compile(r'\b(sanitary|storm|water)', re.IGNORECASE)
+
+# Researchers every discipline needs (symbols and depths), always deployed
+SUPPORT_RESEARCHERS = {"legend", "elevation"}
+
+
+def material_query(search_name: str) -> str:
+    """Build the RAG query used to validate a pipe material."""
+    return f"{search_name} pipe material specifications"
+
+
+def normalize_material(pipe: Dict[str, Any]) -> str:
+    """
+    Get a pipe's material in canonical form for RAG validation.
+    
+    Returns "" for missing/placeholder materials (UNKNOWN, N/A).
+    """
+    material = (pipe.get("material") or "").strip().upper()
+    if material in ("UNKNOWN", "N/A"):
+        return ""
+    return material
+
+
+def plan_from_query(user_query: str) -> List[Dict[str, str]]:
+    """
+    Research tasks for the disciplines a user request names explicitly.
+    
+    The legend and elevation researchers are always included, since pipe
+    findings lean on them for symbols and cover depths. Returns [] when
+    the request names no discipline, so the LLM planner decides.
+    """
+    named = {match.lower() for match in QUERY_DISCIPLINE_PATTERN.findall(user_query or "")}
+    if not named:
+        return []
+    return [
+        task for task in DEFAULT_RESEARCH_TASKS
+        if task["researcher"] in named or task["researcher"] in SUPPORT_RESEARCHERS
+    ]
+
+
+# Research plans remembered per PDF summary (most recently used kept)
+PLAN_MEMO_SIZE = 256
+
+_plan_memo: "OrderedDict[bytes, List[Dict[str, str]]]" = OrderedDict()
+_plan_memo_lock = threading.Lock()
+
+# Text legends remembered per PDF file version (most recently used kept)
+LEGEND_MEMO_SIZE = 32
+
+_legend_memo: "OrderedDict[tuple, Dict[str, str]]" = OrderedDict()
+_legend_memo_lock = threading.Lock()
+
+_researchers_lock = threading.Lock()
+_researchers: Optional[Dict[str, BaseResearcher]] = None
+_api_researcher: Optional[APIResearcher] = None
+
+
+def get_default_researchers() -> Tuple[Dict[str, BaseResearcher], APIResearcher]:
+    """
+    Process-wide researcher instances, created on first use.
+    
+    Researchers are stateless between calls (per-run state travels in
+    ResearcherState), so every supervisor can share one set.
+    
+    Returns:
+        (researcher name -> researcher, API researcher)
+    """
+    global _researchers, _api_researcher
+    with _researchers_lock:
+        if _researchers is None:
+            researchers = {
+                "storm": StormResearcher(),
+                "sanitary": SanitaryResearcher(),
+                "water": WaterResearcher(),
+                "elevation": ElevationResearcher(),
+                "legend": LegendResearcher()
+            }
+            # API researcher for unknown material augmentation
+            _api_researcher = APIResearcher()
+            _researchers = researchers
+    return _researchers, _api_researcher
+
+
+_standards_lock = threading.Lock()
+_standards_texts: Optional[List[str]] = None
+
+
+def local_standards_texts() -> List[str]:
+    """
+    Text of every standard in the local knowledge base, loaded once.
+    
+    Lets unknown detection tell a material the KB covers (but this run
+    didn't retrieve) from one that really needs an external search.
+    """
+    global _standards_texts
+    with _standards_lock:
+        if _standards_texts is None:
+            try:
+                _standards_texts = [
+                    standard.content
+                    for standard in ConstructionKnowledgeBase().load_all_standards()
+                ]
+            except Exception as e:
+                logger.error(f"Failed to load local standards: {e}")
+                _standards_texts = []
+    return _standards_texts
+
+
+def _new_researcher_state(
+    researcher_name: str,
+    task: str,
+    retrieval_cache: dict,
+    cache_scope: str = ""
+) -> ResearcherState:
+    """
+    Initial state for one researcher task.
+    
+    Args:
+        researcher_name: Researcher that will run the task
+        task: Task description
+        retrieval_cache: Per-run retrieval cache shared by all researchers
+        cache_scope: Source PDF identity (see source_scope); without one the
+            researcher doesn't use the semantic cache
+    
+    Returns:
+        ResearcherState with empty context and findings
+    """
+    state: ResearcherState = {
+        "researcher_name": researcher_name,
+        "task": task,
+        "retrieved_context": [],
+        "findings": {},
+        "retrieval_cache": retrieval_cache
+    }
+    if cache_scope:
+        state["cache_scope"] = cache_scope
+    return state
+
+
+def source_scope(pdf_path: Optional[str]) -> str:
+    """
+    Identity of a source PDF version (path, mtime, size) for scoping cached
+    findings; "" if there is no readable PDF.
+    """
+    if not pdf_path:
+        return ""
+    try:
+        stat = os.stat(pdf_path)
+    except OSError:
+        return ""
+    return f"{os.path.abspath(pdf_path)}|{stat.st_mtime_ns}|{stat.st_size}"
+
+
+def _bounded_findings(findings: Dict[str, Any], budget: int = FINDINGS_CHAR_BUDGET) -> Dict[str, Any]:
+    """
+    Researcher findings with long text values cut to the budget.
+    
+    Counts and flags pass through unchanged, so the consolidation prompt
+    grows with the number of researchers rather than with how verbose
+    each analysis was.
+    """
+    return {
+        key: value[:budget] + " ...[truncated]" if isinstance(value, str) and len(value) > budget else value
+        for key, value in findings.items()
+    }
+
+
+def parse_dedup_reply(text: str) -> Dict[str, Any]:
+    """
+    Parse the COUNTS / MATERIALS / REC lines of a Vision dedup reply.
+    
+    Args:
+        text: LLM reply to DEDUP_VISION_INSTRUCTIONS
+    
+    Returns:
+        Dict with summary, materials_found and recommendations
+    
+    Raises:
+        ValueError: If the COUNTS line is missing or malformed
+    """
+    lines = {}
+    for line in text.splitlines():
+        label, sep, value = line.partition(":")
+        if sep:
+            # Tolerate markdown around the label (**COUNTS**:, - COUNTS:)
+            lines[label.strip(" *`-").upper()] = value.strip(" *`")
+    
+    if "COUNTS" not in lines:
+        raise ValueError("No COUNTS line in response")
+    values = lines["COUNTS"].split("|")
+    if len(values) != len(DEDUP_COUNT_FIELDS):
+        raise ValueError(f"Expected {len(DEDUP_COUNT_FIELDS)} counts, got {len(values)}")
+    
+    return {
+        "summary": {
+            field: int(float(value)) if field.endswith("_pipes") else float(value)
+            for field, value in zip(DEDUP_COUNT_FIELDS, values)
+        },
+        "materials_found": [m.strip() for m in lines.get("MATERIALS", "").split(",") if m.strip()],
+        "recommendations": lines.get("REC", "")
+    }
+
+
+def find_terms(texts: List[str], terms: set) -> set:
+    """
+    Which of the (uppercase) terms occur as substrings of the texts,
+    ignoring case.
+    
+    Scans each text once for all terms together (a lookahead alternation
+    reports a match at every position, longest term first), stopping as
+    soon as every term has been seen, instead of rescanning the combined
+    text per term. Matching is case-insensitive, so only the short hits
+    are uppercased, never a copy of each text.
+    """
+    if not terms:
+        return set()
+    
+    ordered = sorted(terms, key=len, reverse=True)
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))", re.IGNORECASE)
+    found = set()
+    for text in texts:
+        found.update(hit.upper() for hit in pattern.findall(text))
+        if len(found) == len(terms):
+            return found
+    
+    # A term hidden behind a longer match at the same position is a
+    # substring of that match, so it occurs too
+    return found | {
+        term for term in terms
+        if term not in found and any(term in hit for hit in found)
+    }
+
+
+def _plan_key(pdf_summary: str) -> bytes:
+    """Compact memo key for a (possibly long) PDF summary, ignoring case and whitespace."""
+    normalized = " ".join(pdf_summary.lower().split())
+    return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+
+
+def recall_plan(pdf_summary: str) -> Optional[List[Dict[str, str]]]:
+    """LLM research plan made earlier for this summary, or None."""
+    key = _plan_key(pdf_summary)
+    with _plan_memo_lock:
+        tasks = _plan_memo.get(key)
+        if tasks is None:
+            return None
+        _plan_memo.move_to_end(key)
+    return [dict(task) for task in tasks]
+
+
+def remember_plan(pdf_summary: str, tasks: List[Dict[str, str]]) -> None:
+    """Memoize an LLM research plan (not the default fallback)."""
+    with _plan_memo_lock:
+        _plan_memo[_plan_key(pdf_summary)] = [dict(task) for task in tasks]
+        if len(_plan_memo) > PLAN_MEMO_SIZE:
+            _plan_memo.popitem(last=False)
+
+
+def naive_pipe_totals(pipes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Count pipes and linear feet per discipline in a single pass.
+    
+    No deduplication - used when the LLM deduplication step fails.
+    """
+    counts = {"storm": 0, "sanitary": 0, "water": 0}
+    lengths = {"storm": 0.0, "sanitary": 0.0, "water": 0.0}
+    total_lf = 0.0
+    
+    for pipe in pipes:
+        length = pipe.get("length_ft") or 0
+        total_lf += length
+        discipline = pipe.get("discipline")
+        if discipline in counts:
+            counts[discipline] += 1
+            lengths[discipline] += length
+    
+    return {
+        "storm_pipes": counts["storm"],
+        "sanitary_pipes": counts["sanitary"],
+        "water_pipes": counts["water"],
+        "total_pipes": len(pipes),
+        "storm_lf": lengths["storm"],
+        "sanitary_lf": lengths["sanitary"],
+        "water_lf": lengths["water"],
+        "total_lf": total_lf
+    }
+
+
+def collapse_duplicate_pipes(pipes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Drop repeat detections of the same structure-to-structure pipe run.
+    
+    A pipe whose discipline, diameter, material and both end structures
+    match an earlier one is that run seen again on another sheet or view;
+    the detection with the most filled-in fields is kept, in first-seen
+    order. Pipes without both end structures can't be told apart this way
+    and are all kept for the LLM to judge.
+    """
+    kept: List[Dict[str, Any]] = []
+    index_by_key: Dict[tuple, int] = {}
+    
+    for pipe in pipes:
+        if not (pipe.get("from_structure") and pipe.get("to_structure")):
+            kept.append(pipe)
+            continue
+        
+        key = (
+            pipe.get("discipline"),
+            pipe.get("diameter_in"),
+            normalize_material(pipe),
+            pipe["from_structure"],
+            pipe["to_structure"]
+        )
+        index = index_by_key.get(key)
+        if index is None:
+            index_by_key[key] = len(kept)
+            kept.append(pipe)
+        elif sum(1 for v in pipe.values() if v) > sum(1 for v in kept[index].values() if v):
+            kept[index] = pipe
+    
+    return kept
+
 
 class SupervisorAgent:
     """
@@ -32,27 +473,50 @@ class SupervisorAgent:
     Acts as middle management between Main Agent and Researchers.
     """
     
-    def __init__(self):
-        """Initialize supervisor with all researchers."""
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0
-        )
-        
-        # Initialize all researchers
-        self.researchers = {
-            "storm": StormResearcher(),
-            "sanitary": SanitaryResearcher(),
-            "water": WaterResearcher(),
-            "elevation": ElevationResearcher(),
-            "legend": LegendResearcher()
-        }
+    def __init__(self, plan_mode: Literal["llm", "always_all", "auto"] = "auto"):
+        """
+        Initialize supervisor with all researchers.
         
-        # Initialize API researcher for unknown material augmentation
-        self.api_researcher = APIResearcher()
+        Args:
+            plan_mode: "llm" always plans with the LLM, "always_all" deploys
+                every researcher without planning, "auto" skips planning for
+                summaries too short to plan from
+        """
+        self.llm = get_llm_mini()
+        self.plan_mode = plan_mode
+        # Consolidation returns typed data (schema enforced by the API, no parsing)
+        self._consolidation_llm = self.llm.with_structured_output(ConsolidationOutput)
+        
+        # Shared researchers (built once per process, not per supervisor)
+        researchers, self.api_researcher = get_default_researchers()
+        self.researchers = dict(researchers)
+        
+        # Worker threads for parallel research and RAG lookups, kept for the
+        # supervisor's lifetime instead of spawned per call
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(len(self.researchers), MAX_RAG_CONCURRENCY),
+            thread_name_prefix="supervisor"
+        )
         
         logger.info("Supervisor initialized with 5 researchers + API augmentation")
     
+    def close(self) -> None:
+        """Release the worker threads (running work finishes in the background)."""
+        self._executor.shutdown(wait=False)
+    
+    def _should_skip_planning(self, pdf_summary: str) -> bool:
+        """Whether to deploy every researcher instead of asking the LLM for a plan."""
+        if self.plan_mode == "always_all":
+            return True
+        return self.plan_mode == "auto" and len(pdf_summary.strip()) < MIN_PLANNING_SUMMARY_CHARS
+    
+    def _plan_messages(self, pdf_summary: str) -> list:
+        """Build the research-planning prompt for a PDF summary."""
+        return [
+            PLAN_SYSTEM_MESSAGE,
+            HumanMessage(content=PLAN_INSTRUCTIONS + pdf_summary)
+        ]
+    
     def plan_research(self, pdf_summary: str) -> List[Dict[str, str]]:
         """
         Analyze PDF summary and decide which researchers to deploy.
@@ -65,71 +529,48 @@ class SupervisorAgent:
         """
         logger.info("Planning research tasks...")
         
-        prompt = f"""Based on this PDF summary, determine which researchers to deploy and what tasks to assign them.
-
-PDF Summary:
-{pdf_summary}
-
-Available Researchers:
-- storm: Storm drainage systems (RCP, catch basins, inlets)
-- sanitary: Sanitary sewers (PVC, manholes, gravity sewers)
-- water: Water distribution (DI pipes, hydrants, pressurized systems)
-- elevation: Invert and ground elevations, depth calculations
-- legend: Symbol interpretation and legend reading
-
-Return JSON list of tasks:
-[
-  {{"researcher": "storm", "task": "Extract storm drain pipes from plan view"}},
-  {{"researcher": "elevation", "task": "Read all invert elevations from profile sheet"}}
-]
-
-Only deploy researchers relevant to what's actually in the PDF."""
+        if self._should_skip_planning(pdf_summary):
+            logger.info(f"Skipping LLM planning (plan_mode={self.plan_mode}), deploying all researchers")
+            return list(DEFAULT_RESEARCH_TASKS)
         
-        messages = [
-            SystemMessage(content="""You are a construction estimating supervisor that leads a team of construction estimators, each with expertise in specific areas of performing takeoff on construction documents. 
-
-Your expertise is in deciding which researcher/estimator should perform takeoff on each part of the construction blueprint documents, vector and raster construction pdfs."""),
-            HumanMessage(content=prompt)
-        ]
+        tasks = recall_plan(pdf_summary)
+        if tasks is not None:
+            logger.info(f"Reusing research plan for identical summary ({len(tasks)} tasks)")
+            return tasks
         
         try:
-            response = self.llm.invoke(messages)
-            import json
-            import re
+            response = llm_retry(self.llm.invoke)(self._plan_messages(pdf_summary))
             
             # Extract JSON from response (might be wrapped in markdown or have text)
             content = response.content
             
             # Try to find JSON array in response
-            json_match = re.search(r'\[.*\]', content, re.DOTALL)
-            if json_match:
-                tasks = json.loads(json_match.group())
+            json_array = extract_json_array(content)
+            if json_array:
+                tasks = orjson.loads(json_array)
             else:
                 # Try parsing whole response
-                tasks = json.loads(content)
+                tasks = orjson.loads(content)
             
             logger.info(f"Planned {len(tasks)} research tasks")
             for task in tasks:
                 logger.info(f"  - {task['researcher']}: {task['task'][:50]}...")
             
+            remember_plan(pdf_summary, tasks)
             return tasks
         
         except Exception as e:
             logger.warning(f"Task planning failed ({e}), using default deployment")
             # Fallback: deploy all researchers (this is fine!)
-            return [
-                {"researcher": "legend", "task": "Read and interpret the drawing legend and symbols"},
-                {"researcher": "storm", "task": "Extract all storm drainage information"},
-                {"researcher": "sanitary", "task": "Extract all sanitary sewer information"},
-                {"researcher": "water", "task": "Extract all water main information"},
-                {"researcher": "elevation", "task": "Extract all elevation data and calculate depths"}
-            ]
+            return list(DEFAULT_RESEARCH_TASKS)
     
     def execute_research(
         self,
         tasks: List[Dict[str, str]],
         parallel: bool = True,
-        vision_result: Dict[str, Any] = None
+        vision_result: Dict[str, Any] = None,
+        batched: bool = True,
+        cache_scope: str = ""
     ) -> Dict[str, ResearcherState]:
         """
         Execute research tasks with comprehensive unknown detection.
@@ -141,55 +582,89 @@ Your expertise is in deciding which researcher/estimator should perform takeoff
             tasks: List of tasks from plan_research
             parallel: Whether to run researchers in parallel
             vision_result: Vision extraction results with detected materials/symbols
+            batched: Answer all researchers' tasks with one LLM call
+            cache_scope: Source PDF identity for the semantic cache (see
+                source_scope); "" disables it for this run
         
         Returns:
             Dict of researcher_name -> ResearcherState with findings and user alerts
         """
-        logger.info(f"Executing {len(tasks)} research tasks (parallel={parallel})")
+        logger.info(f"Executing {len(tasks)} research tasks (parallel={parallel}, batched={batched})")
         
         results = {}
         
-        if parallel:
-            # Run researchers in parallel for speed
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                futures = {}
+        # Researchers often overlap on standard topics - retrieve each once per run
+        retrieval_cache = {}
+        
+        if batched:
+            jobs = []
+            for task_spec in tasks:
+                researcher_name = task_spec["researcher"]
                 
-                for task_spec in tasks:
-                    researcher_name = task_spec["researcher"]
-                    task = task_spec["task"]
-                    
-                    if researcher_name not in self.researchers:
-                        logger.warning(f"Unknown researcher: {researcher_name}")
-                        continue
-                    
-                    researcher = self.researchers[researcher_name]
-                    
-                    # Create researcher state
-                    state: ResearcherState = {
-                        "researcher_name": researcher_name,
-                        "task": task,
+                if researcher_name not in self.researchers:
+                    logger.warning(f"Unknown researcher: {researcher_name}")
+                    continue
+                
+                state = _new_researcher_state(researcher_name, task_spec["task"], retrieval_cache, cache_scope)
+                jobs.append((self.researchers[researcher_name], state))
+            
+            try:
+                for (_, state), result in zip(jobs, BaseResearcher.batch_analyze(jobs)):
+                    results[state["researcher_name"]] = result
+            except Exception as e:
+                logger.error(f"Batched research failed: {e}")
+                for _, state in jobs:
+                    results[state["researcher_name"]] = {
+                        "researcher_name": state["researcher_name"],
+                        "task": state["task"],
                         "retrieved_context": [],
-                        "findings": {}
+                        "findings": {"error": str(e)}
                     }
-                    
-                    # Submit task
-                    future = executor.submit(researcher.analyze, state)
-                    futures[researcher_name] = future
+        elif parallel:
+            # Run researchers in parallel for speed (on the supervisor's pool)
+            futures = {}
+            
+            for task_spec in tasks:
+                researcher_name = task_spec["researcher"]
+                task = task_spec["task"]
+                
+                if researcher_name not in self.researchers:
+                    logger.warning(f"Unknown researcher: {researcher_name}")
+                    continue
+                
+                researcher = self.researchers[researcher_name]
+                
+                # Create researcher state
+                state = _new_researcher_state(researcher_name, task, retrieval_cache, cache_scope)
                 
-                # Collect results
-                for researcher_name, future in futures.items():
+                # Submit task
+                future = self._executor.submit(researcher.analyze, state)
+                futures[future] = (researcher_name, task)
+            
+            def record_failure(researcher_name: str, task: str, error: Exception) -> None:
+                logger.error(f"[{researcher_name}] Failed: {error}")
+                results[researcher_name] = {
+                    "researcher_name": researcher_name,
+                    "task": task,
+                    "retrieved_context": [],
+                    "findings": {"error": str(error)}
+                }
+            
+            # Collect results as researchers finish, not in submission order
+            try:
+                for future in as_completed(futures, timeout=RESEARCH_TIMEOUT):
+                    researcher_name, task = futures[future]
                     try:
-                        result = future.result(timeout=120)  # 2 minute timeout per researcher
-                        results[researcher_name] = result
+                        results[researcher_name] = future.result()
                         logger.info(f"[{researcher_name}] Complete.")
                     except Exception as e:
-                        logger.error(f"[{researcher_name}] Failed: {e}")
-                        results[researcher_name] = {
-                            "researcher_name": researcher_name,
-                            "task": task_spec["task"],
-                            "retrieved_context": [],
-                            "findings": {"error": str(e)}
-                        }
+                        record_failure(researcher_name, task, e)
+            except FuturesTimeoutError as e:
+                # Don't wait for stragglers; drop any still queued on the pool
+                for future, (researcher_name, task) in futures.items():
+                    if not future.done():
+                        future.cancel()
+                        record_failure(researcher_name, task, e)
         else:
             # Run sequentially
             for task_spec in tasks:
@@ -201,12 +676,7 @@ Your expertise is in deciding which researcher/estimator should perform takeoff
                 
                 researcher = self.researchers[researcher_name]
                 
-                state: ResearcherState = {
-                    "researcher_name": researcher_name,
-                    "task": task,
-                    "retrieved_context": [],
-                    "findings": {}
-                }
+                state = _new_researcher_state(researcher_name, task, retrieval_cache, cache_scope)
                 
                 try:
                     result = researcher.analyze(state)
@@ -220,59 +690,273 @@ Your expertise is in deciding which researcher/estimator should perform takeoff
                         "findings": {"error": str(e)}
                         }
         
-        logger.info(f"Research complete: {len(results)} researchers finished")
+        logger.info(f"Research complete: {len(results)} researchers finished")
+        
+        if vision_result:
+            self._augment_with_unknowns(results, vision_result)
+        
+        return results
+    
+    async def aexecute_research(
+        self,
+        tasks: List[Dict[str, str]],
+        vision_result: Dict[str, Any] = None,
+        cache_scope: str = ""
+    ) -> Dict[str, ResearcherState]:
+        """
+        Async execute_research: researchers run concurrently on the event loop.
+        
+        Total time tracks the slowest researcher rather than the sum; a
+        semaphore caps concurrent LLM calls at MAX_RESEARCHER_CONCURRENCY.
+        
+        Args:
+            tasks: List of tasks from plan_research
+            vision_result: Vision extraction results with detected materials/symbols
+            cache_scope: Source PDF identity for the semantic cache
+        
+        Returns:
+            Dict of researcher_name -> ResearcherState with findings and user alerts
+        """
+        logger.info(f"Executing {len(tasks)} research tasks (async)")
+        
+        semaphore = asyncio.Semaphore(MAX_RESEARCHER_CONCURRENCY)
+        retrieval_cache = {}  # shared by this run's researchers
+        
+        scheduled = {}
+        for task_spec in tasks:
+            researcher_name = task_spec["researcher"]
+            if researcher_name not in self.researchers:
+                logger.warning(f"Unknown researcher: {researcher_name}")
+                continue
+            scheduled[researcher_name] = self._arun_researcher(
+                researcher_name, task_spec["task"], semaphore, retrieval_cache, cache_scope
+            )
+        
+        results = dict(zip(scheduled, await asyncio.gather(*scheduled.values())))
+        
+        logger.info(f"Research complete: {len(results)} researchers finished")
+        
+        if vision_result:
+            # External API lookups are blocking - keep them off the event loop
+            await self._aaugment_with_unknowns(results, vision_result)
+        
+        return results
+    
+    async def aplan_and_research(
+        self,
+        pdf_summary: str,
+        vision_result: Dict[str, Any] = None,
+        cache_scope: str = ""
+    ) -> tuple:
+        """
+        Stream the research plan and start each researcher as soon as its
+        task appears, instead of waiting for the whole plan.
+        
+        Falls back to plan_research + aexecute_research if streaming fails.
+        
+        Args:
+            pdf_summary: Summary from Main Agent describing PDF content
+            vision_result: Vision extraction results with detected materials/symbols
+            cache_scope: Source PDF identity for the semantic cache
+        
+        Returns:
+            (planned tasks, dict of researcher_name -> ResearcherState)
+        """
+        if self._should_skip_planning(pdf_summary):
+            logger.info(f"Skipping LLM planning (plan_mode={self.plan_mode}), deploying all researchers")
+            tasks = list(DEFAULT_RESEARCH_TASKS)
+            return tasks, await self.aexecute_research(tasks, vision_result=vision_result, cache_scope=cache_scope)
+        
+        tasks = recall_plan(pdf_summary)
+        if tasks is not None:
+            logger.info(f"Reusing research plan for identical summary ({len(tasks)} tasks)")
+            return tasks, await self.aexecute_research(tasks, vision_result=vision_result, cache_scope=cache_scope)
+        
+        logger.info("Planning research tasks (streaming)...")
+        
+        semaphore = asyncio.Semaphore(MAX_RESEARCHER_CONCURRENCY)
+        retrieval_cache = {}  # shared by this run's researchers
+        tasks = []
+        scheduled = {}
+        
+        def dispatch(task_spec: Dict[str, str]) -> None:
+            researcher_name = task_spec.get("researcher")
+            if researcher_name not in self.researchers:
+                logger.warning(f"Unknown researcher: {researcher_name}")
+                return
+            if researcher_name in scheduled:
+                return
+            tasks.append(task_spec)
+            scheduled[researcher_name] = asyncio.create_task(self._arun_researcher(
+                researcher_name, task_spec["task"], semaphore, retrieval_cache, cache_scope
+            ))
+        
+        try:
+            content = ""
+            scan_pos = 0
+            async for chunk in self.llm.astream(self._plan_messages(pdf_summary)):
+                content += chunk.content
+                # Dispatch every task object completed so far
+                for match in TASK_OBJECT_PATTERN.finditer(content, scan_pos):
+                    scan_pos = match.end()
+                    try:
+                        task_spec = orjson.loads(match.group())
+                    except json.JSONDecodeError:
+                        continue
+                    if "task" in task_spec:
+                        logger.info(f"Dispatching {task_spec.get('researcher')} while plan streams")
+                        dispatch(task_spec)
+        except Exception as e:
+            logger.warning(f"Streaming plan failed ({e}), planning without streaming")
+            for task in scheduled.values():
+                task.cancel()
+            await asyncio.gather(*scheduled.values(), return_exceptions=True)
+            tasks = await asyncio.to_thread(self.plan_research, pdf_summary)
+            return tasks, await self.aexecute_research(tasks, vision_result=vision_result, cache_scope=cache_scope)
+        
+        if scheduled:
+            remember_plan(pdf_summary, tasks)
+        else:
+            logger.warning("No research tasks in streamed plan, using default deployment")
+            for task_spec in DEFAULT_RESEARCH_TASKS:
+                dispatch(task_spec)
+        
+        logger.info(f"Planned {len(tasks)} research tasks")
+        results = dict(zip(scheduled, await asyncio.gather(*scheduled.values())))
+        
+        logger.info(f"Research complete: {len(results)} researchers finished")
+        
+        if vision_result:
+            await self._aaugment_with_unknowns(results, vision_result)
+        
+        return tasks, results
+    
+    async def _arun_researcher(
+        self,
+        researcher_name: str,
+        task: str,
+        semaphore: asyncio.Semaphore,
+        retrieval_cache: dict,
+        cache_scope: str = ""
+    ) -> ResearcherState:
+        """Run one researcher under the concurrency cap, never raising."""
+        state = _new_researcher_state(researcher_name, task, retrieval_cache, cache_scope)
+        async with semaphore:
+            try:
+                result = await asyncio.wait_for(
+                    self.researchers[researcher_name].aanalyze(state),
+                    timeout=RESEARCH_TIMEOUT
+                )
+                logger.info(f"[{researcher_name}] Complete.")
+                return result
+            except Exception as e:
+                logger.error(f"[{researcher_name}] Failed: {e}")
+                return {
+                    "researcher_name": researcher_name,
+                    "task": task,
+                    "retrieved_context": [],
+                    "findings": {"error": str(e)}
+                }
+    
+    def _augment_with_unknowns(
+        self,
+        results: Dict[str, ResearcherState],
+        vision_result: Dict[str, Any]
+    ) -> None:
+        """
+        Resolve Vision elements missing from RAG via the external API.
+        
+        Comprehensive unknown detection instead of generic thresholds:
+        resolved contexts are added to the pipe researchers' results, and
+        unresolved items become results['user_alerts'] (updated in place).
+        """
+        logger.info("Checking for unknown materials/elements not found in RAG...")
         
-        # NEW: Comprehensive unknown detection instead of generic thresholds
-        if vision_result:
-            logger.info("Checking for unknown materials/elements not found in RAG...")
-            
-            # Identify unknowns (materials, symbols, codes not in knowledge base)
-            unknowns = self._identify_unknowns(vision_result, results)
-            
-            if unknowns:
-                logger.warning(f"Detected {len(unknowns)} unknown element(s)")
-                unresolved_items = []
-                
-                # Try to resolve each unknown via external API
-                for unknown in unknowns:
-                    api_result = self._query_external_for_unknown(unknown)
-                    
-                    if api_result['success']:
-                        # Success! Add external contexts to relevant researchers
-                        for researcher_name in ['storm', 'sanitary', 'water']:
-                            if researcher_name in results:
-                                results[researcher_name]['retrieved_context'].extend(
-                                    api_result['contexts']
-                                )
-                                results[researcher_name]['api_augmented'] = True
-                                results[researcher_name].setdefault('unknowns_resolved', []).append(
-                                    unknown['value']
-                                )
-                    else:
-                        # Failed - add to unresolved list for user alert
-                        unresolved_items.append({
-                            **unknown,
-                            "searched": ["local_kb", "tavily_api"],
-                            "reason": api_result['reason']
-                        })
-                
-                # Build user alerts for unresolved unknowns
-                if unresolved_items:
-                    user_alerts = self._build_user_alerts(unresolved_items)
-                    results['user_alerts'] = user_alerts
-                    logger.error(
-                        f"⚠️  {len(unresolved_items)} unknown(s) could not be resolved - "
-                        f"user alert created"
-                    )
+        # Identify unknowns (materials, symbols, codes not in knowledge base)
+        unknowns = self._identify_unknowns(vision_result, results)
+        
+        if unknowns:
+            logger.warning(f"Detected {len(unknowns)} unknown element(s)")
+            # Try to resolve each unknown via external API (searches run concurrently)
+            self._apply_external_results(results, unknowns, self._query_external_for_unknowns(unknowns))
+        else:
+            logger.info("✓ All detected elements found in knowledge base")
+    
+    async def _aaugment_with_unknowns(
+        self,
+        results: Dict[str, ResearcherState],
+        vision_result: Dict[str, Any]
+    ) -> None:
+        """
+        Async _augment_with_unknowns: the external searches run on the
+        caller's event loop and the shared connection pool.
+        """
+        logger.info("Checking for unknown materials/elements not found in RAG...")
+        
+        unknowns = self._identify_unknowns(vision_result, results)
+        
+        if unknowns:
+            logger.warning(f"Detected {len(unknowns)} unknown element(s)")
+            self._apply_external_results(
+                results, unknowns, await self._aquery_external_for_unknowns(unknowns)
+            )
+        else:
+            logger.info("✓ All detected elements found in knowledge base")
+    
+    def _apply_external_results(
+        self,
+        results: Dict[str, ResearcherState],
+        unknowns: List[Dict[str, Any]],
+        external_results: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Add resolved external contexts to the pipe researchers' results and
+        alert the user about the rest (updates results in place).
+        
+        Args:
+            results: Researcher results from execute_research
+            unknowns: Unknown elements, as from _identify_unknowns
+            external_results: One evaluated search result per unknown
+        """
+        unresolved_items = []
+        
+        for unknown, api_result in zip(unknowns, external_results):
+            if api_result['success']:
+                # Success! Add external contexts to relevant researchers
+                for researcher_name in ['storm', 'sanitary', 'water']:
+                    if researcher_name in results:
+                        results[researcher_name]['retrieved_context'].extend(
+                            api_result['contexts']
+                        )
+                        results[researcher_name]['retrieved_count'] = len(
+                            results[researcher_name]['retrieved_context']
+                        )
+                        results[researcher_name]['api_augmented'] = True
+                        results[researcher_name].setdefault('unknowns_resolved', []).append(
+                            unknown['value']
+                        )
             else:
-                logger.info("✓ All detected elements found in knowledge base")
+                # Failed - add to unresolved list for user alert
+                unresolved_items.append({
+                    **unknown,
+                    "searched": ["local_kb", "tavily_api"],
+                    "reason": api_result['reason']
+                })
         
-        return results
+        # Build user alerts for unresolved unknowns
+        if unresolved_items:
+            user_alerts = self._build_user_alerts(unresolved_items)
+            results['user_alerts'] = user_alerts
+            logger.error(
+                f"⚠️  {len(unresolved_items)} unknown(s) could not be resolved - "
+                f"user alert created"
+            )
     
     def consolidate_findings(
         self,
         researcher_results: Dict[str, ResearcherState],
-        vision_pipes: list = None
+        vision_pipes: list = None,
+        include_narrative: bool = False
     ) -> Dict[str, Any]:
         """
         Consolidate and validate findings from all researchers.
@@ -282,110 +966,84 @@ Your expertise is in deciding which researcher/estimator should perform takeoff
         Args:
             researcher_results: Results from execute_research
             vision_pipes: Raw pipe list from Vision agents (may contain duplicates)
+            include_narrative: Ask the LLM for a consolidation narrative even
+                when there are no Vision pipes to count
         
         Returns:
             Consolidated takeoff data with deduplicated pipes
         """
         logger.info("Consolidating researcher findings...")
         
-        # If we have Vision pipes, add deduplication step
+        # If we have Vision pipes, add deduplication step (exact repeats
+        # collapsed locally, so the LLM only sees what needs judgement)
         if vision_pipes:
+            vision_pipes = collapse_duplicate_pipes(vision_pipes)
             logger.info(f"Deduplicating {len(vision_pipes)} Vision detections...")
+        elif not include_narrative:
+            # Nothing to count or deduplicate - the LLM would only restate findings
+            return self._local_consolidation(researcher_results)
         
-        # Format results for LLM (skip user_alerts key - not a researcher)
-        findings_text = ""
+        # Format results for LLM (skip user_alerts key - not a researcher) as
+        # compact, deterministic JSON rather than dict reprs
+        findings_by_researcher = {}
         for name, result in researcher_results.items():
             # Skip meta keys like user_alerts, or None keys
             if not name or name in ['user_alerts']:
                 continue
-                
-            findings_text += f"\n## {name.upper()} Researcher\n"
-            findings_text += f"Findings: {result.get('findings', {})}\n"
-            findings_text += f"Context Used: {len(result.get('retrieved_context', []))} standards\n"
             
+            entry = {
+                "findings": _bounded_findings(result.get('findings', {})),
+                "context_used": len(result.get('retrieved_context', []))
+            }
             # Show if unknowns were resolved
             if result.get('unknowns_resolved'):
-                findings_text += f"Unknowns Resolved: {', '.join(result['unknowns_resolved'])}\n"
+                entry["unknowns_resolved"] = result['unknowns_resolved']
+            findings_by_researcher[name] = entry
+        
+        findings_text = "\n## RESEARCHER FINDINGS\n" + orjson.dumps(
+            findings_by_researcher,
+            option=orjson.OPT_SORT_KEYS,
+            default=str
+        ).decode()
         
-        # Build Vision pipe summary for deduplication
+        # Build Vision pipe summary for deduplication (joined once, no repeated copies)
         vision_summary = ""
         if vision_pipes:
-            vision_summary = f"\n## VISION AGENT DETECTIONS ({len(vision_pipes)} pipes, may include duplicates)\n\n"
+            summary_parts = [f"\n## VISION AGENT DETECTIONS ({len(vision_pipes)} pipes, may include duplicates)\n\n"]
             for i, p in enumerate(vision_pipes, 1):
-                vision_summary += f"{i}. {p.get('discipline', '?')} - {p.get('diameter_in', '?')}\" {p.get('material', '?')} - {p.get('length_ft', '?')} LF"
-                if p.get('from_structure'):
-                    vision_summary += f" (from {p.get('from_structure')} to {p.get('to_structure')})"
-                vision_summary += f" [source: {p.get('source', '?')}]\n"
-        
-        prompt = f"""You are an expert at reading construction blueprint documents and vector and raster pdfs.
-
-{vision_summary}
-
-{findings_text}
-
-If you see a construction item like a pipe with the same label more than once then don't count it multiple times. It is simply a construction item being referenced again from a different view or perhaps giving us more information about it. Analyze for new, important information but do not count it again when you see it has the same naming convention you already saw and counted.
-
-Calculate total unique pipes by type and their total lengths.
-
-Return JSON:
-{{
-    "summary": {{
-        "storm_pipes": int,
-        "sanitary_pipes": int,
-        "water_pipes": int,
-        "total_pipes": int,
-        "storm_lf": float,
-        "sanitary_lf": float,
-        "water_lf": float,
-        "total_lf": float
-    }},
-    "materials_found": [],
-    "overall_confidence": 0.0-1.0,
-    "recommendations": ""
-}}"""
+                route = f" (from {p['from_structure']} to {p.get('to_structure')})" if p.get('from_structure') else ""
+                summary_parts.append(
+                    f"{i}. {p.get('discipline', '?')} - {p.get('diameter_in', '?')}\" {p.get('material', '?')} - "
+                    f"{p.get('length_ft', '?')} LF{route} [source: {p.get('source', '?')}]\n"
+                )
+            vision_summary = "".join(summary_parts)
         
         messages = [
-            SystemMessage(content="You are a construction takeoff supervisor consolidating researcher findings."),
-            HumanMessage(content=prompt)
+            CONSOLIDATION_SYSTEM_MESSAGE,
+            HumanMessage(content=f"{CONSOLIDATION_INSTRUCTIONS}{vision_summary}\n\n{findings_text}")
         ]
         
         try:
-            response = self.llm.invoke(messages)
-            consolidation_text = response.content
+            output = llm_retry(self._consolidation_llm.invoke)(messages)
+            logger.info(f"✅ Supervisor parsed deduplication result")
             
-            # Try to parse JSON from LLM response (for deduplication results)
-            import re
-            import json
+            # Use LLM's deduplicated counts
+            consolidated = {
+                "summary": output.summary.model_dump(),
+                "consolidation_analysis": output.model_dump_json(),
+                "deduplication_notes": "",
+                "materials_found": output.materials_found,
+                "diameters_found": [],
+                "elevations_extracted": False,
+                "conflicts": [],
+                "validation_issues": [],
+                "overall_confidence": output.overall_confidence,
+                "recommendations": output.recommendations
+            }
             
-            json_match = re.search(r'\{.*\}', consolidation_text, re.DOTALL)
-            if json_match:
-                try:
-                    llm_result = json.loads(json_match.group())
-                    logger.info(f"✅ Supervisor parsed deduplication result")
-                    
-                    # Use LLM's deduplicated counts
-                    consolidated = {
-                        "summary": llm_result.get("summary", {}),
-                        "consolidation_analysis": consolidation_text,
-                        "deduplication_notes": llm_result.get("deduplication_notes", ""),
-                        "materials_found": llm_result.get("materials_found", []),
-                        "diameters_found": llm_result.get("diameters_found", []),
-                        "elevations_extracted": llm_result.get("elevations_extracted", False),
-                        "conflicts": llm_result.get("conflicts", []),
-                        "validation_issues": llm_result.get("validation_issues", []),
-                        "recommendations": llm_result.get("recommendations", "")
-                    }
-                    
-                    logger.info(
-                        f"Consolidation complete. Deduplicated: {consolidated['summary'].get('total_pipes', 0)} unique pipes."
-                    )
-                    
-                except json.JSONDecodeError:
-                    logger.warning("Failed to parse Supervisor JSON, using fallback")
-                    consolidated = self._fallback_consolidation(researcher_results, consolidation_text)
-            else:
-                logger.warning("No JSON found in Supervisor response, using fallback")
-                consolidated = self._fallback_consolidation(researcher_results, consolidation_text)
+            logger.info(
+                f"Consolidation complete. Deduplicated: {consolidated['summary']['total_pipes']} unique pipes."
+            )
             
             return consolidated
         
@@ -442,74 +1100,35 @@ Return JSON:
                 "recommendations": ""
             }
         
-        # Use LLM to deduplicate (same prompt as consolidate_findings)
+        # Collapse exact repeats locally, then use LLM to deduplicate the
+        # rest (same prompt as consolidate_findings)
+        vision_pipes = collapse_duplicate_pipes(vision_pipes)
         vision_summary = f"Vision detected {len(vision_pipes)} pipes from construction document."
         
-        prompt = f"""You are an expert at reading construction blueprint documents and vector and raster pdfs.
-
+        prompt = f"""{DEDUP_VISION_INSTRUCTIONS}
 {vision_summary}
 
 Vision Detections:
-{self._format_pipes_for_llm(vision_pipes)}
-
-If you see a construction item like a pipe with the same label more than once then don't count it multiple times. It is simply a construction item being referenced again from a different view or perhaps giving us more information about it. Analyze for new, important information but do not count it again when you see it has the same naming convention you already saw and counted.
-
-Calculate the total unique pipes by type and their total lengths.
-
-Return JSON:
-{{
-    "summary": {{
-        "storm_pipes": int,
-        "sanitary_pipes": int,
-        "water_pipes": int,
-        "total_pipes": int,
-        "storm_lf": float,
-        "sanitary_lf": float,
-        "water_lf": float,
-        "total_lf": float
-    }},
-    "materials_found": [],
-    "recommendations": ""
-}}"""
+{self._format_pipes_for_llm(vision_pipes)}"""
 
         try:
             messages = [
-                SystemMessage(content="You are an expert construction estimator."),
+                DEDUP_SYSTEM_MESSAGE,
                 HumanMessage(content=prompt)
             ]
             
-            response = self.llm.invoke(messages)
-            import json
-            import re
-            
-            content = response.content
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            response = llm_retry(self.llm.invoke)(messages)
             
-            if json_match:
-                consolidated = json.loads(json_match.group())
-                logger.info("✅ Supervisor parsed deduplication result")
-                return consolidated
-            else:
-                raise ValueError("No JSON found in response")
+            consolidated = parse_dedup_reply(response.content)
+            consolidated["validation_issues"] = []
+            logger.info("✅ Supervisor parsed deduplication result")
+            return consolidated
         
         except Exception as e:
             logger.warning(f"LLM deduplication failed ({e}), using fallback count")
             # Fallback: naive count (no deduplication)
-            storm_count = sum(1 for p in vision_pipes if p.get("discipline") == "storm")
-            sanitary_count = sum(1 for p in vision_pipes if p.get("discipline") == "sanitary")
-            water_count = sum(1 for p in vision_pipes if p.get("discipline") == "water")
-            
             return {
-                "summary": {
-                    "storm_pipes": storm_count,
-                    "sanitary_pipes": sanitary_count,
-                    "water_pipes": water_count,
-                    "total_pipes": len(vision_pipes),
-                    "storm_lf": sum(p.get("length_ft", 0) for p in vision_pipes if p.get("discipline") == "storm"),
-                    "sanitary_lf": sum(p.get("length_ft", 0) for p in vision_pipes if p.get("discipline") == "sanitary"),
-                    "water_lf": sum(p.get("length_ft", 0) for p in vision_pipes if p.get("discipline") == "water"),
-                    "total_lf": sum(p.get("length_ft", 0) for p in vision_pipes)
-                },
+                "summary": naive_pipe_totals(vision_pipes),
                 "materials_found": list(set(p.get("material", "") for p in vision_pipes)),
                 "validation_issues": ["LLM deduplication failed - using naive count"],
                 "recommendations": ""
@@ -526,31 +1145,27 @@ Return JSON:
             )
         return "\n".join(formatted)
     
-    def _fallback_consolidation(
+    def _local_consolidation(
         self,
-        researcher_results: Dict[str, ResearcherState],
-        consolidation_text: str
+        researcher_results: Dict[str, ResearcherState]
     ) -> Dict[str, Any]:
-        """Fallback when LLM doesn't return valid JSON."""
+        """Consolidation without an LLM call, for runs with no Vision pipes."""
+        analyses = [
+            f"{name.upper()}: {result['findings']['analysis']}"
+            for name, result in researcher_results.items()
+            if name and name != 'user_alerts' and result.get('findings', {}).get('analysis')
+        ]
+        logger.info("Consolidation complete without LLM (no Vision pipes to count)")
         return {
-            "summary": {
-                "storm_pipes": 0,
-                "sanitary_pipes": 0,
-                "water_pipes": 0,
-                "total_pipes": 0,
-                "storm_lf": 0.0,
-                "sanitary_lf": 0.0,
-                "water_lf": 0.0,
-                "total_lf": 0.0
-            },
-            "consolidation_analysis": consolidation_text,
-            "deduplication_notes": "Deduplication failed - counts may include duplicates",
+            "summary": naive_pipe_totals([]),
+            "consolidation_analysis": "\n\n".join(analyses),
+            "deduplication_notes": "No Vision detections - nothing to deduplicate",
             "materials_found": [],
             "diameters_found": [],
             "elevations_extracted": False,
             "conflicts": [],
-            "validation_issues": ["Consolidation JSON parsing failed"],
-            "recommendations": "Manual review required"
+            "validation_issues": [],
+            "recommendations": ""
         }
     
     def _looks_like_abbreviation(self, material: str) -> bool:
@@ -588,6 +1203,140 @@ Return JSON:
         return any(c.isalpha() for c in material_core)
         # Includes: "FPVC", "Pvc", "C", "DI", "pvc", "RCP"
     
+    def _get_retriever(self) -> HybridRetriever:
+        """Shared retriever used for material validation."""
+        return get_retriever()
+    
+    def retrieve_material_context(self, search_name: str) -> List[Dict[str, Any]]:
+        """
+        Query RAG for a material's specifications.
+        
+        Args:
+            search_name: Material name (decoded from legend if available)
+        
+        Returns:
+            Retrieved documents from the hybrid retriever
+        """
+        return self._get_retriever().retrieve_hybrid(
+            query=material_query(search_name),
+            k=5,
+            discipline=None
+        )
+    
+    def extract_text_legend(self, pdf_path: str) -> Dict[str, str]:
+        """
+        Extract legend entries directly from PDF text.
+        
+        Looks for patterns like "FPVC = Fabric-Reinforced PVC Pipe" on the
+        first 2 pages (legend usually on page 1). Results are remembered per
+        file version (path, mtime, size), so re-running a PDF doesn't
+        reopen and re-parse it.
+        
+        Args:
+            pdf_path: Path to PDF file
+        
+        Returns:
+            Dict of abbreviation -> full name (empty if none found)
+        """
+        try:
+            stat = os.stat(pdf_path)
+            memo_key = (os.path.abspath(pdf_path), stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            memo_key = None
+        
+        if memo_key is not None:
+            with _legend_memo_lock:
+                legend = _legend_memo.get(memo_key)
+                if legend is not None:
+                    _legend_memo.move_to_end(memo_key)
+                    logger.info(f"Reusing text legend for unchanged PDF ({len(legend)} entries)")
+                    return dict(legend)
+        
+        logger.info("Attempting text-based legend extraction from PDF file...")
+        legend = {}
+        try:
+            import fitz  # PyMuPDF
+            
+            # Scan positioned text blocks (a legend entry sits inside one
+            # block) rather than reflowing each page into one big string
+            matches = []
+            with fitz.open(pdf_path) as doc:
+                for page_num in range(min(2, len(doc))):
+                    for block in doc[page_num].get_text("blocks"):
+                        if block[6] == 0:  # text block, not image
+                            matches.extend(TEXT_LEGEND_PATTERN.findall(block[4]))
+            
+            if matches:
+                logger.info(f"Found {len(matches)} legend entries via text extraction")
+                for abbrev, full_name in matches:
+                    legend[abbrev.strip().upper()] = full_name.strip()
+        except Exception as e:
+            logger.warning(f"Text-based legend extraction failed: {e}")
+            return legend
+        
+        if memo_key is not None:
+            with _legend_memo_lock:
+                _legend_memo[memo_key] = dict(legend)
+                if len(_legend_memo) > LEGEND_MEMO_SIZE:
+                    _legend_memo.popitem(last=False)
+        
+        return legend
+    
+    def retrieve_materials_batch(
+        self,
+        search_names: List[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Query RAG for several materials in one batched retrieval.
+        
+        Args:
+            search_names: Material names to look up
+        
+        Returns:
+            Dict of material query -> retrieved documents. Empty if the
+            batch fails, so callers can retry materials individually.
+        """
+        if not search_names:
+            return {}
+        
+        queries = [material_query(name) for name in search_names]
+        try:
+            batch_results = self._get_retriever().retrieve_hybrid_batch(queries, k=5)
+        except Exception as e:
+            logger.warning(f"Batched RAG lookup failed for {len(queries)} materials: {e}")
+            return {}
+        
+        return dict(zip(queries, batch_results))
+    
+    def prefetch_rag(self, pdf_path: str = None) -> Dict[str, Any]:
+        """
+        Prepare validation resources that don't depend on Vision results.
+        
+        Builds the retriever (Qdrant connection + BM25 index) and extracts the
+        text legend so both are ready by the time Vision finishes.
+        
+        Args:
+            pdf_path: Optional path to PDF file for legend extraction
+        
+        Returns:
+            Dict with "text_legend" (abbreviation -> full name)
+        """
+        self._get_retriever()
+        text_legend = self.extract_text_legend(pdf_path) if pdf_path else {}
+        return {"text_legend": text_legend}
+    
+    def prewarm_rag(self) -> None:
+        """
+        Run one throwaway material lookup so the first takeoff doesn't pay
+        for retriever construction, the embeddings connection and Qdrant's
+        first search.
+        """
+        try:
+            self.retrieve_material_context("PVC")
+            logger.info("RAG retriever warmed up")
+        except Exception as e:
+            logger.warning(f"RAG warmup failed (will retry lazily on first takeoff): {e}")
+    
     def validate_and_enrich(self, state: SupervisorState) -> SupervisorState:
         """
         Vision-First validation workflow - NO extraction, only validation.
@@ -612,8 +1361,8 @@ Return JSON:
         logger.info("Checking materials against RAG knowledge base...")
         unique_materials = set()
         for pipe in vision_pipes:
-            material = (pipe.get("material") or "").strip().upper()
-            if material and material not in ["", "UNKNOWN", "N/A"]:
+            material = normalize_material(pipe)
+            if material:
                 unique_materials.add(material)
         
         logger.info(f"Found {len(unique_materials)} unique materials: {', '.join(sorted(unique_materials))}")
@@ -639,40 +1388,29 @@ Return JSON:
                         logger.info(f"📖 Vision legend: {material} → {decoded}")
         
         # Fallback: Extract legend directly from PDF text (if Vision didn't extract it)
-        if not abbreviations and state.get("pdf_path"):
-            logger.info("Attempting text-based legend extraction from PDF file...")
-            try:
-                import fitz  # PyMuPDF
-                import re
-                
-                pdf_path = state.get("pdf_path")
-                doc = fitz.open(pdf_path)
-                pdf_text = ""
-                # Extract text from first 2 pages (legend usually on page 1)
-                for page_num in range(min(2, len(doc))):
-                    pdf_text += doc[page_num].get_text()
-                doc.close()
-                
-                # Look for patterns like "FPVC = Fabric-Reinforced PVC Pipe"
-                legend_pattern = r'([A-Z]{2,6})\s*=\s*([^(\n]+?)(?:\s*\(|$|\n)'
-                matches = re.findall(legend_pattern, pdf_text)
-                if matches:
-                    logger.info(f"Found {len(matches)} legend entries via text extraction")
-                    for abbrev, full_name in matches:
-                        abbrev_clean = abbrev.strip().upper()
-                        full_name_clean = full_name.strip()
-                        if abbrev_clean in unique_materials:
-                            abbreviations[abbrev_clean] = full_name_clean
-                            logger.info(f"📖 Text legend: {abbrev_clean} → {full_name_clean}")
-            except Exception as e:
-                logger.warning(f"Text-based legend extraction failed: {e}")
+        if not abbreviations:
+            text_legend = state.get("text_legend")
+            if text_legend is None and state.get("pdf_path"):
+                text_legend = self.extract_text_legend(state["pdf_path"])
+            for abbrev_clean, full_name_clean in (text_legend or {}).items():
+                if abbrev_clean in unique_materials:
+                    abbreviations[abbrev_clean] = full_name_clean
+                    logger.info(f"📖 Text legend: {abbrev_clean} → {full_name_clean}")
         
         if not abbreviations:
             logger.info("No abbreviations decoded (either no legend or no abbreviations needed decoding)")
         
         # Step 2: Query RAG for each material to validate (use decoded names if available)
-        from app.rag.retriever import HybridRetriever
-        retriever = HybridRetriever()
+        # Lookups already made while Vision pages were streaming are reused;
+        # the rest are fetched as one concurrent batch instead of one by one
+        rag_cache = dict(state.get("rag_cache") or {})
+        pending_names = {
+            abbreviations.get(material, material) for material in unique_materials
+        }
+        pending_names = [
+            name for name in pending_names if material_query(name) not in rag_cache
+        ]
+        rag_cache.update(self.retrieve_materials_batch(pending_names))
         
         known_materials = set()
         unknown_materials = set()
@@ -681,17 +1419,15 @@ Return JSON:
         for material in unique_materials:
             # Use decoded material name if available, otherwise use original
             search_name = abbreviations.get(material, material)
-            search_query = f"{search_name} pipe material specifications"
+            search_query = material_query(search_name)
             
             if material in abbreviations:
                 logger.info(f"Searching RAG for '{material}' using decoded name '{search_name}'")
             
             # Query RAG for material specs
-            rag_results = retriever.retrieve_hybrid(
-                query=search_query,
-                k=5,
-                discipline=None
-            )
+            rag_results = rag_cache.get(search_query)
+            if rag_results is None:
+                rag_results = self.retrieve_material_context(search_name)
             
             # Check if material is ACTUALLY mentioned in retrieved content
             # Not just "did we get generic pipe results?"
@@ -720,19 +1456,25 @@ Return JSON:
                     logger.warning(f"⚠️  {material} ({abbreviations[material]}): NOT in knowledge base even after legend decoding")
                 else:
                     logger.warning(f"⚠️  {material}: NOT in knowledge base (material not mentioned in any standard)")
-                
-                # Try to resolve via Tavily API
-                tavily_search = abbreviations.get(material, material)
-                logger.info(f"[api] Searching external sources for material: '{tavily_search}'")
-                api_result = self.api_researcher.analyze(
-                    state={"task": f"Construction pipe {tavily_search} material specifications ASTM standards"}
-                )
-                researcher_results[f"api_{material}"] = {
-                    "researcher_name": "api",
-                    "task": f"Research {material} material",
-                    "findings": api_result.get("findings", {}),
-                    "retrieved_context": api_result.get("retrieved_context", [])
-                }
+        
+        # Try to resolve unknown materials via Tavily API (searched concurrently)
+        api_materials = sorted(unknown_materials)
+        api_states = []
+        for material in api_materials:
+            tavily_search = abbreviations.get(material, material)
+            logger.info(f"[api] Searching external sources for material: '{tavily_search}'")
+            api_states.append(
+                {"task": f"Construction pipe {tavily_search} material specifications ASTM standards"}
+            )
+        
+        for material, api_result in zip(api_materials, self.api_researcher.batch_analyze(api_states)):
+            researcher_results[f"api_{material}"] = {
+                "researcher_name": "api",
+                "task": f"Research {material} material",
+                "findings": api_result.get("findings", {}),
+                "retrieved_context": api_result.get("retrieved_context", []),
+                "retrieved_count": api_result.get("retrieved_standards_count", 0)
+            }
         
         # Summary
         if unknown_materials:
@@ -789,14 +1531,20 @@ Return JSON:
         
         logger.info("=== SUPERVISOR STARTING ===")
         
-        # Step 1: Plan research tasks
-        tasks = self.plan_research(pdf_summary)
+        # Step 1: Plan research tasks (no LLM call if the user named the disciplines)
+        tasks = plan_from_query(state.get("user_query", ""))
+        plan_source = "user_query" if tasks else "llm"
+        if tasks:
+            logger.info(f"User request names disciplines, deploying {len(tasks)} researchers without planning")
+        else:
+            tasks = self.plan_research(pdf_summary)
         
         # Step 2: Execute research with unknown detection
         researcher_results = self.execute_research(
             tasks,
             parallel=True,
-            vision_result=vision_result  # Enable unknown detection
+            vision_result=vision_result,  # Enable unknown detection
+            cache_scope=source_scope(state.get("pdf_path"))
         )
         
         # Step 3: Consolidate findings (with Vision pipes for deduplication)
@@ -818,6 +1566,66 @@ Return JSON:
         return {
             "pdf_summary": pdf_summary,
             "assigned_tasks": tasks,
+            "plan_source": plan_source,
+            "researcher_results": researcher_results,
+            "consolidated_data": consolidated,
+            "conflicts": conflicts
+        }
+    
+    async def asupervise(self, state: SupervisorState) -> SupervisorState:
+        """
+        Async supervision workflow: same steps as supervise, with the
+        researchers fanned out concurrently via aexecute_research.
+        
+        Args:
+            state: SupervisorState with PDF summary
+        
+        Returns:
+            Updated state with consolidated data
+        """
+        pdf_summary = state["pdf_summary"]
+        vision_result = state.get("vision_result", {})
+        
+        logger.info("=== SUPERVISOR STARTING (async) ===")
+        
+        cache_scope = source_scope(state.get("pdf_path"))
+        
+        tasks = plan_from_query(state.get("user_query", ""))
+        plan_source = "user_query" if tasks else "llm"
+        if tasks:
+            logger.info(f"User request names disciplines, deploying {len(tasks)} researchers without planning")
+            researcher_results = await self.aexecute_research(
+                tasks,
+                vision_result=vision_result,
+                cache_scope=cache_scope
+            )
+        else:
+            # Researchers start as soon as their task streams in from the planner
+            tasks, researcher_results = await self.aplan_and_research(
+                pdf_summary,
+                vision_result=vision_result,
+                cache_scope=cache_scope
+            )
+        
+        vision_pipes = vision_result.get("pipes", []) if vision_result else []
+        consolidated = await asyncio.to_thread(
+            self.consolidate_findings,
+            researcher_results,
+            vision_pipes=vision_pipes
+        )
+        
+        conflicts = consolidated.get("conflicts", [])
+        if conflicts:
+            logger.warning(f"Found {len(conflicts)} conflicts between researchers")
+            for conflict in conflicts:
+                logger.warning(f"  - {conflict}")
+        
+        logger.info("=== SUPERVISOR COMPLETE ===")
+        
+        return {
+            "pdf_summary": pdf_summary,
+            "assigned_tasks": tasks,
+            "plan_source": plan_source,
             "researcher_results": researcher_results,
             "consolidated_data": consolidated,
             "conflicts": conflicts
@@ -846,32 +1654,38 @@ Return JSON:
         """
         unknowns = []
         
-        # Extract materials from vision pipes
-        detected_materials = set()
-        pipes = vision_result.get("pipes", [])
-        
-        for pipe in pipes:
-            material = (pipe.get("material") or "").strip().upper()
-            if material and material not in ["", "UNKNOWN", "N/A"]:
-                detected_materials.add(material)
-        
-        # Collect all RAG contexts
-        all_contexts = []
-        for researcher_name, result in researcher_results.items():
-            all_contexts.extend(result.get("retrieved_context", []))
-        
-        # Combine all contexts into searchable text
-        all_context_text = " ".join(all_contexts).upper()
+        # Group vision pipes by material in one pass
+        pipes_by_material: Dict[str, List[Dict[str, Any]]] = {}
+        for pipe in vision_result.get("pipes", []):
+            material = normalize_material(pipe)
+            if material:
+                pipes_by_material.setdefault(material, []).append(pipe)
+        detected_materials = pipes_by_material.keys()
+        
+        # Collect all RAG contexts, once each (researchers often retrieve the same chunks)
+        all_contexts = list(dict.fromkeys(
+            context
+            for result in researcher_results.values()
+            for context in result.get("retrieved_context", [])
+        ))
+        
+        # Search all materials in the retrieved contexts in one pass
+        materials_in_rag = find_terms(all_contexts, set(detected_materials))
+        
+        # Materials the local KB covers aren't unknown, just not retrieved this run
+        not_retrieved = set(detected_materials) - materials_in_rag
+        materials_in_kb = find_terms(local_standards_texts(), not_retrieved)
+        for material in materials_in_kb:
+            logger.info(f"Material {material} not retrieved but covered by local standards")
         
         # Check each material against RAG contexts
         for material in detected_materials:
-            # Search for material in retrieved contexts
-            found_in_rag = material in all_context_text
+            found_in_rag = material in materials_in_rag or material in materials_in_kb
             
             if not found_in_rag:
                 # Find which pipe(s) use this material
-                example_pipes = [p for p in pipes if (p.get("material") or "").upper() == material]
-                example = example_pipes[0] if example_pipes else {}
+                example_pipes = pipes_by_material[material]
+                example = example_pipes[0]
                 
                 unknowns.append({
                     "type": "material",
@@ -884,81 +1698,175 @@ Return JSON:
         
         return unknowns
     
-    def _query_external_for_unknown(
+    def _unknown_batches(self, unknowns: List[Dict[str, Any]]) -> List[List[int]]:
+        """Indices of the unknowns grouped by type, at most EXTERNAL_BATCH_SIZE per group."""
+        by_type: Dict[str, List[int]] = {}
+        for i, unknown in enumerate(unknowns):
+            by_type.setdefault(unknown['type'], []).append(i)
+        return [
+            indices[start:start + EXTERNAL_BATCH_SIZE]
+            for indices in by_type.values()
+            for start in range(0, len(indices), EXTERNAL_BATCH_SIZE)
+        ]
+    
+    def _unknown_search_states(
         self,
-        unknown: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """
-        Query Tavily API for specific unknown element.
+        unknowns: List[Dict[str, Any]],
+        batches: List[List[int]]
+    ) -> List[Dict[str, Any]]:
+        """One API researcher state per batch, asking for more results the more unknowns it covers."""
+        return [
+            {
+                "task": self._unknown_query([unknowns[i] for i in batch]),
+                "max_results": EXTERNAL_RESULTS_PER_UNKNOWN * len(batch)
+            }
+            for batch in batches
+        ]
+    
+    def _unknown_query(self, unknowns: List[Dict[str, Any]]) -> str:
+        """External search query for unknown elements of one type, specific to that type."""
+        unknown_type = unknowns[0]['type']
+        unknown_value = ", ".join(unknown['value'] for unknown in unknowns)
+        
+        logger.info(f"[api] Searching external sources for {unknown_type}: '{unknown_value}'")
         
-        Returns success status, contexts, and failure reason.
+        if unknown_type == "material":
+            return f"Construction pipe {unknown_value} material specifications ASTM standards properties"
+        elif unknown_type == "code":
+            return f"Building code {unknown_value} plumbing requirements"
+        elif unknown_type == "symbol":
+            return f"Construction drawing symbol {unknown_value} meaning"
+        return f"Construction {unknown_type} {unknown_value} specifications"
+    
+    def _query_external_for_unknowns(
+        self,
+        unknowns: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
         """
-        unknown_type = unknown['type']
-        unknown_value = unknown['value']
+        Query Tavily API for several unknown elements at once.
         
-        logger.info(f"[api] Searching external sources for {unknown_type}: '{unknown_value}'")
+        Unknowns of the same type share one search (see _unknown_batches)
+        and the searches run concurrently, so resolving N unknowns costs
+        about N / EXTERNAL_BATCH_SIZE Tavily calls and one round trip.
         
+        Returns:
+            One result per unknown: success status, contexts, and failure reason
+        """
+        batches = self._unknown_batches(unknowns)
         try:
-            # Construct specific query based on type
-            if unknown_type == "material":
-                query = f"Construction pipe {unknown_value} material specifications ASTM standards properties"
-            elif unknown_type == "code":
-                query = f"Building code {unknown_value} plumbing requirements"
-            elif unknown_type == "symbol":
-                query = f"Construction drawing symbol {unknown_value} meaning"
-            else:
-                query = f"Construction {unknown_type} {unknown_value} specifications"
-            
-            # Query API
-            api_result = self.api_researcher.analyze({"task": query})
-            
-            contexts = api_result.get("retrieved_context", [])
-            confidence = api_result.get("confidence", 0.0)
-            
-            # Evaluate results
-            if len(contexts) == 0:
-                return {
-                    "success": False,
-                    "reason": "No external sources found",
-                    "contexts": [],
-                    "confidence": 0.0
-                }
-            
-            if confidence < 0.4:
-                return {
-                    "success": False,
-                    "reason": f"Low confidence ({confidence:.2f}) - results unreliable",
-                    "contexts": contexts,
-                    "confidence": confidence
-                }
-            
-            # Verify the unknown term appears in retrieved contexts
-            found_in_external = any(
-                unknown_value.lower() in ctx.lower() 
-                for ctx in contexts
+            api_results = self.api_researcher.batch_analyze(self._unknown_search_states(unknowns, batches))
+        except Exception as e:
+            return self._external_failure(unknowns, e)
+        
+        return self._demux_external_results(unknowns, batches, api_results)
+    
+    async def _aquery_external_for_unknowns(
+        self,
+        unknowns: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Async _query_external_for_unknowns (no worker thread or private event loop)."""
+        batches = self._unknown_batches(unknowns)
+        try:
+            api_results = await self.api_researcher.abatch_analyze(
+                self._unknown_search_states(unknowns, batches)
             )
+        except Exception as e:
+            return self._external_failure(unknowns, e)
+        
+        return self._demux_external_results(unknowns, batches, api_results)
+    
+    def _demux_external_results(
+        self,
+        unknowns: List[Dict[str, Any]],
+        batches: List[List[int]],
+        api_results: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Split each batched search result back out per unknown.
+        
+        An unknown keeps only the contexts that mention it, so one batch's
+        sources aren't credited to every element searched with them.
+        
+        Args:
+            unknowns: Unknown elements, as from _identify_unknowns
+            batches: Unknown indices per search, as from _unknown_batches
+            api_results: One API researcher result per batch
+        
+        Returns:
+            One evaluated result per unknown, in order
+        """
+        evaluated: List[Dict[str, Any]] = [None] * len(unknowns)
+        for batch, api_result in zip(batches, api_results):
+            contexts = api_result.get("retrieved_context", [])
+            terms = {unknowns[i]['value'].upper() for i in batch}
+            # One scan per context for all the batch's terms
+            mentions = [find_terms([ctx], terms) for ctx in contexts]
             
-            if not found_in_external:
-                return {
-                    "success": False,
-                    "reason": "External sources don't mention this specific term",
-                    "contexts": contexts
-                }
-            
-            # Success!
-            logger.info(f"[api] ✓ Found specifications for {unknown_value}")
+            for i in batch:
+                term = unknowns[i]['value'].upper()
+                own_contexts = [ctx for ctx, found in zip(contexts, mentions) if term in found]
+                evaluated[i] = self._evaluate_external_result(
+                    unknowns[i],
+                    {**api_result, "retrieved_context": own_contexts or contexts}
+                )
+        return evaluated
+    
+    def _external_failure(
+        self,
+        unknowns: List[Dict[str, Any]],
+        error: Exception
+    ) -> List[Dict[str, Any]]:
+        """Unresolved result for every unknown when the external search fails."""
+        logger.error(f"[api] External search failed: {error}")
+        return [
+            {"success": False, "reason": f"API error: {str(error)}", "contexts": []}
+            for _ in unknowns
+        ]
+    
+    def _evaluate_external_result(
+        self,
+        unknown: Dict[str, Any],
+        api_result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Decide whether an external search resolved the unknown element."""
+        unknown_value = unknown['value']
+        
+        contexts = api_result.get("retrieved_context", [])
+        confidence = api_result.get("confidence", 0.0)
+        
+        # Evaluate results
+        if len(contexts) == 0:
             return {
-                "success": True,
-                "contexts": contexts
+                "success": False,
+                "reason": "No external sources found",
+                "contexts": [],
+                "confidence": 0.0
             }
-            
-        except Exception as e:
-            logger.error(f"[api] External search failed: {e}")
+        
+        if confidence < 0.4:
+            return {
+                "success": False,
+                "reason": f"Low confidence ({confidence:.2f}) - results unreliable",
+                "contexts": contexts,
+                "confidence": confidence
+            }
+        
+        # Verify the unknown term appears in retrieved contexts
+        found_in_external = bool(find_terms(contexts, {unknown_value.upper()}))
+        
+        if not found_in_external:
             return {
                 "success": False,
-                "reason": f"API error: {str(e)}",
-                "contexts": []
+                "reason": "External sources don't mention this specific term",
+                "contexts": contexts
             }
+        
+        # Success!
+        logger.info(f"[api] ✓ Found specifications for {unknown_value}")
+        return {
+            "success": True,
+            "contexts": contexts
+        }
     
     def _build_user_alerts(
         self,
@@ -985,20 +1893,13 @@ Return JSON:
         total_count = len(unresolved_items)
         
         if material_count > 0:
-            severity = "CRITICAL"
-            impact_level = "HIGH"
-            impact_reason = f"{material_count} unknown material(s) - cost estimation unreliable"
-            estimated_risk = "$50,000+ bid error risk"
+            level = ALERT_CRITICAL
         elif total_count >= 3:
-            severity = "WARNING"
-            impact_level = "MEDIUM"
-            impact_reason = f"{total_count} unknown elements - may affect accuracy"
-            estimated_risk = "$5,000-$20,000 bid error risk"
+            level = ALERT_WARNING
         else:
-            severity = "INFO"
-            impact_level = "LOW"
-            impact_reason = f"{total_count} minor unknown(s)"
-            estimated_risk = "< $5,000 bid error risk"
+            level = ALERT_INFO
+        severity, impact_level, reason_template, estimated_risk = ALERT_LEVELS[level]
+        impact_reason = reason_template.format(total=total_count, materials=material_count)
         
         return {
             "severity": severity,
@@ -8,11 +8,11 @@ import time
 from pathlib import Path
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from pydantic import BaseModel
 
 from app.models import TakeoffResponse
-from app.agents.main_agent import run_takeoff
+from app.agents.main_agent import run_takeoff, arun_takeoff, aclose_main_agent, get_main_agent
 
 # Configure logging
 logging.basicConfig(
@@ -25,7 +25,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="EstimAI-RAG",
     description="AI-Powered Construction Takeoff with Multi-Agent RAG",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS
@@ -37,6 +38,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def startup():
+    """Build the shared takeoff agent and warm RAG/LLM before the first request."""
+    await get_main_agent().warmup()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Close the shared takeoff agent's and LLM clients' pooled HTTP connections."""
+    await aclose_main_agent()
+
+
 # Create uploads directory
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
@@ -109,11 +122,13 @@ def takeoff_simple(request: SimpleRequest):
                     "findings_summary": str(res.get("findings", {}))[:200]
                 })
         
-        return {
+        # Returned as a response directly so the (large) report is encoded
+        # once by orjson, skipping FastAPI's jsonable_encoder pass
+        return ORJSONResponse({
             "result": result.get("takeoff_result", result.get("consolidated_data", {})),
             "processing_time_sec": processing_time,
             "researcher_logs": researcher_logs
-        }
+        })
     
     except Exception as e:
         logger.error(f"Takeoff failed: {e}")
@@ -167,6 +182,7 @@ async def takeoff_baseline(file: UploadFile = File(...)):
         
         # Format as baseline result (no RAG, no validation)
         pipes = vision_results.get("pipes", [])
+        discipline_counts = vision_results.get("discipline_counts", {})
         
         return {
             "filename": file.filename,
@@ -174,9 +190,9 @@ async def takeoff_baseline(file: UploadFile = File(...)):
             "result": {
                 "summary": {
                     "total_pipes": len(pipes),
-                    "storm_pipes": sum(1 for p in pipes if p.get("discipline") == "storm"),
-                    "sanitary_pipes": sum(1 for p in pipes if p.get("discipline") == "sanitary"),
-                    "water_pipes": sum(1 for p in pipes if p.get("discipline") == "water"),
+                    "storm_pipes": discipline_counts.get("storm", 0),
+                    "sanitary_pipes": discipline_counts.get("sanitary", 0),
+                    "water_pipes": discipline_counts.get("water", 0),
                     "total_lf": sum(p.get("length_ft", 0) for p in pipes)
                 },
                 "pipes": pipes,
@@ -199,7 +215,8 @@ async def takeoff_baseline(file: UploadFile = File(...)):
 @app.post("/takeoff")
 async def takeoff(
     file: UploadFile = File(...),
-    user_query: str = Form(default="")
+    user_query: str = Form(default=""),
+    batch_mode: bool = Form(default=False)
 ):
     """
     Main takeoff endpoint - upload PDF and get results.
@@ -207,10 +224,18 @@ async def takeoff(
     Args:
         file: PDF file upload
         user_query: Optional clarification
+        batch_mode: Rejected - Batch API runs can take up to 24h, so they
+            run offline (arun_takeoff(..., batch_mode=True)), not in a request
     
     Returns:
         Takeoff results with RAG context
     """
+    if batch_mode:
+        raise HTTPException(
+            status_code=400,
+            detail="batch_mode can take up to 24h and isn't supported on /takeoff; run it offline"
+        )
+    
     start_time = time.time()
     
     logger.info(f"Takeoff request: {file.filename}")
@@ -224,8 +249,8 @@ async def takeoff(
         
         logger.info(f"Saved to: {file_path}")
         
-        # Run takeoff
-        result = run_takeoff(
+        # Run takeoff (async - shares this request's event loop)
+        result = await arun_takeoff(
             pdf_path=str(file_path),
             user_query=user_query
         )
@@ -255,14 +280,15 @@ async def takeoff(
         if user_alerts:
             logger.warning(f"User alerts: {user_alerts.get('severity')} - {user_alerts.get('total_unknowns')} unknowns")
         
-        return {
+        # Encoded once by orjson (see takeoff_simple)
+        return ORJSONResponse({
             "filename": file.filename,  # For PDF viewer
             "result": result.get("takeoff_result", result.get("consolidated_data", {})),
             "user_alerts": user_alerts,  # Critical for HITL
             "researcher_results": result.get("researcher_results", {}),
             "processing_time_sec": processing_time,
             "researcher_logs": researcher_logs
-        }
+        })
     
     except Exception as e:
         logger.error(f"Takeoff failed: {e}")
@@ -3,9 +3,9 @@ Pydantic models for EstimAI-RAG system.
 
 Defines the data structures for agent states, takeoff results, and RAG components.
 """
-from typing import Literal, TypedDict
+import operator
+from typing import Annotated, Literal, NotRequired, TypedDict
 from pydantic import BaseModel, Field
-from langchain_core.messages import BaseMessage
 
 
 # ============================================================================
@@ -17,8 +17,14 @@ class AgentState(TypedDict):
     pdf_path: str
     user_query: str
     pdf_summary: str  # What the main agent sees in the PDF
-    final_report: dict
-    messages: list[BaseMessage]
+    # Merged with operator.or_, so nodes (including parallel branches) return
+    # only the keys they add
+    final_report: Annotated[dict, operator.or_]
+    force_refresh: bool  # Bypass the Vision results cache
+    batch_mode: bool  # Run Vision through the OpenAI Batch API (offline jobs)
+    vision_dpi: int  # Page render DPI (defaults to VISION_DPI)
+    vision_batch_id: str  # Pending Vision batch, collected by wait_for_batch
+    pdf_digest: str  # SHA-1 of the PDF bytes, hashed once per run (Vision cache key, checkpoint thread)
 
 
 class SupervisorState(TypedDict, total=False):
@@ -29,6 +35,11 @@ class SupervisorState(TypedDict, total=False):
     consolidated_data: dict  # Validated, merged results
     conflicts: list[str]  # Any conflicts found between researchers
     vision_result: dict  # Optional: Vision extraction for unknown detection
+    pdf_path: str  # Optional: source PDF for text-based legend extraction
+    text_legend: dict  # Optional: prefetched {abbreviation: full name} from PDF text
+    rag_cache: dict  # Optional: {material query: retrieved docs} fetched during Vision streaming
+    user_query: str  # Optional: user's request (may name disciplines directly)
+    plan_source: str  # How researchers were chosen: "user_query" or "llm"
 
 
 class ResearcherState(TypedDict):
@@ -37,6 +48,10 @@ class ResearcherState(TypedDict):
     task: str  # Specific task from supervisor
     retrieved_context: list[str]  # RAG-retrieved construction standards
     findings: dict  # What the researcher found
+    # (query, k, discipline, category) -> docs, shared by one research run
+    retrieval_cache: NotRequired[dict]
+    retrieved_count: NotRequired[int]  # len(retrieved_context), kept in sync when augmented
+    cache_scope: NotRequired[str]  # Source PDF identity; semantic cache hits must share it
 
 
 # ============================================================================
@@ -115,6 +130,38 @@ class TakeoffResult(BaseModel):
     )
 
 
+# ============================================================================
+# Structured LLM Outputs
+# ============================================================================
+
+class PipeTotals(BaseModel):
+    """Deduplicated pipe counts and linear feet per discipline."""
+    storm_pipes: int
+    sanitary_pipes: int
+    water_pipes: int
+    total_pipes: int
+    storm_lf: float = Field(description="Storm linear feet")
+    sanitary_lf: float = Field(description="Sanitary linear feet")
+    water_lf: float = Field(description="Water linear feet")
+    total_lf: float = Field(description="Total linear feet")
+
+
+class ConsolidationOutput(BaseModel):
+    """Supervisor's consolidation of researcher findings and Vision pipes."""
+    summary: PipeTotals = Field(
+        description="Totals counting each unique pipe once"
+    )
+    materials_found: list[str] = Field(
+        description="Pipe materials present in the takeoff"
+    )
+    overall_confidence: float = Field(
+        description="Confidence in the consolidated takeoff, 0.0-1.0"
+    )
+    recommendations: str = Field(
+        description="Follow-up for the estimator, empty if none"
+    )
+
+
 # ============================================================================
 # RAG Models
 # ============================================================================
@@ -9,6 +9,7 @@ This module implements advanced retrieval techniques:
 Improves recall by expanding technical abbreviations and generating
 semantic variants of construction queries.
 """
+import json
 import logging
 from typing import List, Dict, Any
 from langchain_openai import ChatOpenAI
@@ -91,7 +92,6 @@ Return ONLY a JSON array of strings (no explanation):
             response = self.llm.invoke(messages)
             
             # Parse JSON response
-            import json
             variants = json.loads(response.content)
             
             # Ensure we have a list
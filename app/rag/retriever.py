@@ -6,7 +6,9 @@ construction standards retrieval.
 """
 import logging
 import os
-from typing import List, Dict, Any
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
 
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
@@ -15,13 +17,31 @@ from qdrant_client.models import (
     PointStruct,
     Filter,
     FieldCondition,
-    MatchValue
+    MatchValue,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    SearchRequest,
+    QuantizationSearchParams
 )
 from langchain_openai import OpenAIEmbeddings
 from rank_bm25 import BM25Okapi
 
 logger = logging.getLogger(__name__)
 
+# Query embeddings remembered per retriever (most recently used kept)
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+
+def format_standard(doc: Dict[str, Any]) -> str:
+    """Prompt text for one retrieved standard: content plus its source line."""
+    metadata = doc["metadata"]
+    formatted = f"{doc['content']}\n   Source: {metadata['source']}"
+    if metadata.get("reference"):
+        formatted += f" - {metadata['reference']}"
+    return formatted
+
 
 class HybridRetriever:
     """
@@ -78,6 +98,16 @@ class HybridRetriever:
             model="text-embedding-3-small"
         )
         
+        # Query text -> embedding. Recurring queries (researchers' constant
+        # topic queries) are embedded once per process; unaffected by
+        # re-indexing since the embedding model doesn't change
+        self._query_vectors: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._query_vectors_lock = threading.Lock()
+        
+        # Bumped whenever the collection is rebuilt, so callers caching
+        # retrieval results know to drop them
+        self.index_version = 0
+        
         # BM25 index (in-memory)
         self.bm25: BM25Okapi = None
         self.documents: List[Dict[str, Any]] = []
@@ -178,9 +208,18 @@ class HybridRetriever:
             vectors_config=VectorParams(
                 size=embedding_size,
                 distance=Distance.COSINE
+            ),
+            # int8 copies of the vectors kept in RAM: 4x smaller, SIMD-scored;
+            # top candidates are rescored against the full vectors at search
+            quantization_config=ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True
+                )
             )
         )
-        logger.info(f"Created collection with {embedding_size}-dim vectors")
+        logger.info(f"Created collection with {embedding_size}-dim vectors (int8 quantized)")
         
         # Prepare documents
         texts = [s["content"] for s in standards]
@@ -226,6 +265,7 @@ class HybridRetriever:
             for doc_id, text, meta in zip(ids, texts, metadatas)
         ]
         self.doc_ids = ids
+        self.index_version += 1
         logger.info("BM25 index built")
         
         logger.info("✅ Collection creation complete!")
@@ -235,7 +275,8 @@ class HybridRetriever:
         query: str,
         k: int = 5,
         discipline: str = None,
-        category: str = None
+        category: str = None,
+        query_embedding: List[float] = None
     ) -> List[Dict[str, Any]]:
         """
         Semantic retrieval using embeddings.
@@ -245,14 +286,31 @@ class HybridRetriever:
             k: Number of results to return
             discipline: Optional discipline filter (storm, sanitary, water, general)
             category: Optional category filter (cover_depth, material, etc.)
+            query_embedding: Precomputed embedding of query (e.g. from a
+                batched embed_documents call); embedded here if None
         
         Returns:
             List of dicts with 'content', 'metadata', 'score'
         """
         # Generate query embedding
-        query_embedding = self.embeddings.embed_query(query)
+        if query_embedding is None:
+            query_embedding = self.embed_queries([query])[0]
         
-        # Build filter
+        # Search
+        results = self.client.search(
+            collection_name=self.collection_name,
+            query_vector=query_embedding,
+            limit=k,
+            query_filter=self._build_filter(discipline, category),
+            search_params=self._search_params()
+        )
+        
+        formatted = self._format_semantic_hits(results)
+        logger.info(f"Semantic search: {len(formatted)} results for '{query}'")
+        return formatted
+    
+    def _build_filter(self, discipline: str = None, category: str = None) -> Optional[Filter]:
+        """Qdrant payload filter for the optional discipline/category."""
         must_conditions = []
         if discipline:
             must_conditions.append(
@@ -269,17 +327,16 @@ class HybridRetriever:
                 )
             )
         
-        query_filter = Filter(must=must_conditions) if must_conditions else None
-        
-        # Search
-        results = self.client.search(
-            collection_name=self.collection_name,
-            query_vector=query_embedding,
-            limit=k,
-            query_filter=query_filter
-        )
-        
-        # Format results
+        return Filter(must=must_conditions) if must_conditions else None
+    
+    @staticmethod
+    def _search_params() -> SearchParams:
+        """Search the int8 quantized vectors, rescoring the top hits exactly."""
+        return SearchParams(quantization=QuantizationSearchParams(rescore=True))
+    
+    @staticmethod
+    def _format_semantic_hits(results) -> List[Dict[str, Any]]:
+        """Qdrant hits as dicts with 'content', 'metadata', 'score'."""
         formatted = []
         for hit in results:
             formatted.append({
@@ -294,10 +351,62 @@ class HybridRetriever:
                 "score": hit.score,
                 "retrieval_method": "semantic"
             })
-        
-        logger.info(f"Semantic search: {len(formatted)} results for '{query}'")
         return formatted
     
+    def _cached_query_vectors(self, queries: List[str]) -> List[List[float]]:
+        """Cached embedding per query, None where not cached yet."""
+        with self._query_vectors_lock:
+            vectors = [self._query_vectors.get(query) for query in queries]
+            for query, vector in zip(queries, vectors):
+                if vector is not None:
+                    self._query_vectors.move_to_end(query)
+        return vectors
+    
+    def _remember_query_vectors(self, vectors: Dict[str, List[float]]) -> None:
+        """Cache fresh query embeddings, evicting the least recently used."""
+        with self._query_vectors_lock:
+            self._query_vectors.update(vectors)
+            while len(self._query_vectors) > QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_vectors.popitem(last=False)
+    
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Embed search queries, reusing cached vectors.
+        
+        Queries not seen before are embedded together in one request.
+        
+        Args:
+            queries: Search queries
+        
+        Returns:
+            One embedding per query, in query order
+        """
+        vectors = self._cached_query_vectors(queries)
+        missing = [query for query, vector in zip(queries, vectors) if vector is None]
+        if missing:
+            missing = list(dict.fromkeys(missing))
+            fresh = dict(zip(missing, self.embeddings.embed_documents(missing)))
+            self._remember_query_vectors(fresh)
+            vectors = [
+                fresh[query] if vector is None else vector
+                for query, vector in zip(queries, vectors)
+            ]
+        return vectors
+    
+    async def aembed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Async variant of embed_queries."""
+        vectors = self._cached_query_vectors(queries)
+        missing = [query for query, vector in zip(queries, vectors) if vector is None]
+        if missing:
+            missing = list(dict.fromkeys(missing))
+            fresh = dict(zip(missing, await self.embeddings.aembed_documents(missing)))
+            self._remember_query_vectors(fresh)
+            vectors = [
+                fresh[query] if vector is None else vector
+                for query, vector in zip(queries, vectors)
+            ]
+        return vectors
+    
     def retrieve_bm25(
         self,
         query: str,
@@ -359,7 +468,8 @@ class HybridRetriever:
         k: int = 5,
         discipline: str = None,
         category: str = None,
-        alpha: float = 0.5
+        alpha: float = 0.5,
+        query_embedding: List[float] = None
     ) -> List[Dict[str, Any]]:
         """
         Hybrid retrieval with reciprocal rank fusion.
@@ -370,13 +480,15 @@ class HybridRetriever:
             discipline: Optional discipline filter
             category: Optional category filter
             alpha: Weight for semantic vs BM25 (0.5 = equal weight)
+            query_embedding: Optional precomputed embedding of query
         
         Returns:
             Fused and ranked results
         """
         # Retrieve from both methods
         semantic_results = self.retrieve_semantic(
-            query, k=k*2, discipline=discipline, category=category
+            query, k=k*2, discipline=discipline, category=category,
+            query_embedding=query_embedding
         )
         bm25_results = self.retrieve_bm25(
             query, k=k*2, discipline=discipline, category=category
@@ -391,6 +503,58 @@ class HybridRetriever:
         logger.info(f"Hybrid search: {len(fused)} fused results for '{query}'")
         return fused
     
+    def retrieve_hybrid_batch(
+        self,
+        queries: List[str],
+        k: int = 5,
+        discipline: str = None,
+        category: str = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Hybrid retrieval for several queries with one embeddings call and
+        one Qdrant round trip.
+        
+        Args:
+            queries: Search queries
+            k: Number of results to return per query
+            discipline: Optional discipline filter
+            category: Optional category filter
+        
+        Returns:
+            Fused and ranked results per query, in order
+        """
+        if not queries:
+            return []
+        
+        query_filter = self._build_filter(discipline, category)
+        search_params = self._search_params()
+        batch_hits = self.client.search_batch(
+            collection_name=self.collection_name,
+            requests=[
+                SearchRequest(
+                    vector=vector,
+                    filter=query_filter,
+                    limit=k*2,
+                    params=search_params,
+                    with_payload=True
+                )
+                for vector in self.embed_queries(queries)
+            ]
+        )
+        
+        fused_results = []
+        for query, hits in zip(queries, batch_hits):
+            bm25_results = self.retrieve_bm25(
+                query, k=k*2, discipline=discipline, category=category
+            )
+            fused_results.append(self._reciprocal_rank_fusion(
+                [self._format_semantic_hits(hits), bm25_results],
+                k=k
+            ))
+        
+        logger.info(f"Hybrid batch search: {len(queries)} queries in one round trip")
+        return fused_results
+    
     def _reciprocal_rank_fusion(
         self,
         result_lists: List[List[Dict]],
@@ -439,6 +603,8 @@ class HybridRetriever:
             doc = item["doc"].copy()
             doc["fused_score"] = item["score"]
             doc["retrieval_methods"] = list(set(item["sources"]))
+            # Pre-rendered once here; every researcher prompt reuses it
+            doc["formatted"] = format_standard(doc)
             fused_results.append(doc)
         
         return fused_results
@@ -11,8 +11,13 @@ import re
 from typing import Dict, Any
 import httpx
 
+from app.agents.resilience import llm_retry
+
 logger = logging.getLogger(__name__)
 
+# JSON object in a Vision reply (may be wrapped in markdown)
+JSON_OBJECT_PATTERN = re.compile(r'\{.*\}', re.DOTALL)
+
 
 class BaseVisionAgent:
     """
@@ -45,6 +50,66 @@ class BaseVisionAgent:
         
         logger.info(f"[Vision:{domain}] Initialized - {expertise}")
     
+    def build_request(
+        self,
+        image_b64: str,
+        model: str = "gpt-4o",
+        max_tokens: int = 8000,
+        temperature: float = 0,
+        mime_type: str = "image/jpeg"
+    ) -> Dict[str, Any]:
+        """
+        Build the chat completions request body for one image.
+        
+        Used for live calls and for OpenAI Batch API input lines.
+        
+        Args:
+            image_b64: Base64-encoded page image (JPEG from the coordinator)
+            model: Vision model to use
+            max_tokens: Maximum response tokens
+            temperature: Model temperature
+            mime_type: Image MIME type for the data URL
+        
+        Returns:
+            Request body for /v1/chat/completions
+        """
+        return {
+            "model": model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": self.system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": self.user_prompt_template},
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:{mime_type};base64,{image_b64}",
+                                "detail": "high"  # High-detail mode for better accuracy
+                            }
+                        }
+                    ]
+                }
+            ],
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        }
+    
+    def parse_completion(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse findings from a chat completions response body."""
+        content = data["choices"][0]["message"]["content"]
+        
+        # Extract JSON from response
+        result = self._parse_json_response(content)
+        
+        findings_count = len(result.get("findings", result.get("pipes", [])))
+        logger.info(f"[Vision:{self.domain}] Analysis complete - {findings_count} items found")
+        
+        return result
+    
     async def analyze(
         self,
         image_b64: str,
@@ -52,7 +117,8 @@ class BaseVisionAgent:
         model: str = "gpt-4o",
         max_tokens: int = 8000,
         temperature: float = 0,
-        timeout: int = 120
+        timeout: int = 120,
+        http_client: httpx.AsyncClient = None
     ) -> Dict[str, Any]:
         """
         Analyze image with domain-specific expertise.
@@ -60,71 +126,60 @@ class BaseVisionAgent:
         STATELESS: Each call is independent. No memory of previous calls.
         
         Args:
-            image_b64: Base64-encoded PNG image
+            image_b64: Base64-encoded page image (JPEG from the coordinator)
             api_key: OpenAI API key
             model: Vision model to use
             max_tokens: Maximum response tokens
             temperature: Model temperature
             timeout: Request timeout
+            http_client: Shared client to reuse pooled connections (a
+                one-off client is created per call if omitted)
         
         Returns:
             Dict with domain-specific findings
         """
         logger.info(f"[Vision:{self.domain}] Analyzing image...")
         
-        # Make API request
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": self.system_prompt
-                        },
-                        {
-                            "role": "user",
-                            "content": [
-                                {"type": "text", "text": self.user_prompt_template},
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/png;base64,{image_b64}",
-                                        "detail": "high"  # High-detail mode for better accuracy
-                                    }
-                                }
-                            ]
-                        }
-                    ],
-                    "max_tokens": max_tokens,
-                    "temperature": temperature
-                }
-            )
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            # Parse response
-            content = data["choices"][0]["message"]["content"]
-            
-            # Extract JSON from response
-            result = self._parse_json_response(content)
-            
-            findings_count = len(result.get("findings", result.get("pipes", [])))
-            logger.info(f"[Vision:{self.domain}] Analysis complete - {findings_count} items found")
-            
-            return result
+        request = self.build_request(image_b64, model, max_tokens, temperature)
+        
+        # Make API request (on the shared client when one is provided)
+        if http_client is None:
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                return await self._post(client, request, api_key, timeout)
+        return await self._post(http_client, request, api_key, timeout)
+    
+    @llm_retry
+    async def _post(
+        self,
+        client: httpx.AsyncClient,
+        request: Dict[str, Any],
+        api_key: str,
+        timeout: int
+    ) -> Dict[str, Any]:
+        """
+        Send the Vision chat completion request and parse its findings.
+        
+        Rate limits, 5xx responses and dropped connections are retried with
+        backoff, so one transient error doesn't lose the page.
+        """
+        response = await client.post(
+            "https://api.openai.com/v1/chat/completions",
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json"
+            },
+            json=request,
+            timeout=timeout
+        )
+        
+        response.raise_for_status()
+        return self.parse_completion(response.json())
     
     def _parse_json_response(self, content: str) -> Dict[str, Any]:
         """Extract JSON from Vision LLM response."""
         try:
             # Try to find JSON block
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            json_match = JSON_OBJECT_PATTERN.search(content)
             if json_match:
                 return json.loads(json_match.group())
             else:
@@ -7,15 +7,23 @@ import logging
 import os
 import asyncio
 import base64
-from typing import Dict, Any, List
+import json
+import time
+from typing import Dict, Any, List, AsyncIterator
 from pathlib import Path
 from collections import Counter
 import fitz  # PyMuPDF
+import httpx
 
 from app.vision.pipes_vision_agent_v2 import PipesVisionAgent
 
 logger = logging.getLogger(__name__)
 
+# Pages are sent as JPEG: GPT-4o downsamples to its own tile resolution, so
+# 150 DPI / q85 keeps labels legible at a fraction of a 300 DPI PNG's size
+DEFAULT_DPI = 150
+JPEG_QUALITY = 85
+
 
 class VisionCoordinator:
     """
@@ -29,8 +37,15 @@ class VisionCoordinator:
     - Deduplication and consolidation
     """
     
-    def __init__(self):
-        """Initialize coordinator with available Vision agents."""
+    def __init__(self, http_client: httpx.AsyncClient = None):
+        """
+        Initialize coordinator with available Vision agents.
+        
+        Args:
+            http_client: Shared HTTP client for Vision API calls (agents open
+                a one-off client per call if omitted)
+        """
+        self.http_client = http_client
         self.agents = {
             "pipes": PipesVisionAgent()
             # Future: Add more specialized agents as needed
@@ -46,7 +61,7 @@ class VisionCoordinator:
         pdf_path: str,
         page_num: int,
         agents_to_deploy: List[str] = None,
-        dpi: int = 300  # Higher DPI for better accuracy
+        dpi: int = DEFAULT_DPI
     ) -> Dict[str, Any]:
         """
         Analyze a single PDF page with multiple Vision agents.
@@ -82,7 +97,7 @@ class VisionCoordinator:
         for agent_key in agents_to_deploy:
             if agent_key in self.agents:
                 agent = self.agents[agent_key]
-                tasks.append(agent.analyze(image_b64, api_key))
+                tasks.append(agent.analyze(image_b64, api_key, http_client=self.http_client))
             else:
                 logger.warning(f"[VisionCoord] Unknown agent: {agent_key}, skipping")
         
@@ -103,6 +118,7 @@ class VisionCoordinator:
         
         # Merge results
         merged = self._merge_results(valid_results)
+        merged["agents_failed"] = len(tasks) - len(valid_results)
         
         logger.info(
             f"[VisionCoord] Page {page_num} complete: "
@@ -111,15 +127,18 @@ class VisionCoordinator:
         
         return merged
     
-    async def analyze_multipage(
+    async def analyze_multipage_stream(
         self,
         pdf_path: str,
         max_pages: int = 10,
         agents_to_deploy: List[str] = None,
-        dpi: int = 300
-    ) -> Dict[str, Any]:
+        dpi: int = DEFAULT_DPI
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Analyze multiple pages of a PDF.
+        Analyze multiple pages of a PDF, yielding each page as it completes.
+        
+        Lets callers start downstream work (e.g. RAG validation) on early
+        pages while later pages are still being processed.
         
         Args:
             pdf_path: Path to PDF file
@@ -127,8 +146,8 @@ class VisionCoordinator:
             agents_to_deploy: Which agents to use
             dpi: Image rendering quality
         
-        Returns:
-            Combined results from all pages
+        Yields:
+            Page result dicts (same shape as analyze_page) with "page_num" set
         """
         logger.info(f"[VisionCoord] Processing PDF: {pdf_path}")
         
@@ -139,8 +158,6 @@ class VisionCoordinator:
         
         logger.info(f"[VisionCoord] Processing {num_pages} pages")
         
-        # Process each page
-        page_results = []
         for page_num in range(num_pages):
             result = await self.analyze_page(
                 pdf_path=pdf_path,
@@ -148,10 +165,40 @@ class VisionCoordinator:
                 agents_to_deploy=agents_to_deploy,
                 dpi=dpi
             )
-            page_results.append(result)
+            result["page_num"] = page_num
+            yield result
+    
+    async def analyze_multipage(
+        self,
+        pdf_path: str,
+        max_pages: int = 10,
+        agents_to_deploy: List[str] = None,
+        dpi: int = DEFAULT_DPI
+    ) -> Dict[str, Any]:
+        """
+        Analyze multiple pages of a PDF.
+        
+        Args:
+            pdf_path: Path to PDF file
+            max_pages: Maximum pages to process
+            agents_to_deploy: Which agents to use
+            dpi: Image rendering quality
+        
+        Returns:
+            Combined results from all pages
+        """
+        page_results = [
+            page_result
+            async for page_result in self.analyze_multipage_stream(
+                pdf_path=pdf_path,
+                max_pages=max_pages,
+                agents_to_deploy=agents_to_deploy,
+                dpi=dpi
+            )
+        ]
         
         # Combine results from all pages
-        combined = self._combine_pages(page_results)
+        combined = self.combine_pages(page_results)
         
         logger.info(
             f"[VisionCoord] Complete: {combined['num_pages_processed']} pages, "
@@ -160,29 +207,181 @@ class VisionCoordinator:
         
         return combined
     
+    async def submit_batch(
+        self,
+        pdf_path: str,
+        max_pages: int = 10,
+        agents_to_deploy: List[str] = None,
+        dpi: int = DEFAULT_DPI
+    ) -> str:
+        """
+        Submit every page/agent Vision request as one OpenAI Batch API job.
+        
+        Batch jobs cost ~50% less than live calls but may take up to 24h,
+        so this is for offline runs; collect results with wait_for_batch.
+        
+        Args:
+            pdf_path: Path to PDF file
+            max_pages: Maximum pages to process
+            agents_to_deploy: Which agents to use
+            dpi: Image rendering quality
+        
+        Returns:
+            OpenAI batch id
+        """
+        if agents_to_deploy is None:
+            agents_to_deploy = ["plan_pipes", "profile_pipes"]
+        
+        doc = fitz.open(pdf_path)
+        num_pages = min(len(doc), max_pages)
+        doc.close()
+        
+        for agent_key in agents_to_deploy:
+            if agent_key not in self.agents:
+                logger.warning(f"[VisionCoord] Unknown agent: {agent_key}, skipping")
+        agent_keys = [agent_key for agent_key in agents_to_deploy if agent_key in self.agents]
+        
+        lines = []
+        for page_num in range(num_pages):
+            image_b64 = await self._pdf_page_to_base64(pdf_path, page_num, dpi=dpi)
+            for agent_key in agent_keys:
+                lines.append(json.dumps({
+                    "custom_id": f"{page_num}:{agent_key}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self.agents[agent_key].build_request(image_b64)
+                }))
+        
+        client = self._openai_client()
+        batch_file = await client.files.create(
+            file=(f"{Path(pdf_path).stem}_vision.jsonl", "\n".join(lines).encode()),
+            purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            # Lets wait_for_batch account for pages whose requests all failed
+            metadata={"num_pages": str(num_pages), "agents": ",".join(agent_keys)}
+        )
+        
+        logger.info(
+            f"[VisionCoord] Submitted batch {batch.id}: {num_pages} pages, "
+            f"{len(lines)} requests"
+        )
+        return batch.id
+    
+    async def wait_for_batch(
+        self,
+        batch_id: str,
+        poll_interval: float = 60,
+        max_wait: float = 24 * 3600
+    ) -> Dict[str, Any]:
+        """
+        Poll a Vision batch until it finishes and combine its pages.
+        
+        Args:
+            batch_id: Id returned by submit_batch
+            poll_interval: Seconds between status checks
+            max_wait: Give up (TimeoutError) after this many seconds
+        
+        Returns:
+            Combined results, same shape as analyze_multipage
+        """
+        client = self._openai_client()
+        deadline = time.monotonic() + max_wait
+        
+        batch = await client.batches.retrieve(batch_id)
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Vision batch {batch_id} still {batch.status} after {max_wait}s")
+            logger.info(f"[VisionCoord] Batch {batch_id}: {batch.status}")
+            await asyncio.sleep(poll_interval)
+            batch = await client.batches.retrieve(batch_id)
+        
+        if batch.status != "completed":
+            raise RuntimeError(f"Vision batch {batch_id} ended with status {batch.status}")
+        
+        # No output file when every request failed; those pages are still reported
+        output_text = ""
+        if batch.output_file_id:
+            output_text = (await client.files.content(batch.output_file_id)).text
+        
+        # Group agent results by page (output lines are not in input order)
+        pages: Dict[int, List[Dict[str, Any]]] = {}
+        failed_lines: Counter = Counter()
+        for line in output_text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            page, agent_key = record["custom_id"].split(":", 1)
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                logger.error(f"[VisionCoord] Batch request {record['custom_id']} failed: {record.get('error')}")
+                failed_lines[int(page)] += 1
+                continue
+            pages.setdefault(int(page), []).append(
+                self.agents[agent_key].parse_completion(response["body"])
+            )
+        
+        # Failures per page, counted once: submitted requests without a
+        # result (failed requests may only be listed in the error file).
+        # Batches submitted without metadata fall back to the failed lines.
+        metadata = batch.metadata or {}
+        num_pages = int(metadata.get("num_pages") or 0)
+        agents_per_page = len([key for key in metadata.get("agents", "").split(",") if key])
+        page_nums = range(num_pages) if num_pages else sorted(pages.keys() | failed_lines.keys())
+        
+        # Pages whose requests all failed stay in as empty entries, like
+        # analyze_multipage reports them
+        page_results = []
+        for page_num in page_nums:
+            results = pages.get(page_num, [])
+            merged = self._merge_results(results)
+            merged["page_num"] = page_num
+            if agents_per_page:
+                merged["agents_failed"] = agents_per_page - len(results)
+            else:
+                merged["agents_failed"] = failed_lines[page_num]
+            page_results.append(merged)
+        
+        combined = self.combine_pages(page_results)
+        
+        logger.info(
+            f"[VisionCoord] Batch {batch_id} complete: {combined['num_pages_processed']} pages, "
+            f"{combined['total_pipes']} total pipes"
+        )
+        
+        return combined
+    
+    def _openai_client(self):
+        """OpenAI SDK client for the Batch/Files APIs, on the shared HTTP client if set."""
+        from openai import AsyncOpenAI
+        
+        return AsyncOpenAI(http_client=self.http_client)
+    
     async def _pdf_page_to_base64(
         self,
         pdf_path: str,
         page_num: int,
-        dpi: int = 300
+        dpi: int = DEFAULT_DPI
     ) -> str:
         """
-        Convert PDF page to base64-encoded PNG image.
+        Convert PDF page to base64-encoded JPEG image.
         
         Args:
             pdf_path: Path to PDF
             page_num: Page index (0-based)
-            dpi: Rendering DPI (higher = better quality)
+            dpi: Rendering DPI (higher = better quality, larger payload)
         
         Returns:
-            Base64-encoded PNG
+            Base64-encoded JPEG
         """
         doc = fitz.open(pdf_path)
         page = doc[page_num]
         
-        # Render at high DPI for Vision accuracy
         pix = page.get_pixmap(dpi=dpi)
-        img_bytes = pix.pil_tobytes(format="PNG")
+        img_bytes = pix.pil_tobytes(format="JPEG", quality=JPEG_QUALITY, optimize=True)
         
         doc.close()
         
@@ -216,7 +415,7 @@ class VisionCoordinator:
             "agents_deployed": len(results)
         }
     
-    def _combine_pages(self, page_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def combine_pages(self, page_results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Combine results from multiple pages.
         
@@ -228,29 +427,34 @@ class VisionCoordinator:
         """
         all_pipes = []
         page_summaries = []
+        agents_failed = 0
+        discipline_counts = Counter()
         
         for page_idx, page_result in enumerate(page_results):
+            agents_failed += page_result.get("agents_failed", 0)
+            
             pipes = page_result.get("pipes", [])
             
-            # Add page number to each pipe
+            # Add page number to each pipe, counting disciplines in the same pass
+            page_num = page_result.get("page_num", page_idx)
             for pipe in pipes:
-                pipe["page_num"] = page_idx
+                pipe["page_num"] = page_num
                 all_pipes.append(pipe)
+                discipline = pipe.get("discipline")
+                if discipline:
+                    discipline_counts[discipline] += 1
             
             # Collect summaries
             summaries = page_result.get("summaries", [])
             if summaries:
                 page_summaries.append(" | ".join(summaries))
         
-        # Count by discipline
-        disciplines = [p.get("discipline") for p in all_pipes if p.get("discipline")]
-        discipline_counts = Counter(disciplines)
-        
         return {
             "pipes": all_pipes,
             "total_pipes": len(all_pipes),
             "num_pages_processed": len(page_results),
             "page_summaries": page_summaries,
-            "discipline_counts": dict(discipline_counts)
+            "discipline_counts": dict(discipline_counts),
+            "agents_failed": agents_failed
         }
 
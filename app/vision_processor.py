@@ -3,8 +3,10 @@ Vision-based PDF processor using GPT-4o.
 
 Converts PDF pages to images and uses Vision LLM to extract pipe information.
 """
+import json
 import logging
 import os
+import re
 import base64
 from typing import Dict, Any, List
 import httpx
@@ -12,6 +14,9 @@ import fitz  # PyMuPDF
 
 logger = logging.getLogger(__name__)
 
+# JSON object in a Vision reply (may be wrapped in markdown)
+JSON_OBJECT_PATTERN = re.compile(r'\{.*\}', re.DOTALL)
+
 
 async def pdf_page_to_base64(pdf_path: str, page_num: int = 0) -> str:
     """
@@ -186,11 +191,7 @@ Return JSON with ALL pipes found:
         content = data["choices"][0]["message"]["content"]
         
         # Extract JSON from response (might be wrapped in markdown)
-        import json
-        import re
-        
-        # Try to find JSON in response
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
+        json_match = JSON_OBJECT_PATTERN.search(content)
         if json_match:
             result = json.loads(json_match.group())
         else:
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Check collapse_duplicate_pipes, the local pre-pass before LLM dedup.
+
+Only runs that match on discipline, size, material and both end
+structures are repeats; anything without structure ids must pass
+through untouched for the LLM to judge.
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.agents.supervisor import collapse_duplicate_pipes
+
+
+def _pipe(**fields):
+    return {
+        "discipline": "storm",
+        "diameter_in": 18,
+        "material": "RCP",
+        "from_structure": "CB-1",
+        "to_structure": "CB-2",
+        **fields
+    }
+
+
+def test_repeat_run_collapses_to_most_complete():
+    sparse = _pipe(length_ft=None)
+    complete = _pipe(length_ft=120.0, invert_in=95.2)
+    
+    assert collapse_duplicate_pipes([sparse, complete]) == [complete]
+
+
+def test_material_compared_case_insensitively():
+    assert len(collapse_duplicate_pipes([_pipe(material="rcp"), _pipe(material="RCP ")])) == 1
+
+
+def test_different_runs_kept_in_order():
+    first = _pipe()
+    other_end = _pipe(to_structure="CB-3")
+    other_size = _pipe(diameter_in=24)
+    
+    assert collapse_duplicate_pipes([first, other_end, other_size]) == [first, other_end, other_size]
+
+
+def test_pipes_without_structure_ids_all_kept():
+    no_ids = _pipe(from_structure=None, to_structure=None)
+    one_id = _pipe(to_structure="")
+    
+    assert collapse_duplicate_pipes([no_ids, dict(no_ids), one_id, dict(one_id)]) == [
+        no_ids, no_ids, one_id, one_id
+    ]
+
+
+if __name__ == "__main__":
+    test_repeat_run_collapses_to_most_complete()
+    test_material_compared_case_insensitively()
+    test_different_runs_kept_in_order()
+    test_pipes_without_structure_ids_all_kept()
+    print("✅ PIPE COLLAPSE TEST PASSED")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Check parse_dedup_reply on the reply shapes the dedup prompt gets back.
+
+A ValueError sends consolidation down the naive-count fallback, so a
+well-formed reply in markdown must parse and a malformed COUNTS line
+must raise.
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from app.agents.supervisor import parse_dedup_reply
+
+COUNTS = "3|2|1|6|120.5|80|40|240.5"
+
+
+def test_plain_reply_parses():
+    result = parse_dedup_reply(f"COUNTS: {COUNTS}\nMATERIALS: RCP, PVC\nREC: Verify inverts")
+    
+    assert result["summary"]["storm_pipes"] == 3
+    assert result["summary"]["total_pipes"] == 6
+    assert result["summary"]["storm_lf"] == 120.5
+    assert result["materials_found"] == ["RCP", "PVC"]
+    assert result["recommendations"] == "Verify inverts"
+
+
+def test_markdown_wrapped_labels_parse():
+    result = parse_dedup_reply(f"**COUNTS**: {COUNTS}\n- MATERIALS: `DIP`\n`REC`: **none**")
+    
+    assert result["summary"]["total_lf"] == 240.5
+    assert result["materials_found"] == ["DIP"]
+    assert result["recommendations"] == "none"
+
+
+def test_wrong_field_count_raises():
+    with pytest.raises(ValueError):
+        parse_dedup_reply("COUNTS: 3|2|1|6\nMATERIALS: RCP")
+
+
+def test_missing_counts_raises():
+    with pytest.raises(ValueError):
+        parse_dedup_reply("MATERIALS: RCP\nREC: none")
+
+
+if __name__ == "__main__":
+    test_plain_reply_parses()
+    test_markdown_wrapped_labels_parse()
+    test_wrong_field_count_raises()
+    test_missing_counts_raises()
+    print("✅ DEDUP REPLY PARSING TEST PASSED")
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Check find_terms, which decides which unknown materials a search context
+actually mentions.
+
+Overlapping terms ("PVC" inside "FPVC") share match positions, so the
+shorter one must still be reported without rescanning.
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.agents.supervisor import find_terms
+
+
+def test_overlapping_terms_both_found():
+    assert find_terms(["Specs for fpvc pressure pipe"], {"PVC", "FPVC"}) == {"PVC", "FPVC"}
+
+
+def test_shorter_term_alone_does_not_imply_longer():
+    assert find_terms(["PVC SDR-35 sewer pipe"], {"PVC", "FPVC"}) == {"PVC"}
+
+
+def test_terms_across_texts_case_insensitive():
+    assert find_terms(["hdpe corrugated", "Ductile iron (DIP)"], {"HDPE", "DIP", "RCP"}) == {"HDPE", "DIP"}
+
+
+def test_regex_characters_escaped():
+    assert find_terms(["C900 (PVC) pipe"], {"(PVC)", "C.00"}) == {"(PVC)"}
+
+
+def test_no_terms():
+    assert find_terms(["anything"], set()) == set()
+
+
+if __name__ == "__main__":
+    test_overlapping_terms_both_found()
+    test_shorter_term_alone_does_not_imply_longer()
+    test_terms_across_texts_case_insensitive()
+    test_regex_characters_escaped()
+    test_no_terms()
+    print("✅ TERM MATCHING TEST PASSED")
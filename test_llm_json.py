@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Check extract_json_array on the ways LLM replies wrap a JSON array.
+
+A None or wrong slice sends planning and batched analysis down their
+fallbacks, so brackets in strings or trailing prose must not move the
+array's boundaries.
+"""
+import sys
+import os
+import json
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.agents.llm_json import extract_json_array
+
+
+def test_markdown_fenced_array():
+    text = 'Here is the plan:\n```json\n[{"researcher": "storm"}]\n```'
+    assert json.loads(extract_json_array(text)) == [{"researcher": "storm"}]
+
+
+def test_brackets_in_trailing_prose_ignored():
+    text = '[{"id": 1, "analysis": "ok"}]\n\nNote: see sheet [C-101] for details.'
+    assert json.loads(extract_json_array(text)) == [{"id": 1, "analysis": "ok"}]
+
+
+def test_brackets_and_escaped_quotes_inside_strings():
+    text = '[{"analysis": "pipe ] from [MH-1] to \\"MH-2]\\""}] trailing'
+    assert json.loads(extract_json_array(text)) == [{"analysis": 'pipe ] from [MH-1] to "MH-2]"'}]
+
+
+def test_nested_arrays():
+    text = 'Result: [[1, 2], [3]] done'
+    assert json.loads(extract_json_array(text)) == [[1, 2], [3]]
+
+
+def test_no_array_or_unterminated():
+    assert extract_json_array("no json here") is None
+    assert extract_json_array('[{"id": 1') is None
+
+
+if __name__ == "__main__":
+    test_markdown_fenced_array()
+    test_brackets_in_trailing_prose_ignored()
+    test_brackets_and_escaped_quotes_inside_strings()
+    test_nested_arrays()
+    test_no_array_or_unterminated()
+    print("✅ JSON ARRAY EXTRACTION TEST PASSED")
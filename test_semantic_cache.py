@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Check that the researcher semantic cache never serves findings across
+pages or PDFs.
+
+Near-identical task wording ("sanitary inverts on page 3" vs "page 4")
+embeds to almost the same vector, so the scope key - not similarity -
+has to keep those apart.
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.agents.researchers.semantic_cache import SemanticCache, task_scope_key
+
+DOC_KEY = "same-standards"
+VECTOR = [1.0, 0.0, 0.0]  # identical embedding: only the scope can cause a miss
+
+
+def _store_and_lookup(stored_task: str, stored_pdf: str, task: str, pdf: str):
+    cache = SemanticCache(threshold=0.95)
+    cache.store("sanitary", f"{task_scope_key(stored_task, stored_pdf)}:{DOC_KEY}", VECTOR, "cached")
+    return cache.lookup("sanitary", f"{task_scope_key(task, pdf)}:{DOC_KEY}", VECTOR)
+
+
+def test_same_page_same_pdf_hits():
+    assert _store_and_lookup(
+        "extract sanitary inverts on page 3", "plans.pdf",
+        "read sanitary invert elevations on page 3", "plans.pdf"
+    ) == "cached"
+
+
+def test_page_change_misses():
+    assert _store_and_lookup(
+        "extract sanitary inverts on page 3", "plans.pdf",
+        "extract sanitary inverts on page 4", "plans.pdf"
+    ) is None
+
+
+def test_pdf_change_misses():
+    assert _store_and_lookup(
+        "extract sanitary inverts on page 3", "plans.pdf",
+        "extract sanitary inverts on page 3", "other.pdf"
+    ) is None
+
+
+if __name__ == "__main__":
+    test_same_page_same_pdf_hits()
+    test_page_change_misses()
+    test_pdf_change_misses()
+    print("✅ SEMANTIC CACHE SCOPE TEST PASSED")